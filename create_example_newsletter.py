@@ -4,271 +4,33 @@ Create a complete example newsletter with sample content.
 """
 
 import json
-import re
 import os
+import sys
 from datetime import datetime
-from jinja2 import Template
 
-def create_section_id(title):
-    """Create a URL-friendly section ID from title."""
-    id_text = re.sub(r'[^a-zA-Z0-9\s-]', '', title)
-    id_text = re.sub(r'\s+', '-', id_text.lower())
-    return id_text
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from edition_model import PRIORITY_EMOJI, edition_stats, group_by_category, prepare_content, sort_content
+from template_cache import get_template
 
 def load_example_content():
     """Load the example content."""
     with open('content/example_monthly_content.json', 'r', encoding='utf-8') as f:
-        return json.load(f)
+        return prepare_content(json.load(f))
 
 def generate_newsletter_html(content):
     """Generate the newsletter HTML."""
-    template_content = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Cloud News - {{ newsletter_date }}</title>
-    <style>
-        body { 
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; 
-            line-height: 1.6; 
-            color: #333; 
-            max-width: 800px; 
-            margin: 0 auto; 
-            padding: 20px; 
-            background-color: #f8f9fa;
-        }
-        .container {
-            background: white;
-            border-radius: 12px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }
-        .header { 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-            color: white; 
-            padding: 40px; 
-            text-align: center; 
-        }
-        .header h1 {
-            font-size: 2.5rem;
-            margin-bottom: 10px;
-            font-weight: 700;
-        }
-        .monthly-info {
-            background: rgba(255,255,255,0.1);
-            padding: 15px;
-            border-radius: 8px;
-            margin-top: 20px;
-        }
-        .content-area {
-            padding: 40px;
-        }
-        .article { 
-            margin-bottom: 40px; 
-            padding: 25px; 
-            border-left: 4px solid #667eea; 
-            background: #f8f9fa; 
-            border-radius: 8px; 
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-            scroll-margin-top: 20px;
-        }
-        .article h2 { 
-            color: #667eea; 
-            margin-bottom: 15px; 
-            font-size: 1.5rem;
-        }
-        .article .meta { 
-            color: #666; 
-            font-size: 0.9em; 
-            margin-bottom: 15px; 
-            display: flex;
-            align-items: center;
-            gap: 15px;
-            flex-wrap: wrap;
-        }
-        .article .summary { 
-            font-style: italic; 
-            color: #555; 
-            margin-bottom: 20px; 
-            padding: 15px;
-            background: white;
-            border-radius: 6px;
-            border-left: 3px solid #667eea;
-        }
-        .category-badge { 
-            display: inline-block; 
-            background: #667eea; 
-            color: white; 
-            padding: 6px 12px; 
-            border-radius: 20px; 
-            font-size: 0.8em; 
-            font-weight: 600;
-        }
-        .priority-badge {
-            display: inline-block;
-            padding: 4px 8px;
-            border-radius: 12px;
-            font-size: 0.7em;
-            font-weight: 600;
-        }
-        .priority-urgent { background: #e74c3c; color: white; }
-        .priority-high { background: #f39c12; color: white; }
-        .priority-normal { background: #95a5a6; color: white; }
-        .footer { 
-            text-align: center; 
-            margin-top: 40px; 
-            padding: 30px; 
-            background: #f8f9fa; 
-            border-top: 1px solid #e9ecef;
-        }
-        .footer a {
-            color: #667eea;
-            text-decoration: none;
-            font-weight: 600;
-        }
-        .footer a:hover {
-            text-decoration: underline;
-        }
-        .image {
-            margin-top: 20px;
-            text-align: center;
-        }
-        .image img {
-            max-width: 100%;
-            height: auto;
-            border-radius: 8px;
-            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        }
-        .monthly-stats {
-            background: #e8f4fd;
-            padding: 20px;
-            border-radius: 8px;
-            margin-bottom: 30px;
-            text-align: center;
-        }
-        .stats-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-            gap: 20px;
-            margin-top: 15px;
-        }
-        .stat-item {
-            background: white;
-            padding: 15px;
-            border-radius: 6px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-        }
-        .stat-number {
-            font-size: 2rem;
-            font-weight: bold;
-            color: #667eea;
-        }
-        .stat-label {
-            font-size: 0.9rem;
-            color: #666;
-            margin-top: 5px;
-        }
-        @media (max-width: 768px) {
-            body { padding: 10px; }
-            .header { padding: 30px 20px; }
-            .header h1 { font-size: 2rem; }
-            .content-area { padding: 30px 20px; }
-            .article { padding: 20px; }
-            .stats-grid { grid-template-columns: 1fr; }
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>📰 Cloud News</h1>
-            <p>{{ newsletter_date }}</p>
-            <div class="monthly-info">
-                <strong>Monthly Newsletter</strong><br>
-                {{ total_articles }} articles • {{ categories_count }} categories
-            </div>
-        </div>
-
-        <div class="content-area">
-            <div class="monthly-stats">
-                <h3>📊 This Month's Highlights</h3>
-                <div class="stats-grid">
-                    <div class="stat-item">
-                        <div class="stat-number">{{ total_articles }}</div>
-                        <div class="stat-label">Articles</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-number">{{ categories_count }}</div>
-                        <div class="stat-label">Categories</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-number">{{ authors_count }}</div>
-                        <div class="stat-label">Contributors</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-number">{{ urgent_count }}</div>
-                        <div class="stat-label">Urgent Items</div>
-                    </div>
-                </div>
-            </div>
-
-            {% for article in articles %}
-            <div class="article" id="{{ article.section_id }}">
-                <h2>{{ article.title }}</h2>
-                <div class="meta">
-                    <span class="category-badge">{{ article.category }}</span>
-                    <span class="priority-badge priority-{{ article.priority.lower() }}">{{ article.priority }}</span>
-                    <span>By {{ article.author }}</span>
-                </div>
-                <div class="summary">{{ article.summary }}</div>
-                <div class="content">{{ article.content | safe }}</div>
-                {% if article.image %}
-                <div class="image">
-                    <img src="{{ article.image }}" alt="Article image">
-                </div>
-                {% endif %}
-            </div>
-            {% endfor %}
-        </div>
-
-        <div class="footer">
-            <p>Want to contribute? <a href="https://github.com/hornmichi/Cloud-News/issues">Submit content here</a></p>
-            <p>📧 <a href="mailto:newsletter@hornmichi.com">newsletter@hornmichi.com</a></p>
-            <p style="margin-top: 20px; font-size: 0.9em; color: #666;">© 2024 Cloud News. All rights reserved.</p>
-        </div>
-    </div>
-</body>
-</html>"""
-    
-    template = Template(template_content)
+    template = get_template("newsletter_template.html")
     
     # Prepare data
     newsletter_date = "January 2024"
     
-    # Sort content by priority and category
-    sorted_content = sorted(content, key=lambda x: (
-        {'Urgent': 0, 'High': 1, 'Normal': 2}.get(x.get('priority', 'Normal'), 2),
-        x.get('category', '')
-    ))
-    
-    # Add section IDs to each article
-    for article in sorted_content:
-        article['section_id'] = create_section_id(article.get('title', 'Untitled'))
-    
-    # Calculate statistics
-    categories = set(article.get('category', '') for article in content)
-    authors = set(article.get('author', '') for article in content)
-    urgent_count = sum(1 for article in content if article.get('priority') == 'Urgent')
+    # Sort content by priority and category; section IDs are precomputed
+    sorted_content = sort_content(content)
     
     html_content = template.render(
         articles=sorted_content,
         newsletter_date=newsletter_date,
-        total_articles=len(content),
-        categories_count=len(categories),
-        authors_count=len(authors),
-        urgent_count=urgent_count
+        **edition_stats(content)
     )
     
     return html_content
@@ -276,6 +38,7 @@ def generate_newsletter_html(content):
 def generate_teams_agenda(content, newsletter_url):
     """Generate a Teams-friendly agenda with clickable links."""
     month_year = "January 2024"
+    stats = edition_stats(content)
     
     # Start with header
     agenda = f"""📰 **Cloud News - {month_year}**
@@ -283,9 +46,9 @@ def generate_teams_agenda(content, newsletter_url):
 Welcome to this month's newsletter! Here's what's inside:
 
 📊 **Monthly Highlights**
-• {len(content)} articles from our community
-• {len(set(article.get('category', '') for article in content))} different categories
-• {len(set(article.get('author', '') for article in content))} contributors
+• {stats['total_articles']} articles from our community
+• {stats['categories_count']} different categories
+• {stats['authors_count']} contributors
 
 ---
 
@@ -293,19 +56,8 @@ Welcome to this month's newsletter! Here's what's inside:
 
 """
     
-    # Sort content by priority and category
-    sorted_content = sorted(content, key=lambda x: (
-        {'Urgent': 0, 'High': 1, 'Normal': 2}.get(x.get('priority', 'Normal'), 2),
-        x.get('category', '')
-    ))
-    
-    # Group by category
-    categories = {}
-    for article in sorted_content:
-        category = article.get('category', 'Other')
-        if category not in categories:
-            categories[category] = []
-        categories[category].append(article)
+    # Sort content by priority, then group by category
+    categories = group_by_category(sort_content(content))
     
     # Generate agenda items
     for category, articles in categories.items():
@@ -315,16 +67,10 @@ Welcome to this month's newsletter! Here's what's inside:
             title = article.get('title', 'Untitled')
             author = article.get('author', 'Unknown')
             priority = article.get('priority', 'Normal')
-            
-            # Create section ID
-            section_id = create_section_id(title)
+            section_id = article['section_id']
             
             # Priority emoji
-            priority_emoji = {
-                'Urgent': '🔴',
-                'High': '🟡', 
-                'Normal': '⚪'
-            }.get(priority, '⚪')
+            priority_emoji = PRIORITY_EMOJI.get(priority, '⚪')
             
             # Create link
             link = f"{newsletter_url}#{section_id}"
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Index past editions for fast archive queries.
+Per-article metadata from content/monthly_content_YYYYMM.json is kept in a
+SQLite database with an FTS5 full-text table. Only files whose mtime or size
+changed since the last run are re-read; they are loaded together into one
+ArticleColumns store (see article_store.py) and inserted in bulk.
+
+Usage:
+  python archive_index.py update
+  python archive_index.py search [TEXT] [--category C] [--author A] [--year YYYY] [--month YYYYMM]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sqlite3
+import time
+
+from article_store import ArticleColumns
+
+DEFAULT_DB_PATH = ".cache/archive.sqlite"
+
+CONTENT_FILE_RE = re.compile(r'monthly_content_(\d{6})\.json$')
+
+# Bumped when the tables change; an index with another version is rebuilt
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    month TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    month TEXT NOT NULL,
+    issue_number INTEGER,
+    title TEXT,
+    summary TEXT,
+    category TEXT COLLATE NOCASE,
+    author TEXT COLLATE NOCASE,
+    priority TEXT,
+    url TEXT
+);
+CREATE INDEX IF NOT EXISTS articles_path ON articles (path);
+CREATE INDEX IF NOT EXISTS articles_month ON articles (month);
+CREATE INDEX IF NOT EXISTS articles_category_author ON articles (category, author, month);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5 (
+    title, summary, category, author, month UNINDEXED, issue_number UNINDEXED
+);
+"""
+
+def get_db_path():
+    """Return the index location from ARCHIVE_INDEX_DB or the default."""
+    return os.getenv('ARCHIVE_INDEX_DB', DEFAULT_DB_PATH)
+
+def open_index(db_path=None):
+    """Open (and create if needed) the archive index database."""
+    db_path = db_path or get_db_path()
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(db_path)
+    if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        # The index is a cache of the content files; rebuild it from scratch
+        connection.executescript(
+            "DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS articles; DROP TABLE IF EXISTS articles_fts;"
+        )
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    connection.executescript(SCHEMA)
+    return connection
+
+def find_content_files(content_dir="content"):
+    """Return {path: month} for every monthly content file."""
+    files = {}
+    for path in glob.glob(os.path.join(content_dir, "monthly_content_*.json")):
+        match = CONTENT_FILE_RE.search(path)
+        if match:
+            files[path] = match.group(1)
+    return files
+
+def remove_month_file(connection, path):
+    """Drop a file's articles from the index.
+
+    Articles are matched by source path, not month, so two content
+    directories holding the same month do not remove each other's articles.
+    """
+    ids = [(row[0],) for row in connection.execute("SELECT id FROM articles WHERE path = ?", (path,))]
+    connection.executemany("DELETE FROM articles_fts WHERE rowid = ?", ids)
+    connection.execute("DELETE FROM articles WHERE path = ?", (path,))
+    connection.execute("DELETE FROM files WHERE path = ?", (path,))
+
+def index_month_files(connection, changed):
+    """Replace the indexed articles of every (path, month, stat) in changed.
+
+    All changed files are loaded into one ArticleColumns store, whose
+    interned strings keep a full-archive load small, and its columns are
+    inserted with one executemany per table. Returns the article count.
+    """
+    store = ArticleColumns()
+    paths = []
+    months = []
+    for path, month, stat in changed:
+        remove_month_file(connection, path)
+        with open(path, 'r', encoding='utf-8') as f:
+            articles = json.load(f)
+        store.extend(articles)
+        paths.extend([path] * len(articles))
+        months.extend([month] * len(articles))
+        connection.execute(
+            "INSERT INTO files (path, month, mtime_ns, size) VALUES (?, ?, ?, ?)",
+            (path, month, stat.st_mtime_ns, stat.st_size)
+        )
+
+    first_id = connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM articles").fetchone()[0]
+    ids = range(first_id, first_id + len(store))
+    numbers = store.column('issue_number')
+    text = {
+        name: ['' if value is None else value for value in store.column(name)]
+        for name in ('title', 'summary', 'category', 'author', 'priority', 'url')
+    }
+    connection.executemany(
+        "INSERT INTO articles (id, path, month, issue_number, title, summary, category, author, priority, url) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        zip(ids, paths, months, numbers, text['title'], text['summary'], text['category'],
+            text['author'], text['priority'], text['url'])
+    )
+    connection.executemany(
+        "INSERT INTO articles_fts (rowid, title, summary, category, author, month, issue_number) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        zip(ids, text['title'], text['summary'], text['category'], text['author'], months, numbers)
+    )
+    return len(store)
+
+def update_index(connection, content_dir="content"):
+    """Bring the index up to date with content_dir.
+
+    Returns (files re-indexed, articles indexed, files removed).
+    """
+    files = find_content_files(content_dir)
+    known = {
+        path: (mtime_ns, size)
+        for path, mtime_ns, size in connection.execute("SELECT path, mtime_ns, size FROM files")
+    }
+
+    changed = []
+    for path, month in sorted(files.items()):
+        stat = os.stat(path)
+        if known.get(path) != (stat.st_mtime_ns, stat.st_size):
+            changed.append((path, month, stat))
+
+    with connection:
+        article_count = index_month_files(connection, changed) if changed else 0
+        removed = [path for path in known if path not in files]
+        for path in removed:
+            remove_month_file(connection, path)
+
+    return len(changed), article_count, len(removed)
+
+def fts_query(text):
+    """Turn free text into an FTS5 query that matches all words as prefixes."""
+    words = re.findall(r'\w+', text)
+    return ' '.join(f'"{word}"*' for word in words)
+
+def search(connection, text=None, category=None, author=None, year=None, month=None, limit=100):
+    """Return matching articles, newest month first."""
+    clauses = []
+    params = []
+    if text and fts_query(text):
+        clauses.append("a.id IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)")
+        params.append(fts_query(text))
+    if category:
+        clauses.append("a.category = ?")
+        params.append(category)
+    if author:
+        clauses.append("a.author = ?")
+        params.append(author)
+    if year:
+        clauses.append("a.month BETWEEN ? AND ?")
+        params.extend([f"{year}01", f"{year}12"])
+    if month:
+        clauses.append("a.month = ?")
+        params.append(month)
+
+    sql = "SELECT a.month, a.issue_number, a.title, a.category, a.author, a.priority, a.url FROM articles a"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY a.month DESC, a.issue_number LIMIT ?"
+    params.append(limit)
+
+    columns = ('month', 'issue_number', 'title', 'category', 'author', 'priority', 'url')
+    return [dict(zip(columns, row)) for row in connection.execute(sql, params)]
+
+def main():
+    """Command-line entry point."""
+    arg_parser = argparse.ArgumentParser(description="Query the Cloud News archive.")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    update_parser = commands.add_parser('update', help="Index new or changed monthly content files")
+    update_parser.add_argument('--content-dir', default='content')
+
+    search_parser = commands.add_parser('search', help="Search indexed articles")
+    search_parser.add_argument('text', nargs='*', help="Words to find in title, summary, category or author")
+    search_parser.add_argument('--category')
+    search_parser.add_argument('--author')
+    search_parser.add_argument('--year')
+    search_parser.add_argument('--month', help="Edition month as YYYYMM")
+    search_parser.add_argument('--limit', type=int, default=100)
+    search_parser.add_argument('--content-dir', default='content')
+    search_parser.add_argument('--no-update', action='store_true',
+                               help="Query the index as it is without checking for changed files")
+    args = arg_parser.parse_args()
+
+    connection = open_index()
+
+    if args.command == 'update' or not args.no_update:
+        start = time.perf_counter()
+        reindexed, article_count, removed = update_index(connection, args.content_dir)
+        if args.command == 'update' or reindexed or removed:
+            print(f"🗂️  Indexed {article_count} articles from {reindexed} changed files, "
+                  f"removed {removed} files ({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+    if args.command == 'search':
+        start = time.perf_counter()
+        results = search(connection, ' '.join(args.text), args.category, args.author,
+                         args.year, args.month, args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        for article in results:
+            month = f"{article['month'][:4]}-{article['month'][4:]}"
+            # Articles added by hand have no issue number
+            number = article['issue_number'] if article['issue_number'] is not None else ''
+            print(f"{month}  #{number:<5} [{article['category']}] "
+                  f"{article['title']} - by {article['author']}")
+        print(f"\n🔎 {len(results)} articles found in {elapsed:.1f} ms")
+
+    connection.close()
+
+if __name__ == "__main__":
+    main()
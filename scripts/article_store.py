@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory article records for archive-scale workloads.
+Article keeps one collected article in __slots__ with interned strings,
+and ArticleColumns holds many articles as one list per field.
+Both convert back to the dict shape of content/monthly_content_*.json
+unchanged.
+"""
+
+import json
+import sys
+
+# Fields written by collect_monthly_content.extract_issue_data, in file order
+FIELDS = (
+    'issue_number', 'title', 'summary', 'category', 'content', 'author',
+    'image', 'priority', 'additional_notes', 'created_at', 'updated_at',
+    'labels', 'state', 'url'
+)
+
+# Low-cardinality fields whose strings are shared across articles
+INTERNED_FIELDS = ('category', 'priority', 'author', 'state')
+
+_MISSING = object()
+
+# Key orders seen so far, so articles with the same layout share one tuple
+_layouts = {}
+
+def _shared_layout(keys):
+    """Return the shared tuple for a key order."""
+    keys = tuple(keys)
+    return _layouts.setdefault(keys, keys)
+
+def _intern(value):
+    """Intern a string value, leaving other values as they are."""
+    return sys.intern(value) if type(value) is str else value
+
+class Article:
+    """One collected article stored in slots instead of a dict."""
+
+    __slots__ = FIELDS + ('_layout', '_extra')
+
+    def __init__(self, **fields):
+        for name in FIELDS:
+            setattr(self, name, _MISSING)
+        self._extra = None
+        self._layout = _shared_layout(fields)
+        for key, value in fields.items():
+            self._set(key, value)
+
+    def _set(self, key, value):
+        """Store one field, interning shared strings."""
+        if key in INTERNED_FIELDS:
+            value = _intern(value)
+        elif key == 'labels' and isinstance(value, list):
+            value = tuple(_intern(label) for label in value)
+        if key in FIELDS:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create an Article from a collected article dict."""
+        return cls(**data)
+
+    def get(self, key, default=None):
+        """Return a field like dict.get."""
+        if key in FIELDS:
+            value = getattr(self, key)
+            if value is _MISSING:
+                return default
+            return list(value) if key == 'labels' and isinstance(value, tuple) else value
+        if self._extra is None:
+            return default
+        return self._extra.get(key, default)
+
+    def to_dict(self):
+        """Return the article as a dict with the original key order."""
+        return {key: self.get(key) for key in self._layout}
+
+    def __repr__(self):
+        return f"Article(issue_number={self.get('issue_number')!r}, title={self.get('title')!r})"
+
+class ArticleColumns:
+    """Many articles stored as one list per field for bulk operations."""
+
+    def __init__(self):
+        self.columns = {name: [] for name in FIELDS}
+        self.layouts = []
+        self.extras = []
+
+    def __len__(self):
+        return len(self.layouts)
+
+    def append(self, data):
+        """Add one article dict."""
+        for name in FIELDS:
+            value = data.get(name, _MISSING)
+            if name in INTERNED_FIELDS:
+                value = _intern(value)
+            elif name == 'labels' and isinstance(value, list):
+                value = tuple(_intern(label) for label in value)
+            self.columns[name].append(value)
+        self.layouts.append(_shared_layout(data))
+        extra = {key: value for key, value in data.items() if key not in self.columns}
+        self.extras.append(extra or None)
+
+    def extend(self, articles):
+        """Add many article dicts."""
+        for data in articles:
+            self.append(data)
+
+    def column(self, name):
+        """Return the values of one field, with None for missing entries."""
+        return [None if value is _MISSING else value for value in self.columns[name]]
+
+    def where(self, **criteria):
+        """Return the row indexes whose fields equal all the given values."""
+        rows = range(len(self))
+        for name, wanted in criteria.items():
+            values = self.columns[name]
+            rows = [row for row in rows if values[row] == wanted]
+        return list(rows)
+
+    def row(self, index):
+        """Return one article as a dict with its original key order."""
+        extra = self.extras[index] or {}
+        data = {}
+        for key in self.layouts[index]:
+            if key in self.columns:
+                value = self.columns[key][index]
+                data[key] = list(value) if key == 'labels' and isinstance(value, tuple) else value
+            else:
+                data[key] = extra[key]
+        return data
+
+    def to_dicts(self, rows=None):
+        """Return articles as dicts, all of them or only the given rows."""
+        if rows is None:
+            rows = range(len(self))
+        return [self.row(index) for index in rows]
+
+def load_articles(filename):
+    """Load a monthly content file as a list of Article records."""
+    with open(filename, 'r', encoding='utf-8') as f:
+        return [Article.from_dict(data) for data in json.load(f)]
+
+def load_columns(filenames):
+    """Load monthly content files into one ArticleColumns store."""
+    store = ArticleColumns()
+    for filename in filenames:
+        with open(filename, 'r', encoding='utf-8') as f:
+            store.extend(json.load(f))
+    return store
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark the memory held by 100,000 articles as dicts, Article records
+and an ArticleColumns store.
+Usage: python scripts/benchmark_article_store.py
+"""
+
+import gc
+import json
+import time
+import tracemalloc
+
+from article_store import Article, ArticleColumns
+
+COUNT = 100000
+
+def make_articles_json(count):
+    """Build a monthly-content style JSON document with count articles."""
+    priorities = ['Urgent', 'High', 'Normal']
+    categories = ['Article', 'Security', 'Cost Optimization', 'Event', 'Tip']
+    return json.dumps([
+        {
+            'issue_number': i,
+            'title': f'Article number {i} about the cloud',
+            'summary': f'Short summary of article {i}.',
+            'category': categories[i % len(categories)],
+            'content': f'Body of article {i}. ' * 4,
+            'author': f'Author {i % 200}',
+            'image': '',
+            'priority': priorities[i % 3],
+            'additional_notes': '',
+            'created_at': '2025-01-15T10:00:00+00:00',
+            'updated_at': '2025-01-16T10:00:00+00:00',
+            'labels': ['newsletter', 'approved'],
+            'state': 'open',
+            'url': f'https://github.com/hornmichi/Cloud-News/issues/{i}'
+        }
+        for i in range(count)
+    ])
+
+def measure(build, document):
+    """Return (retained MB, seconds, result) for building from a JSON document."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(document)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return retained / (1024 * 1024), elapsed, result
+
+def build_dicts(document):
+    """Keep the decoded dicts as they are."""
+    return json.loads(document)
+
+def build_records(document):
+    """Convert each decoded dict into an Article record."""
+    return [Article.from_dict(data) for data in json.loads(document)]
+
+def build_columns(document):
+    """Load every decoded dict into one columnar store."""
+    store = ArticleColumns()
+    store.extend(json.loads(document))
+    return store
+
+def main():
+    """Run the benchmark and print retained memory per representation."""
+    document = make_articles_json(COUNT)
+    originals = json.loads(document)
+
+    print(f"🧪 Article Store Memory Benchmark ({COUNT:,} articles)")
+    print("=" * 60)
+    print(f"{'representation':<18}{'retained MB':>14}{'bytes/article':>16}{'build s':>12}")
+
+    results = {}
+    for name, build in [("dicts", build_dicts), ("Article", build_records),
+                        ("ArticleColumns", build_columns)]:
+        megabytes, elapsed, result = measure(build, document)
+        results[name] = result
+        print(f"{name:<18}{megabytes:>14.1f}{megabytes * 1024 * 1024 / COUNT:>16.0f}{elapsed:>12.2f}")
+        del result
+
+    # Both compact forms must give back the collected JSON unchanged
+    assert [article.to_dict() for article in results["Article"]] == originals
+    assert results["ArticleColumns"].to_dicts() == originals
+    print("\n✅ Article and ArticleColumns round-trip to identical dicts")
+
+if __name__ == "__main__":
+    main()
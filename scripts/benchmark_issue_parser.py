@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark the single-pass issue parser against the old per-field regexes,
+after checking that it reads bold-field bodies the way the old line parser did.
+Usage: python scripts/benchmark_issue_parser.py
+"""
+
+import re
+import time
+
+from issue_parser import FORM_FIELDS, SINGLE_LINE_BOLD_KEYS, parse_issue_body
+
+SIZES = [1024, 10 * 1024, 100 * 1024, 1024 * 1024]
+
+def legacy_extract_field(body, field_name):
+    """The extract_field implementation previously used by collect_monthly_content.py."""
+    patterns = [
+        rf'{field_name}:\s*(.+?)(?=\n[A-Z][a-z]+:|$)',
+        rf'{field_name}\s*\n(.+?)(?=\n[A-Z][a-z]+:|$)',
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, body, re.DOTALL | re.IGNORECASE)
+        if match:
+            return match.group(1).strip()
+
+    return ""
+
+def legacy_parse(body):
+    """Parse a body the old way: one extract_field call per field."""
+    return {field: legacy_extract_field(body, field) for field in FORM_FIELDS}
+
+# Bold fields the old generate_newsletter_from_selected.py parser read, one line each
+LEGACY_BOLD_FIELDS = {
+    'Title': 'title', 'Summary': 'summary', 'Category': 'category',
+    'Priority': 'priority', 'Author': 'author', 'Image': 'image',
+}
+
+PARITY_BODIES = [
+    "**Title:** Foo\nSome intro para\n**Category:** Security\n**Author:** Jane\n",
+    "**Title:** Zero trust, part 2\n**Summary:** Why it matters\n**Priority:** High\n\n"
+    "**Content:**\nFirst paragraph.\n\nSecond paragraph.\n",
+    "**Title:** Foo\n**Author:** Jane Doe\nPlatform team\n**Image:** https://example.com/a.png\nCaption\n",
+]
+
+def legacy_parse_bold(body):
+    """The line-by-line bold-field parser previously used for selected issues."""
+    fields = {}
+    for line in body.split('\n'):
+        for label, key in LEGACY_BOLD_FIELDS.items():
+            if line.startswith(f'**{label}:**'):
+                fields[key] = line.replace(f'**{label}:**', '').strip()
+    return fields
+
+def check_parity():
+    """Fail if a one-line bold field is read differently from the old parser."""
+    for body in PARITY_BODIES:
+        expected = legacy_parse_bold(body)
+        parsed = parse_issue_body(body)
+        for key in SINGLE_LINE_BOLD_KEYS & expected.keys():
+            if parsed.get(key) != expected[key]:
+                raise SystemExit(f"❌ Parser mismatch for {key}: {parsed.get(key)!r} != {expected[key]!r}")
+    print(f"✅ Bold fields match the old parser on {len(PARITY_BODIES)} bodies")
+
+def make_body(size, layout):
+    """Build a synthetic issue body of roughly size bytes."""
+    filler_line = "Cloud costs fell again this quarter thanks to rightsizing and reserved capacity.\n"
+    filler = filler_line * max(1, size // len(filler_line))
+    values = {
+        'Article Title': 'Quarterly cloud cost review',
+        'Summary': 'How we cut spend without cutting capacity.',
+        'Content Category': 'Article',
+        'Full Content': filler,
+        'Author Name': 'Jane Doe - Platform',
+        'Image': '_No response_',
+        'Priority': 'High',
+        'Additional Notes': '_No response_',
+    }
+    if layout == 'form':
+        return ''.join(f"### {label}\n\n{value}\n\n" for label, value in values.items())
+    return ''.join(f"{label}: {value}\n" for label, value in values.items())
+
+def best_time(func, body, repeat):
+    """Return the best of repeat runs, in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(body)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    """Run the benchmark and print a comparison table."""
+    print("🧪 Issue Body Parser Benchmark")
+    print("=" * 62)
+    check_parity()
+    print(f"{'layout':<8}{'size':>10}{'extract_field':>16}{'single-pass':>15}{'speedup':>11}")
+
+    for layout in ('form', 'fields'):
+        for size in SIZES:
+            body = make_body(size, layout)
+            repeat = 20 if size <= 100 * 1024 else 3
+            legacy_ms = best_time(legacy_parse, body, repeat)
+            parser_ms = best_time(parse_issue_body, body, repeat)
+            print(f"{layout:<8}{len(body) // 1024:>8} KB{legacy_ms:>13.3f} ms{parser_ms:>12.3f} ms"
+                  f"{legacy_ms / parser_ms:>10.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark re-rendering a newsletter after a one-article edit, with and
+without the watch-mode article fragment cache.
+Usage: python scripts/benchmark_render_cache.py [articles]
+"""
+
+import sys
+import time
+
+import render_cache
+from edition_model import prepare_content, sort_content
+from template_cache import get_template
+
+TEMPLATE_NAME = "monthly_newsletter_template.html"
+
+FRAGMENT_NAME = "monthly_article.html"
+
+RUNS = 10
+
+def make_articles(count):
+    """Build synthetic articles with realistic content sizes."""
+    priorities = ['Urgent', 'High', 'Normal']
+    return prepare_content([
+        {
+            'title': f'Article {i}',
+            'summary': f'Summary for article {i}. ' * 3,
+            'content': ''.join(f'<p>Paragraph {p} of article {i}.</p>' for p in range(30)),
+            'category': f'Category {i % 6}',
+            'author': f'Author {i % 25}',
+            'priority': priorities[i % 3],
+            'image': 'https://example.com/image.png' if i % 4 == 0 else ''
+        }
+        for i in range(count)
+    ])
+
+def render(articles, use_cache):
+    """Render the full newsletter HTML the way generate_monthly_newsletter does."""
+    sorted_articles = sort_content(articles)
+    fragments = render_article_fragments(sorted_articles) if use_cache else None
+    return get_template(TEMPLATE_NAME).render(
+        articles=sorted_articles, article_fragments=fragments,
+        newsletter_date='January 2025', monthly_stats=None
+    )
+
+def render_article_fragments(articles):
+    """Render fragments through the shared cache."""
+    return render_cache.render_article_fragments(articles, FRAGMENT_NAME)
+
+def average_ms(func):
+    """Return the average run time of func in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        func()
+    return (time.perf_counter() - start) / RUNS * 1000
+
+def main():
+    """Run the benchmark and print the results."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    articles = make_articles(count)
+    edits = iter(range(10 ** 6))
+
+    def edit_one():
+        articles[count // 2]['summary'] = f'Edited summary {next(edits)}.'
+
+    try:
+        full = average_ms(lambda: (edit_one(), render(articles, False)))
+
+        # Watch mode: the cache stays warm between rebuilds
+        render_cache.enable_memory_fragment_cache()
+        render(articles, True)
+        in_memory = average_ms(lambda: (edit_one(), render(articles, True)))
+
+        assert render(articles, True) == render(articles, False)
+    finally:
+        render_cache._fragment_cache = None
+        render_cache._memory_cache_enabled = False
+
+    print(f"🧪 Re-render After One Edit ({count} articles)")
+    print("=" * 50)
+    print(f"  Full render, no fragment cache:  {full:8.2f} ms")
+    print(f"  Fragment cache (watch mode):     {in_memory:8.2f} ms")
+
+if __name__ == "__main__":
+    main()
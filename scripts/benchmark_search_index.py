@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark the static search index: build time, incremental update time,
+index size on disk (raw and gzipped) and query latency.
+Usage: python scripts/benchmark_search_index.py [years]
+"""
+
+import gzip
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import generate_monthly_newsletter_with_agenda as newsletter_script
+from build_search_index import INDEX_DIRNAME, build_search_index, search_index
+from edition_model import prepare_content
+
+ARTICLES_PER_EDITION = 40
+
+QUERIES = ["kubernetes", "zero trust networking", "cost optimization savings", "nonexistentterm"]
+
+QUERY_RUNS = 50
+
+def make_vocabulary(size):
+    """Build a synthetic vocabulary with a few real cloud terms."""
+    words = ["kubernetes", "zero", "trust", "networking", "cost", "optimization",
+             "savings", "serverless", "terraform", "observability", "latency"]
+    random.seed(42)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    while len(words) < size:
+        words.append(''.join(random.choice(letters) for _ in range(random.randint(4, 10))))
+    return words
+
+def make_edition(month_index, vocabulary):
+    """Build one edition's prepared articles from the vocabulary."""
+    rng = random.Random(month_index)
+    priorities = ['Urgent', 'High', 'Normal']
+    # Zipf-like word choice so a few terms are common and most are rare
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+
+    def sentence(length):
+        return ' '.join(rng.choices(vocabulary, weights, k=length))
+
+    return prepare_content([
+        {
+            'title': f'{sentence(4).title()} {month_index}-{i}',
+            'summary': sentence(20),
+            'content': f'<p>{sentence(250)}</p>',
+            'category': rng.choice(['Article', 'Security', 'Event', 'Tip']),
+            'author': f'Author {rng.randint(1, 60)}',
+            'priority': priorities[i % 3],
+            'image': ''
+        }
+        for i in range(ARTICLES_PER_EDITION)
+    ])
+
+def write_edition(directory, month_index, vocabulary, template):
+    """Render one edition into directory as monthly-newsletter-YYYYMM.html."""
+    year, month = 2000 + month_index // 12, month_index % 12 + 1
+    html = newsletter_script.generate_monthly_newsletter_html(make_edition(month_index, vocabulary), template)
+    with open(os.path.join(directory, f"monthly-newsletter-{year}{month:02d}.html"), 'w', encoding='utf-8') as f:
+        f.write(html)
+
+def index_size(index_dir):
+    """Return (files, raw bytes, gzipped bytes) of the index."""
+    files = raw = compressed = 0
+    for name in os.listdir(index_dir):
+        if not name.endswith('.json'):
+            continue
+        with open(os.path.join(index_dir, name), 'rb') as f:
+            data = f.read()
+        files += 1
+        raw += len(data)
+        compressed += len(gzip.compress(data, 9))
+    return files, raw, compressed
+
+def main():
+    """Run the benchmark and print the results."""
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    months = years * 12
+    vocabulary = make_vocabulary(20000)
+    template = newsletter_script.load_newsletter_template()
+    directory = tempfile.mkdtemp(prefix='search-bench-')
+    index_dir = os.path.join(directory, INDEX_DIRNAME)
+
+    try:
+        for month_index in range(months):
+            write_edition(directory, month_index, vocabulary, template)
+        html_bytes = sum(os.path.getsize(os.path.join(directory, name))
+                         for name in os.listdir(directory) if name.endswith('.html'))
+
+        start = time.perf_counter()
+        build_search_index(directory)
+        full_build = time.perf_counter() - start
+
+        write_edition(directory, months, vocabulary, template)
+        start = time.perf_counter()
+        build_search_index(directory)
+        incremental = time.perf_counter() - start
+
+        start = time.perf_counter()
+        build_search_index(directory)
+        unchanged = time.perf_counter() - start
+
+        files, raw, compressed = index_size(index_dir)
+
+        print(f"🧪 Search Index Benchmark ({months + 1} editions, "
+              f"{(months + 1) * ARTICLES_PER_EDITION:,} articles)")
+        print("=" * 60)
+        print(f"  Published HTML:           {html_bytes / 1024 / 1024:8.1f} MB")
+        print(f"  Index files:              {files:8d}")
+        print(f"  Index size (raw):         {raw / 1024 / 1024:8.1f} MB")
+        print(f"  Index size (gzip -9):     {compressed / 1024 / 1024:8.1f} MB")
+        print(f"  Largest shard (raw):      "
+              f"{max(os.path.getsize(os.path.join(index_dir, n)) for n in os.listdir(index_dir)) / 1024:8.1f} KB")
+        print(f"  Full build:               {full_build * 1000:8.1f} ms")
+        print(f"  Add one month:            {incremental * 1000:8.1f} ms")
+        print(f"  No changes:               {unchanged * 1000:8.1f} ms")
+
+        print("\n  Query latency (reads shards from disk each run):")
+        for query in QUERIES:
+            start = time.perf_counter()
+            for _ in range(QUERY_RUNS):
+                results = search_index(index_dir, query)
+            elapsed = (time.perf_counter() - start) / QUERY_RUNS * 1000
+            print(f"  - {query:<28} {elapsed:8.2f} ms  ({len(results)} results)")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
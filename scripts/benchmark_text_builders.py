@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Benchmark the list-based Markdown and agenda builders against the previous
+string-concatenation versions, from 100 to 10,000 articles.
+Usage: python scripts/benchmark_text_builders.py
+"""
+
+import time
+from datetime import datetime
+
+import generate_monthly_newsletter_with_agenda as newsletter_script
+import generate_newsletter_agenda as agenda_script
+from edition_model import prepare_content
+
+SIZES = [100, 1000, 5000, 10000]
+
+NEWSLETTER_URL = "https://github.com/hornmichi/Cloud-News/releases/latest"
+
+def legacy_teams_agenda(content, newsletter_url):
+    """generate_teams_agenda as it was, built with +=."""
+    now = datetime.now()
+    month_year = now.strftime('%B %Y')
+    
+    # Start with header
+    agenda = f"""📰 **Cloud News - {month_year}**
+
+Welcome to this month's newsletter! Here's what's inside:
+
+📊 **Monthly Highlights**
+• {len(content)} articles from our community
+• {len(set(article.get('category', '') for article in content))} different categories
+• {len(set(article.get('author', '') for article in content))} contributors
+
+---
+
+**📋 Table of Contents**
+
+"""
+    
+    # Sort content by priority and category
+    sorted_content = sorted(content, key=lambda x: (
+        {'Urgent': 0, 'High': 1, 'Normal': 2}.get(x.get('priority', 'Normal'), 2),
+        x.get('category', '')
+    ))
+    
+    # Group by category
+    categories = {}
+    for article in sorted_content:
+        category = article.get('category', 'Other')
+        if category not in categories:
+            categories[category] = []
+        categories[category].append(article)
+    
+    # Generate agenda items
+    for category, articles in categories.items():
+        agenda += f"\n**{category}**\n"
+        
+        for i, article in enumerate(articles):
+            title = article.get('title', 'Untitled')
+            author = article.get('author', 'Unknown')
+            priority = article.get('priority', 'Normal')
+            
+            # Create section ID
+            section_id = agenda_script.create_section_id(title)
+            
+            # Priority emoji
+            priority_emoji = {
+                'Urgent': '🔴',
+                'High': '🟡', 
+                'Normal': '⚪'
+            }.get(priority, '⚪')
+            
+            # Create link
+            link = f"{newsletter_url}#{section_id}"
+            
+            agenda += f"{priority_emoji} [{title}]({link}) - by {author}\n"
+    
+    # Add footer
+    agenda += f"""
+
+---
+
+**📝 Want to contribute?**
+Submit content for next month's newsletter: [Submit Here](https://github.com/hornmichi/Cloud-News/issues)
+
+**📧 Questions?**
+Contact us: newsletter@hornmichi.com
+
+---
+*This newsletter is automatically generated from community contributions.*
+"""
+    
+    return agenda
+
+def legacy_markdown(content):
+    """generate_monthly_newsletter_markdown as it was, built with +=."""
+    newsletter_date = datetime.now().strftime("%B %Y")
+    
+    markdown_content = f"""# 📰 Cloud News - {newsletter_date}
+
+Welcome to this month's Cloud News! Here's what's happening in our community.
+
+## 📊 Monthly Highlights
+
+- **Total Articles**: {len(content)}
+- **Categories**: {len(set(article.get('category', '') for article in content))}
+- **Contributors**: {len(set(article.get('author', '') for article in content))}
+- **Urgent Items**: {sum(1 for article in content if article.get('priority') == 'Urgent')}
+
+---
+
+"""
+    
+    # Sort content by priority and category
+    sorted_content = sorted(content, key=lambda x: (
+        {'Urgent': 0, 'High': 1, 'Normal': 2}.get(x.get('priority', 'Normal'), 2),
+        x.get('category', '')
+    ))
+    
+    for article in sorted_content:
+        title = article.get('title', 'Untitled')
+        section_id = newsletter_script.create_section_id(title)
+        
+        markdown_content += f"""## <a name="{section_id}"></a>{title}
+
+**Category:** {article['category']} | **Author:** {article['author']} | **Priority:** {article['priority']}
+
+{article['summary']}
+
+{article['content']}
+
+"""
+        
+        if article.get('image'):
+            markdown_content += f"![{title}]({article['image']})\n\n"
+        
+        markdown_content += "---\n\n"
+    
+    markdown_content += """---
+
+**Want to contribute?** [Submit content here](https://github.com/hornmichi/Cloud-News/issues)
+
+© 2024 Cloud News. All rights reserved.
+"""
+    
+    return markdown_content
+
+def make_articles(count):
+    """Build synthetic articles with realistic field sizes."""
+    priorities = ['Urgent', 'High', 'Normal']
+    return prepare_content([
+        {
+            'title': f'Article number {i} about the cloud',
+            'summary': 'A two sentence summary of the article. ' * 2,
+            'content': 'Paragraph of article content. ' * 40,
+            'category': f'Category {i % 7}',
+            'author': f'Author {i % 50}',
+            'priority': priorities[i % 3],
+            'image': 'https://example.com/image.png' if i % 4 == 0 else ''
+        }
+        for i in range(count)
+    ])
+
+def time_ms(func, *args):
+    """Return the best of three run times in milliseconds."""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    """Run the benchmark and print per-article cost at each size."""
+    builders = [
+        ("Markdown (+=)", legacy_markdown, ()),
+        ("Markdown (list)", newsletter_script.generate_monthly_newsletter_markdown, ()),
+        ("Teams agenda (+=)", legacy_teams_agenda, (NEWSLETTER_URL,)),
+        ("Teams agenda (list)", agenda_script.generate_teams_agenda, (NEWSLETTER_URL,)),
+        ("HTML agenda (list)", agenda_script.generate_html_agenda, (NEWSLETTER_URL,)),
+    ]
+
+    print("🧪 Text Builder Benchmark (µs per article)")
+    print("=" * 70)
+    print(f"{'builder':<22}" + ''.join(f"{size:>12,}" for size in SIZES))
+
+    articles = {size: make_articles(size) for size in SIZES}
+    for name, func, extra in builders:
+        row = [time_ms(func, articles[size], *extra) * 1000 / size for size in SIZES]
+        print(f"{name:<22}" + ''.join(f"{cost:>12.2f}" for cost in row))
+
+    print("\nA flat row means the builder scales linearly with article count.")
+    print("CPython can often grow a str in place on +=, so the old builders may look")
+    print("linear here too; the list builders do not depend on that optimisation.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Build a static full-text search index for the published newsletters.
+Every article block in newsletters/monthly-newsletter-YYYYMM.html becomes a
+document. Terms are written to small JSON shards keyed by their first two
+characters, so a static page only downloads the shards a query needs.
+Editions whose HTML did not change since the last build are not re-read.
+
+Usage: python build_search_index.py [newsletters_dir] [--query "words"]
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from html.parser import HTMLParser
+
+INDEX_DIRNAME = "search"
+
+MANIFEST_FILENAME = "manifest.json"
+
+DOCS_FILENAME = "docs.json"
+
+SEARCH_PAGE_TEMPLATE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'templates', 'search_page.html'
+)
+
+EDITION_FILE_RE = re.compile(r'^monthly-newsletter-(\d{6})\.html$')
+
+TOKEN_RE = re.compile(r'\w+')
+
+SHARD_PREFIX_RE = re.compile(r'[a-z0-9]+')
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have in into is it its of on or
+our that the their this to was we were will with you your
+""".split())
+
+INDEX_VERSION = 1
+
+def tokenize(text):
+    """Split text into lowercase index terms."""
+    return [
+        term for term in TOKEN_RE.findall(text.lower())
+        if len(term) > 1 and term not in STOPWORDS
+    ]
+
+def shard_key(term):
+    """Return the shard a term is stored in."""
+    prefix = term[:2]
+    return prefix if SHARD_PREFIX_RE.fullmatch(prefix) else '_'
+
+class ArticleExtractor(HTMLParser):
+    """Collect the anchor, title and text of each <div class="article"> block."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.articles = []
+        self.current = None
+        self.depth = 0
+        self.in_title = False
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag in ('script', 'style'):
+            self.skip_depth += 1
+        if self.current is None:
+            if tag == 'div' and 'article' in (attrs.get('class') or '').split():
+                self.current = {'anchor': attrs.get('id'), 'title': [], 'text': []}
+                self.depth = 1
+            return
+        if tag == 'div':
+            self.depth += 1
+        elif tag == 'h2' and not self.current['title']:
+            self.in_title = True
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style') and self.skip_depth:
+            self.skip_depth -= 1
+        if self.current is None:
+            return
+        if tag == 'h2':
+            self.in_title = False
+        elif tag == 'div':
+            self.depth -= 1
+            if self.depth == 0:
+                self.articles.append({
+                    'anchor': self.current['anchor'],
+                    'title': ''.join(self.current['title']).strip(),
+                    'text': ' '.join(self.current['text'])
+                })
+                self.current = None
+
+    def handle_data(self, data):
+        if self.current is None or self.skip_depth:
+            return
+        if self.in_title:
+            self.current['title'].append(data)
+        self.current['text'].append(data)
+
+def extract_articles(html):
+    """Return the article documents in one edition's HTML."""
+    extractor = ArticleExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return extractor.articles
+
+def encode_postings(postings):
+    """Encode {doc_id: term_count} as a flat list of doc-id gaps and counts."""
+    encoded = []
+    previous = 0
+    for doc_id in sorted(postings):
+        encoded.extend((doc_id - previous, postings[doc_id]))
+        previous = doc_id
+    return encoded
+
+def decode_postings(encoded):
+    """Decode a flat gap/count list back into {doc_id: term_count}."""
+    postings = {}
+    doc_id = 0
+    for i in range(0, len(encoded), 2):
+        doc_id += encoded[i]
+        postings[doc_id] = encoded[i + 1]
+    return postings
+
+def read_json(path, default):
+    """Read a JSON file, or return default if it does not exist."""
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def write_json(path, data):
+    """Write compact JSON atomically."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        # json.dumps uses the C encoder; json.dump to a file does not
+        f.write(json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+    os.replace(tmp_path, path)
+
+def shard_path(index_dir, key):
+    """Return the file name of a term shard."""
+    return os.path.join(index_dir, f"terms-{key}.json")
+
+def find_editions(newsletters_dir):
+    """Return {file name: YYYYMM} for every published edition."""
+    editions = {}
+    for name in os.listdir(newsletters_dir):
+        match = EDITION_FILE_RE.match(name)
+        if match:
+            editions[name] = match.group(1)
+    return editions
+
+def build_search_index(newsletters_dir="newsletters"):
+    """Update the search index next to the published editions.
+
+    Returns a dict with counts of indexed, removed and unchanged editions.
+    """
+    index_dir = os.path.join(newsletters_dir, INDEX_DIRNAME)
+    os.makedirs(index_dir, exist_ok=True)
+
+    manifest = read_json(os.path.join(index_dir, MANIFEST_FILENAME), {})
+    if manifest.get('version') != INDEX_VERSION:
+        manifest = {'version': INDEX_VERSION, 'editions': {}, 'shards': []}
+    docs = read_json(os.path.join(index_dir, DOCS_FILENAME), []) if manifest['editions'] else []
+
+    editions = find_editions(newsletters_dir)
+    changed = {}
+    for name in sorted(editions):
+        with open(os.path.join(newsletters_dir, name), 'rb') as f:
+            html_bytes = f.read()
+        digest = hashlib.sha256(html_bytes).hexdigest()
+        if manifest['editions'].get(name, {}).get('sha256') != digest:
+            changed[name] = (digest, html_bytes.decode('utf-8'))
+
+    removed = [name for name in manifest['editions'] if name not in editions]
+    stale_docs = set()
+    for name in removed + list(changed):
+        if name in manifest['editions']:
+            stale_docs.update(manifest['editions'].pop(name)['docs'])
+
+    if not changed and not removed:
+        return {'indexed': 0, 'removed': 0, 'unchanged': len(editions)}
+
+    # Every edition changed (e.g. a template update): start from scratch
+    # instead of leaving a hole in the document list for each old document
+    if stale_docs and len(stale_docs) == sum(1 for doc in docs if doc):
+        for key in manifest['shards']:
+            os.remove(shard_path(index_dir, key))
+        manifest['shards'] = []
+        docs = []
+        stale_docs = set()
+
+    shards = {}
+
+    def load_shard(key):
+        """Return a shard's encoded {term: postings}, reading it once."""
+        if key not in shards:
+            shards[key] = read_json(shard_path(index_dir, key), {})
+        return shards[key]
+
+    # The terms of dropped documents are unknown, so every shard is checked
+    for key in manifest['shards'] if stale_docs else []:
+        terms = load_shard(key)
+        for term in list(terms):
+            postings = decode_postings(terms[term])
+            if stale_docs.isdisjoint(postings):
+                continue
+            for doc_id in stale_docs.intersection(postings):
+                del postings[doc_id]
+            if postings:
+                terms[term] = encode_postings(postings)
+            else:
+                del terms[term]
+    for doc_id in stale_docs:
+        docs[doc_id] = None
+
+    new_postings = {}
+    for name, (digest, html) in changed.items():
+        month = editions[name]
+        doc_ids = []
+        for article in extract_articles(html):
+            doc_id = len(docs)
+            docs.append([name, article['anchor'], article['title'], month])
+            doc_ids.append(doc_id)
+
+            counts = {}
+            for term in tokenize(article['text']):
+                counts[term] = counts.get(term, 0) + 1
+            for term, count in counts.items():
+                new_postings.setdefault(term, []).extend((doc_id, count))
+        manifest['editions'][name] = {'sha256': digest, 'month': month, 'docs': doc_ids}
+
+    # New documents always get the highest IDs, so their postings are
+    # appended as gaps from the last ID already in each list
+    for term, postings in new_postings.items():
+        encoded = load_shard(shard_key(term)).setdefault(term, [])
+        previous = sum(encoded[0::2])
+        for i in range(0, len(postings), 2):
+            encoded.extend((postings[i] - previous, postings[i + 1]))
+            previous = postings[i]
+
+    # Rewrite only the shards that were loaded, dropping empty ones
+    live_shards = set(manifest['shards'])
+    for key, terms in shards.items():
+        if terms:
+            write_json(shard_path(index_dir, key), dict(sorted(terms.items())))
+            live_shards.add(key)
+        else:
+            if os.path.exists(shard_path(index_dir, key)):
+                os.remove(shard_path(index_dir, key))
+            live_shards.discard(key)
+    manifest['shards'] = sorted(live_shards)
+    manifest['documents'] = sum(1 for doc in docs if doc)
+
+    write_json(os.path.join(index_dir, DOCS_FILENAME), docs)
+    write_json(os.path.join(index_dir, MANIFEST_FILENAME), manifest)
+    if os.path.exists(SEARCH_PAGE_TEMPLATE):
+        shutil.copyfile(SEARCH_PAGE_TEMPLATE, os.path.join(index_dir, "index.html"))
+
+    return {'indexed': len(changed), 'removed': len(removed),
+            'unchanged': len(editions) - len(changed)}
+
+def search_index(index_dir, query, limit=20):
+    """Return [(score, doc)] for documents containing every query term."""
+    manifest = read_json(os.path.join(index_dir, MANIFEST_FILENAME), {'shards': []})
+    terms = sorted(set(tokenize(query)))
+    if not terms:
+        return []
+
+    matches = None
+    shard_cache = {}
+    for term in terms:
+        key = shard_key(term)
+        if key not in manifest['shards']:
+            return []
+        if key not in shard_cache:
+            shard_cache[key] = read_json(shard_path(index_dir, key), {})
+        postings = decode_postings(shard_cache[key].get(term, []))
+        if matches is None:
+            matches = postings
+        else:
+            matches = {doc_id: matches[doc_id] + count
+                       for doc_id, count in postings.items() if doc_id in matches}
+        if not matches:
+            return []
+
+    docs = read_json(os.path.join(index_dir, DOCS_FILENAME), [])
+    ranked = sorted(matches.items(), key=lambda item: (-item[1], -item[0]))[:limit]
+    return [(score, docs[doc_id]) for doc_id, score in ranked]
+
+def main():
+    """Build the index and optionally run a query against it."""
+    args = sys.argv[1:]
+    query = None
+    if '--query' in args:
+        position = args.index('--query')
+        query = ' '.join(args[position + 1:])
+        args = args[:position]
+    newsletters_dir = args[0] if args else "newsletters"
+
+    if not os.path.isdir(newsletters_dir):
+        print(f"Error: {newsletters_dir} does not exist")
+        sys.exit(1)
+
+    print("🔎 Building Newsletter Search Index")
+    print("=" * 40)
+    start = time.perf_counter()
+    stats = build_search_index(newsletters_dir)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"Indexed {stats['indexed']} editions, removed {stats['removed']}, "
+          f"{stats['unchanged']} unchanged ({elapsed:.1f} ms)")
+    print(f"  - Index: {os.path.join(newsletters_dir, INDEX_DIRNAME)}")
+
+    if query:
+        start = time.perf_counter()
+        results = search_index(os.path.join(newsletters_dir, INDEX_DIRNAME), query)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"\nResults for '{query}' ({elapsed:.2f} ms):")
+        for score, (name, anchor, title, month) in results:
+            link = f"{name}#{anchor}" if anchor else name
+            print(f"  {score:>3}  {month[:4]}-{month[4:]}  {title}  ({link})")
+
+if __name__ == "__main__":
+    main()
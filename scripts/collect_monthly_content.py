@@ -2,53 +2,67 @@
 """
 Collect monthly newsletter content from GitHub issues.
 This script collects all approved content for the current month.
+
+Usage: python collect_monthly_content.py [--incremental]
+
+With --incremental, only issues updated since the last run are fetched and
+merged into the month's content file, so collection can run hourly.
 """
 
 import os
+import sys
 import json
-import re
 from datetime import datetime, timedelta
-from github import Github
 from dateutil import parser
 
+from github_client import create_session, list_repo_issues, report_http_cache, report_rate_limits
+from issue_parser import parse_issue
+from issue_snapshot import get_snapshot
+
 def get_monthly_content():
     """Collect all approved content for the current month."""
+    # Read issues from a local snapshot when GITHUB_SNAPSHOT is set
+    snapshot = get_snapshot()
+    
     # Initialize GitHub client
     github_token = os.getenv('GITHUB_TOKEN')
-    if not github_token:
+    if snapshot is None and not github_token:
         print("Error: GITHUB_TOKEN environment variable not set")
         return []
     
-    g = Github(github_token)
-    
     # Get repository information
     repo_name = os.getenv('GITHUB_REPOSITORY', 'hornmichi/Cloud-News')
-    repo = g.get_repo(repo_name)
     
     # Get current month boundaries
     now = datetime.now()
-    start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    if now.month == 12:
-        end_of_month = now.replace(year=now.year + 1, month=1, day=1) - timedelta(seconds=1)
-    else:
-        end_of_month = now.replace(month=now.month + 1, day=1) - timedelta(seconds=1)
+    start_of_month, end_of_month = get_month_bounds(now)
     
     print(f"Collecting content from {start_of_month.strftime('%B %Y')}")
     print(f"Period: {start_of_month.date()} to {end_of_month.date()}")
     
     # Get all approved issues for the current month
-    issues = repo.get_issues(
-        state='open',
-        labels=['newsletter', 'approved'],
-        since=start_of_month
-    )
+    if snapshot is not None:
+        print(f"Reading issues from snapshot {snapshot.path}")
+        issues = snapshot.list_issues(('newsletter', 'approved'), 'open', since=start_of_month)
+    else:
+        issues, _ = list_repo_issues(
+            create_session(github_token),
+            repo_name,
+            {'state': 'open', 'labels': 'newsletter,approved', 'since': start_of_month.isoformat()}
+        )
     
     monthly_content = []
+    latest = None
     
     for issue in issues:
+        created_at = parser.isoparse(issue['created_at'])
+        updated_at = parser.isoparse(issue['updated_at'])
+        if latest is None or updated_at > latest:
+            latest = updated_at
+        
         # Check if issue was created or updated in current month
-        if (start_of_month <= issue.created_at <= end_of_month or 
-            start_of_month <= issue.updated_at <= end_of_month):
+        if (start_of_month <= created_at.replace(tzinfo=None) <= end_of_month or 
+            start_of_month <= updated_at.replace(tzinfo=None) <= end_of_month):
             
             content_data = extract_issue_data(issue)
             if content_data:
@@ -64,6 +78,9 @@ def get_monthly_content():
     with open(filename, 'w', encoding='utf-8') as f:
         json.dump(monthly_content, f, indent=2, ensure_ascii=False)
     
+    # Let later --incremental runs start from here
+    save_sync_cursor(timestamp, latest, snapshot=snapshot)
+    
     print(f"\n📊 Monthly Content Summary:")
     print(f"  - Total articles: {len(monthly_content)}")
     print(f"  - Saved to: {filename}")
@@ -74,41 +91,137 @@ def get_monthly_content():
     return monthly_content
 
 def extract_issue_data(issue):
-    """Extract structured data from a GitHub issue."""
-    body = issue.body or ""
-    
-    data = {
-        'issue_number': issue.number,
-        'title': extract_field(body, 'Article Title'),
-        'summary': extract_field(body, 'Summary'),
-        'category': extract_field(body, 'Content Category'),
-        'content': extract_field(body, 'Full Content'),
-        'author': extract_field(body, 'Author Name'),
-        'image': extract_field(body, 'Image'),
-        'priority': extract_field(body, 'Priority'),
-        'additional_notes': extract_field(body, 'Additional Notes'),
-        'created_at': issue.created_at.isoformat(),
-        'updated_at': issue.updated_at.isoformat(),
-        'labels': [label.name for label in issue.labels],
-        'state': issue.state,
-        'url': issue.html_url
-    }
+    """Extract structured data from a GitHub issue (REST JSON)."""
+    data = {'issue_number': issue['number']}
+    data.update(parse_issue(issue.get('body'))._asdict())
+    data.update({
+        'created_at': parser.isoparse(issue['created_at']).isoformat(),
+        'updated_at': parser.isoparse(issue['updated_at']).isoformat(),
+        'labels': [label['name'] for label in issue.get('labels', [])],
+        'state': issue['state'],
+        'url': issue['html_url']
+    })
     
     return data
 
-def extract_field(body, field_name):
-    """Extract a specific field from the issue body."""
-    patterns = [
-        rf'{field_name}:\s*(.+?)(?=\n[A-Z][a-z]+:|$)',
-        rf'{field_name}\s*\n(.+?)(?=\n[A-Z][a-z]+:|$)',
-    ]
+def get_incremental_content():
+    """Fetch issues changed since the stored cursor and merge them into this month's content."""
+    # Read issues from a local snapshot when GITHUB_SNAPSHOT is set
+    snapshot = get_snapshot()
     
-    for pattern in patterns:
-        match = re.search(pattern, body, re.DOTALL | re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
+    github_token = os.getenv('GITHUB_TOKEN')
+    if snapshot is None and not github_token:
+        print("Error: GITHUB_TOKEN environment variable not set")
+        return []
     
-    return ""
+    repo_name = os.getenv('GITHUB_REPOSITORY', 'hornmichi/Cloud-News')
+    
+    start_of_month, end_of_month = get_month_bounds(datetime.now())
+    timestamp = start_of_month.strftime("%Y%m")
+    filename = f"content/monthly_content_{timestamp}.json"
+    
+    monthly_content = load_json(filename, [])
+    cursor = load_json(sync_cursor_path(timestamp, snapshot), {})
+    since = cursor.get('updated_at') or start_of_month.isoformat()
+    
+    print(f"Collecting changes since {since}")
+    
+    # Include closed and unapproved issues so withdrawn content can be dropped
+    if snapshot is not None:
+        print(f"Reading issues from snapshot {snapshot.path}")
+        issues = snapshot.list_issues(('newsletter',), 'all', since=parser.isoparse(since))
+        etag = None
+    else:
+        issues, etag = list_repo_issues(
+            create_session(github_token),
+            repo_name,
+            {'state': 'all', 'labels': 'newsletter', 'since': since},
+            etag=cursor.get('etag') if cursor.get('since') == since else None
+        )
+    
+    if issues is None:
+        print("✓ No changes since last run (304 Not Modified)")
+        return monthly_content
+    
+    merged = {article['issue_number']: article for article in monthly_content}
+    latest = parser.isoparse(cursor['updated_at']) if cursor.get('updated_at') else None
+    
+    for issue in issues:
+        number = issue['number']
+        labels = {label['name'] for label in issue.get('labels', [])}
+        created_at = parser.isoparse(issue['created_at'])
+        updated_at = parser.isoparse(issue['updated_at'])
+        
+        if latest is None or updated_at > latest:
+            latest = updated_at
+        
+        in_month = (start_of_month <= created_at.replace(tzinfo=None) <= end_of_month or
+                    start_of_month <= updated_at.replace(tzinfo=None) <= end_of_month)
+        
+        if issue['state'] == 'open' and 'approved' in labels and in_month:
+            content_data = extract_issue_data(issue)
+            print(f"{'↻ Updated' if number in merged else '✓ Collected'}: {content_data['title']}")
+            merged[number] = content_data
+        elif merged.pop(number, None) is not None:
+            print(f"✗ Removed: issue #{number}")
+    
+    monthly_content = list(merged.values())
+    
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(monthly_content, f, indent=2, ensure_ascii=False)
+    
+    save_sync_cursor(timestamp, latest, since, etag, snapshot)
+    
+    print(f"\n📊 Monthly Content Summary:")
+    print(f"  - Changed issues: {len(issues)}")
+    print(f"  - Total articles: {len(monthly_content)}")
+    print(f"  - Saved to: {filename}")
+    
+    create_content_summary(monthly_content, start_of_month)
+    
+    return monthly_content
+
+def get_month_bounds(now):
+    """Return the first and last moment of the month containing now."""
+    start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    if now.month == 12:
+        end_of_month = start_of_month.replace(year=now.year + 1, month=1) - timedelta(seconds=1)
+    else:
+        end_of_month = start_of_month.replace(month=now.month + 1) - timedelta(seconds=1)
+    return start_of_month, end_of_month
+
+def sync_cursor_path(timestamp, snapshot=None):
+    """Return the sync cursor file for a month.
+
+    Snapshot runs keep their own cursor, so snapshot timestamps never move
+    the cursor of live collection.
+    """
+    if snapshot is not None:
+        return f"content/sync_cursor_{timestamp}.snapshot.json"
+    return f"content/sync_cursor_{timestamp}.json"
+
+def save_sync_cursor(timestamp, updated_at, since=None, etag=None, snapshot=None):
+    """Save the incremental sync cursor for a month.
+
+    The etag belongs to the listing query made with `since`, so it is only
+    reused while the next run queries with the same value.
+    """
+    cursor = {
+        'updated_at': updated_at.isoformat() if updated_at else None,
+        'since': since,
+        'etag': etag
+    }
+    with open(sync_cursor_path(timestamp, snapshot), 'w', encoding='utf-8') as f:
+        json.dump(cursor, f, indent=2)
+
+def load_json(filename, default):
+    """Load a JSON file, returning default if it does not exist."""
+    if not os.path.exists(filename):
+        return default
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
 def create_content_summary(content, month_date):
     """Create a summary of the monthly content."""
@@ -149,13 +262,19 @@ def main():
     print("📰 Collecting Monthly Newsletter Content")
     print("=" * 50)
     
-    content = get_monthly_content()
+    if '--incremental' in sys.argv[1:]:
+        content = get_incremental_content()
+    else:
+        content = get_monthly_content()
     
     if not content:
         print("\n⚠️  No approved content found for this month.")
         print("   Consider extending the deadline or encouraging more submissions.")
     else:
         print(f"\n✅ Successfully collected {len(content)} articles for the monthly newsletter!")
+    
+    report_http_cache()
+    report_rate_limits()
 
 if __name__ == "__main__":
     main()
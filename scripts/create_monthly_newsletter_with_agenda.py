@@ -2,52 +2,88 @@
 """
 Create monthly newsletter with agenda for Teams.
 This script generates both the newsletter and the Teams agenda.
+
+Everything is rendered in one process from a single load of the month's
+content: HTML and Markdown newsletter, Teams agenda, HTML agenda and the
+copy-paste text.
 """
 
-import os
-import subprocess
-import sys
+import time
 from datetime import datetime
 
-def run_script(script_name):
-    """Run a Python script and return success status."""
-    try:
-        result = subprocess.run([sys.executable, f"scripts/{script_name}"], 
-                              capture_output=True, text=True, cwd=os.getcwd())
-        if result.returncode == 0:
-            print(f"✅ {script_name} completed successfully")
-            return True
-        else:
-            print(f"❌ {script_name} failed:")
-            print(result.stderr)
-            return False
-    except Exception as e:
-        print(f"❌ Error running {script_name}: {e}")
-        return False
+import generate_monthly_newsletter_with_agenda as newsletter
+import generate_newsletter_agenda as agenda
+from edition_model import sort_content
+from render_cache import report_fragment_cache
+
+NEWSLETTER_URL = "https://github.com/hornmichi/Cloud-News/releases/latest"
+
+def run_stage(timings, name, func, *args, **kwargs):
+    """Run one pipeline stage and record how long it took."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    timings.append((name, time.perf_counter() - start))
+    return result
+
+def render_edition(content, newsletter_url=NEWSLETTER_URL):
+    """Render every output format for one edition and save the files.
+
+    Returns a list of (stage, seconds) timings.
+    """
+    timings = []
+    # Sorted once here; the renderers below are told not to sort again
+    sorted_content = run_stage(timings, "Sort content", sort_content, content)
+
+    template = run_stage(timings, "Load template", newsletter.load_newsletter_template)
+    html_content = run_stage(timings, "Newsletter HTML",
+                             newsletter.generate_monthly_newsletter_html, sorted_content, template,
+                             presorted=True)
+    markdown_content = run_stage(timings, "Newsletter Markdown",
+                                 newsletter.generate_monthly_newsletter_markdown, sorted_content,
+                                 presorted=True)
+    teams_agenda = run_stage(timings, "Teams agenda",
+                             agenda.generate_teams_agenda, sorted_content, newsletter_url,
+                             presorted=True)
+    # The HTML agenda groups categories in collection order
+    html_agenda = run_stage(timings, "HTML agenda",
+                            agenda.generate_html_agenda, content, newsletter_url)
+
+    run_stage(timings, "Save newsletter files",
+              newsletter.save_newsletter_files, html_content, markdown_content)
+    run_stage(timings, "Save agenda files",
+              agenda.save_agenda_files, teams_agenda, html_agenda)
+
+    return timings
 
 def main():
     """Main function to create newsletter with agenda."""
     print("📰 Creating Monthly Newsletter with Teams Agenda")
     print("=" * 55)
-    
-    # Step 1: Generate newsletter with section IDs
-    print("\n1️⃣ Generating newsletter with section IDs...")
-    if not run_script("generate_monthly_newsletter_with_agenda.py"):
-        print("❌ Newsletter generation failed. Stopping.")
-        return
-    
-    # Step 2: Generate Teams agenda
-    print("\n2️⃣ Generating Teams agenda...")
-    if not run_script("generate_newsletter_agenda.py"):
-        print("❌ Agenda generation failed. Stopping.")
+
+    started = time.perf_counter()
+    content = newsletter.load_monthly_content()
+    load_time = time.perf_counter() - started
+
+    if not content:
+        print("No content found for this month. Please collect content first.")
         return
-    
+
+    print(f"Found {len(content)} articles for {datetime.now().strftime('%B %Y')}\n")
+
+    timings = [("Load content", load_time)] + render_edition(content)
+
+    print("\n⏱️  Stage timings:")
+    for stage, seconds in timings:
+        print(f"  - {stage:<22} {seconds * 1000:8.1f} ms")
+    print(f"  - {'Total':<22} {(time.perf_counter() - started) * 1000:8.1f} ms")
+    report_fragment_cache()
+
     print("\n🎉 Newsletter and agenda creation complete!")
     print("\n📋 Files created:")
     print("  - Monthly newsletter (HTML & Markdown)")
     print("  - Teams agenda (copy-paste ready)")
     print("  - HTML agenda (for web viewing)")
-    
+
     print("\n💡 Next steps:")
     print("1. Review the newsletter draft")
     print("2. Copy the agenda from teams-copy-paste-*.txt")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Shared edition model for the newsletter renderers.
+Per-article sort and link fields are computed once when content is loaded,
+and edition statistics come from a single pass over the articles.
+"""
+
+import re
+from operator import itemgetter
+
+PRIORITY_RANK = {'Urgent': 0, 'High': 1, 'Normal': 2}
+
+PRIORITY_EMOJI = {'Urgent': '🔴', 'High': '🟡', 'Normal': '⚪'}
+
+DEFAULT_CATEGORY = 'Other'
+
+SECTION_ID_STRIP_RE = re.compile(r'[^a-zA-Z0-9\s-]')
+
+SECTION_ID_SPACE_RE = re.compile(r'\s+')
+
+sort_key = itemgetter('priority_rank', 'category_key')
+
+def create_section_id(title):
+    """Create a URL-friendly section ID from title."""
+    # Remove special characters and convert to lowercase
+    id_text = SECTION_ID_STRIP_RE.sub('', title)
+    id_text = SECTION_ID_SPACE_RE.sub('-', id_text.lower())
+    return id_text
+
+def prepare_article(article):
+    """Add the precomputed priority_rank, category_key and section_id fields."""
+    article['priority_rank'] = PRIORITY_RANK.get(article.get('priority', 'Normal'), 2)
+    article['category_key'] = (article.get('category') or '').strip() or DEFAULT_CATEGORY
+    article['section_id'] = create_section_id(article.get('title', 'Untitled'))
+    return article
+
+def prepare_content(content):
+    """Prepare every article of an edition in place and return the list."""
+    for article in content:
+        prepare_article(article)
+    return content
+
+def sort_content(content):
+    """Sort prepared content by priority, then category."""
+    return sorted(content, key=sort_key)
+
+def edition_stats(content):
+    """Count articles, categories, contributors and urgent items in one pass."""
+    categories = set()
+    authors = set()
+    urgent_count = 0
+    for article in content:
+        categories.add(article['category_key'])
+        authors.add(article.get('author', ''))
+        if article['priority_rank'] == 0:
+            urgent_count += 1
+    return {
+        'total_articles': len(content),
+        'categories_count': len(categories),
+        'authors_count': len(authors),
+        'urgent_count': urgent_count
+    }
+
+def group_by_category(content):
+    """Group prepared articles by category, keeping their order."""
+    categories = {}
+    for article in content:
+        categories.setdefault(article['category_key'], []).append(article)
+    return categories
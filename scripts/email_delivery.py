@@ -0,0 +1,612 @@
+#!/usr/bin/env python3
+"""
+Deliver a newsletter edition to the subscriber list over SMTP.
+Messages are rendered per subscriber in batches and sent across a small pool
+of persistent SMTP connections, so each connection's TLS handshake and login
+is paid once per many messages. When the server advertises PIPELINING, the
+MAIL FROM, RCPT TO and DATA commands of a message go out in one round trip.
+Sending is paced by a token bucket, transient (4xx) failures are retried
+with backoff, and every delivered or rejected address is appended to a
+per-edition checkpoint, so an interrupted run resumes where it stopped.
+
+Usage: python email_delivery.py [YYYYMM] [--subscribers FILE] [--restart]
+
+Subscribers are read from a CSV file with an "email" column and an optional
+"name" column (default: subscribers.csv, or $EMAIL_SUBSCRIBERS).
+"""
+
+import argparse
+import base64
+import csv
+import html
+import json
+import os
+import queue
+import random
+import re
+import smtplib
+import ssl
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from email.header import Header
+from email.utils import formataddr, formatdate, make_msgid, parseaddr
+from typing import NamedTuple
+from urllib.parse import quote
+
+from email_inline import build_email_html, email_filename
+from rate_limit import TokenBucket
+
+DEFAULT_SUBSCRIBERS_PATH = "subscribers.csv"
+
+DEFAULT_CHECKPOINT_DIR = ".cache/email-delivery"
+
+DEFAULT_SMTP_PORT = 587
+
+DEFAULT_CONNECTIONS = 4
+
+DEFAULT_BATCH_SIZE = 200
+
+DEFAULT_MESSAGES_PER_SECOND = 10
+
+# Many providers close a connection after 100 messages; reconnect before that
+DEFAULT_MESSAGES_PER_CONNECTION = 100
+
+DEFAULT_MAX_RETRIES = 3
+
+SMTP_TIMEOUT = 60
+
+RETRY_BACKOFF_CAP = 30.0
+
+ADDRESS_RE = re.compile(r'^[^@\s<>",;]+@[^@\s<>",;]+\.[^@\s<>",;]+$')
+
+BODY_OPEN_RE = re.compile(r'<body\b[^>]*>', re.I)
+
+BODY_CLOSE_RE = re.compile(r'</body\s*>', re.I)
+
+# A line starting with "." would end DATA early; RFC 5321 doubles it
+DOT_LINE_RE = re.compile(rb'^\.', re.M)
+
+class SMTPSettings(NamedTuple):
+    """Connection and pacing settings for one delivery run."""
+    host: str = ''
+    port: int = DEFAULT_SMTP_PORT
+    security: str = 'starttls'
+    username: str = ''
+    password: str = ''
+    sender: str = ''
+    connections: int = DEFAULT_CONNECTIONS
+    batch_size: int = DEFAULT_BATCH_SIZE
+    messages_per_second: float = DEFAULT_MESSAGES_PER_SECOND
+    messages_per_connection: int = DEFAULT_MESSAGES_PER_CONNECTION
+    max_retries: int = DEFAULT_MAX_RETRIES
+
+class Subscriber(NamedTuple):
+    """One recipient; name may be empty."""
+    email: str
+    name: str = ''
+
+class DeliveryError(Exception):
+    """An SMTP reply or connection failure for one message.
+
+    code is the SMTP reply code, or None when the connection failed.
+    after_data is True when the connection was lost after the whole message
+    was written, so the server may have accepted it.
+    """
+
+    def __init__(self, code, message, after_data=False):
+        super().__init__(f"{code} {message}" if code else message)
+        self.code = code
+        self.after_data = after_data
+
+    @property
+    def permanent(self):
+        """True for 5xx replies, which are not worth retrying."""
+        return self.code is not None and 500 <= self.code < 600
+
+def env_number(name, default, cast=int):
+    """Read a numeric setting from the environment."""
+    try:
+        return cast(os.getenv(name, default))
+    except ValueError:
+        return default
+
+def get_smtp_settings():
+    """Read SMTP and pacing settings from the environment."""
+    return SMTPSettings(
+        host=os.getenv('SMTP_HOST', ''),
+        port=env_number('SMTP_PORT', DEFAULT_SMTP_PORT),
+        security=os.getenv('SMTP_SECURITY', 'starttls').lower(),
+        username=os.getenv('SMTP_USERNAME', ''),
+        # Most email APIs accept their API key as the SMTP password
+        password=os.getenv('SMTP_PASSWORD') or os.getenv('EMAIL_API_KEY', ''),
+        sender=os.getenv('EMAIL_FROM', ''),
+        connections=max(1, env_number('EMAIL_SMTP_CONNECTIONS', DEFAULT_CONNECTIONS)),
+        batch_size=max(1, env_number('EMAIL_BATCH_SIZE', DEFAULT_BATCH_SIZE)),
+        messages_per_second=env_number('EMAIL_SEND_RATE', DEFAULT_MESSAGES_PER_SECOND, float),
+        messages_per_connection=max(1, env_number('EMAIL_MESSAGES_PER_CONNECTION',
+                                                  DEFAULT_MESSAGES_PER_CONNECTION)),
+        max_retries=max(0, env_number('EMAIL_MAX_RETRIES', DEFAULT_MAX_RETRIES)),
+    )
+
+def load_subscribers(path):
+    """Return the subscribers in a CSV file, without duplicate addresses."""
+    subscribers = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            row = {(key or '').strip().lower(): (value or '').strip() for key, value in row.items()}
+            address = row.get('email', '')
+            if address and address.lower() not in subscribers:
+                # Names end up in a header; never let them carry line breaks
+                subscribers[address.lower()] = Subscriber(address, ' '.join(row.get('name', '').split()))
+    return list(subscribers.values())
+
+def base64_lines(text):
+    """Return text as UTF-8 base64 with CRLF line endings."""
+    return base64.encodebytes(text.encode('utf-8')).replace(b'\n', b'\r\n')
+
+class MessageTemplate:
+    """An edition's message, rendered to bytes once per subscriber.
+
+    Headers shared by every recipient are encoded once; each render adds the
+    recipient's To, Message-ID and List-Unsubscribe headers, a greeting and
+    an unsubscribe footer.
+    """
+
+    def __init__(self, subject, sender, text, html_body=None, unsubscribe_url=''):
+        self.text = text
+        self.unsubscribe_url = unsubscribe_url
+        self.domain = parseaddr(sender)[1].rpartition('@')[2] or 'localhost'
+        self.boundary = f"=_{uuid.uuid4().hex}"
+        if not subject.isascii():
+            subject = Header(subject, 'utf-8').encode()
+        self.common_headers = (
+            f"From: {formataddr(parseaddr(sender), charset='utf-8')}\r\n"
+            f"Subject: {subject}\r\n"
+            f"Date: {formatdate(usegmt=True)}\r\n"
+            "MIME-Version: 1.0\r\n"
+        ).encode('ascii')
+
+        # Split around <body> so the greeting and footer can be placed inside it
+        self.html_parts = None
+        if html_body:
+            opening = BODY_OPEN_RE.search(html_body)
+            closing = BODY_CLOSE_RE.search(html_body)
+            start = opening.end() if opening else 0
+            end = closing.start() if closing and closing.start() >= start else len(html_body)
+            self.html_parts = (html_body[:start], html_body[start:end], html_body[end:])
+
+    def personal_unsubscribe_url(self, subscriber):
+        """Return the subscriber's unsubscribe link, or ''."""
+        if not self.unsubscribe_url:
+            return ''
+        return self.unsubscribe_url.replace('{email}', quote(subscriber.email, safe=''))
+
+    def render_text(self, subscriber, unsubscribe):
+        """Return the personalized plain text body."""
+        greeting = f"Hi {subscriber.name},\n\n" if subscriber.name else ""
+        footer = f"\n\n--\nYou receive Cloud News at {subscriber.email}."
+        if unsubscribe:
+            footer += f" Unsubscribe: {unsubscribe}"
+        return f"{greeting}{self.text}{footer}\n"
+
+    def render_html(self, subscriber, unsubscribe):
+        """Return the personalized HTML body."""
+        head, body, tail = self.html_parts
+        greeting = f"<p>Hi {html.escape(subscriber.name)},</p>" if subscriber.name else ""
+        footer = f"You receive Cloud News at {html.escape(subscriber.email)}."
+        if unsubscribe:
+            footer += f' <a href="{html.escape(unsubscribe)}" style="color:#666">Unsubscribe</a>'
+        return f'{head}{greeting}{body}<p style="color:#666;font-size:12px">{footer}</p>{tail}'
+
+    def render(self, subscriber):
+        """Return the complete message for one subscriber as CRLF bytes."""
+        unsubscribe = self.personal_unsubscribe_url(subscriber)
+        headers = [
+            f"To: {recipient_header(subscriber)}",
+            f"Message-ID: {make_msgid(domain=self.domain)}",
+        ]
+        if unsubscribe:
+            # One-click unsubscribe (RFC 8058), expected by Gmail and Yahoo for bulk mail
+            headers.append(f"List-Unsubscribe: <{unsubscribe}>")
+            headers.append("List-Unsubscribe-Post: List-Unsubscribe=One-Click")
+
+        text_part = base64_lines(self.render_text(subscriber, unsubscribe))
+        if self.html_parts is None:
+            headers += ['Content-Type: text/plain; charset="utf-8"', 'Content-Transfer-Encoding: base64']
+            body = text_part
+        else:
+            html_part = base64_lines(self.render_html(subscriber, unsubscribe))
+            headers.append(f'Content-Type: multipart/alternative; boundary="{self.boundary}"')
+            delimiter = f"--{self.boundary}\r\n".encode('ascii')
+            part_headers = 'Content-Type: text/{}; charset="utf-8"\r\nContent-Transfer-Encoding: base64\r\n\r\n'
+            body = b''.join([
+                delimiter, part_headers.format('plain').encode('ascii'), text_part,
+                delimiter, part_headers.format('html').encode('ascii'), html_part,
+                f"--{self.boundary}--\r\n".encode('ascii'),
+            ])
+        return self.common_headers + '\r\n'.join(headers).encode('utf-8') + b'\r\n\r\n' + body
+
+def recipient_header(subscriber):
+    """Return the To header value for a subscriber.
+
+    formataddr only takes ASCII addresses; an internationalized address is
+    written as UTF-8 (RFC 6532) and only sent to servers with SMTPUTF8.
+    """
+    if subscriber.email.isascii():
+        return formataddr((subscriber.name, subscriber.email), charset='utf-8')
+    if not subscriber.name:
+        return subscriber.email
+    display_name = formataddr((subscriber.name, 'x'), charset='utf-8').rpartition(' <')[0]
+    return f"{display_name} <{subscriber.email}>"
+
+class PooledConnection:
+    """An open SMTP connection and the number of messages sent on it."""
+
+    def __init__(self, smtp):
+        self.smtp = smtp
+        self.sent = 0
+        self.pipelining = smtp.has_extn('pipelining')
+
+    def send(self, sender, recipient, data):
+        """Send one message; raise DeliveryError when it is not accepted."""
+        try:
+            if self.pipelining and recipient.isascii():
+                self._send_pipelined(sender, recipient, data)
+            else:
+                self._send_plain(sender, recipient, data)
+        except (smtplib.SMTPServerDisconnected, OSError) as e:
+            raise DeliveryError(None, f"connection lost: {e}") from e
+        self.sent += 1
+
+    def _send_pipelined(self, sender, recipient, data):
+        """MAIL, RCPT and DATA in one write (RFC 2920), then the message body."""
+        self.smtp.send(f"MAIL FROM:<{sender}>\r\nRCPT TO:<{recipient}>\r\nDATA\r\n")
+        replies = [self.smtp.getreply() for _ in range(3)]
+        refused = next((reply for reply in replies[:2] if reply[0] >= 400), None)
+        if refused and replies[2][0] == 354:
+            # DATA must fail without a valid recipient; end it empty if it did not
+            self.smtp.send(b'.\r\n')
+            self.smtp.getreply()
+        if refused or replies[2][0] != 354:
+            code, message = refused or replies[2]
+            self.smtp.rset()
+            raise DeliveryError(code, message.decode('utf-8', 'replace'))
+        self._send_data(data)
+
+    def _send_plain(self, sender, recipient, data):
+        """Send MAIL, RCPT and DATA one command per round trip.
+
+        Unlike smtplib's sendmail, a connection lost after the body stays
+        distinguishable from earlier failures. Non-ASCII addresses need the
+        server's SMTPUTF8 extension (RFC 6531) and are rejected without it.
+        """
+        mail_from = f"MAIL FROM:<{sender}>"
+        if not (sender + recipient).isascii():
+            if not self.smtp.has_extn('smtputf8'):
+                raise DeliveryError(553, f"server does not support SMTPUTF8 for {recipient}")
+            self.smtp.command_encoding = 'utf-8'
+            mail_from += " SMTPUTF8"
+        for command, accepted in ((mail_from, (250,)),
+                                  (f"RCPT TO:<{recipient}>", (250, 251)),
+                                  ("DATA", (354,))):
+            code, message = self.smtp.docmd(command)
+            if code not in accepted:
+                self.smtp.rset()
+                raise DeliveryError(code, message.decode('utf-8', 'replace'))
+        self._send_data(data)
+
+    def _send_data(self, data):
+        """Write the message body and its final "." and read the server's verdict."""
+        if not data.endswith(b'\r\n'):
+            data += b'\r\n'
+        self.smtp.send(DOT_LINE_RE.sub(b'..', data) + b'.\r\n')
+        try:
+            code, message = self.smtp.getreply()
+        except (smtplib.SMTPServerDisconnected, OSError) as e:
+            raise DeliveryError(None, f"connection lost after the message was sent: {e}",
+                                after_data=True) from e
+        if code != 250:
+            raise DeliveryError(code, message.decode('utf-8', 'replace'))
+
+    def close(self):
+        """Say QUIT, ignoring a connection that is already gone."""
+        try:
+            self.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self.smtp.close()
+
+class SMTPPool:
+    """Up to `size` persistent SMTP connections shared by the sending threads.
+
+    Connections are opened on demand, reused across messages and replaced
+    after messages_per_connection messages or a connection error.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.opened = 0
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(settings.connections)
+        self._lock = threading.Lock()
+
+    def connect(self):
+        """Open, secure and log in a new connection."""
+        settings = self.settings
+        try:
+            if settings.security == 'ssl':
+                smtp = smtplib.SMTP_SSL(settings.host, settings.port, timeout=SMTP_TIMEOUT,
+                                        context=ssl.create_default_context())
+            else:
+                smtp = smtplib.SMTP(settings.host, settings.port, timeout=SMTP_TIMEOUT)
+            smtp.ehlo()
+            if settings.security == 'starttls':
+                smtp.starttls(context=ssl.create_default_context())
+                smtp.ehlo()
+            if settings.username:
+                smtp.login(settings.username, settings.password)
+        except smtplib.SMTPResponseException as e:
+            raise DeliveryError(e.smtp_code, e.smtp_error.decode('utf-8', 'replace')) from e
+        except (smtplib.SMTPException, OSError) as e:
+            raise DeliveryError(None, f"cannot connect to {settings.host}:{settings.port}: {e}") from e
+        with self._lock:
+            self.opened += 1
+        return PooledConnection(smtp)
+
+    def acquire(self):
+        """Return an idle connection, or a new one while under the pool size."""
+        self._slots.acquire()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self.connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, connection, broken=False):
+        """Return a connection to the pool, closing it when broken or used up."""
+        if broken:
+            connection.smtp.close()
+        elif connection.sent >= self.settings.messages_per_connection:
+            connection.close()
+        else:
+            self._idle.put(connection)
+        self._slots.release()
+
+    def close(self):
+        """Close every idle connection."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+class DeliveryCheckpoint:
+    """Append-only JSON-lines log of the addresses an edition was delivered to or rejected by."""
+
+    def __init__(self, path):
+        self.path = path
+        self.done = {}
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash; that address is sent again
+                        continue
+                    self.done[entry['email'].lower()] = entry['status']
+        except OSError:
+            pass
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def record(self, address, status, detail=''):
+        """Log one final outcome ('sent' or 'rejected')."""
+        entry = {'email': address, 'status': status, 'at': int(time.time())}
+        if detail:
+            entry['detail'] = detail
+        with self._lock:
+            self.done[address.lower()] = status
+            if self._file.closed:
+                # Sends still in flight after a second Ctrl-C finish after close()
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(json.dumps(entry) + '\n')
+            self._file.flush()
+
+    def sync(self):
+        """Make the logged outcomes durable; called once per batch."""
+        with self._lock:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """Close the log file."""
+        self._file.close()
+
+def get_checkpoint_path(campaign):
+    """Return the checkpoint file of one edition."""
+    return os.path.join(os.getenv('EMAIL_CHECKPOINT_DIR', DEFAULT_CHECKPOINT_DIR), f"{campaign}.jsonl")
+
+class DeliveryEngine:
+    """Sends a MessageTemplate to a subscriber list through an SMTPPool."""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.pool = SMTPPool(settings)
+        # EMAIL_FROM may carry a display name; the envelope takes the bare address
+        self.envelope_sender = parseaddr(settings.sender)[1]
+        rate = settings.messages_per_second
+        self.bucket = TokenBucket(rate, burst=max(1, min(rate, settings.connections))) if rate > 0 else None
+
+    def send_one(self, subscriber, data):
+        """Deliver one message with retries; return (status, detail).
+
+        status is 'sent', 'rejected' (5xx or invalid address, not retried on
+        resume) or 'deferred' (still failing after the retries, possibly
+        delivered before the connection dropped, or failed unexpectedly). Raises
+        DeliveryError when no connection can be opened, which stops the run.
+        """
+        if not ADDRESS_RE.match(subscriber.email):
+            return 'rejected', 'invalid address'
+        error = None
+        for attempt in range(self.settings.max_retries + 1):
+            if attempt:
+                time.sleep(min(RETRY_BACKOFF_CAP, 2 ** attempt) * random.uniform(0.5, 1.0))
+            if self.bucket:
+                self.bucket.acquire()
+            try:
+                connection = self.pool.acquire()
+            except DeliveryError as e:
+                if e.permanent or attempt == self.settings.max_retries:
+                    raise
+                continue
+            try:
+                connection.send(self.envelope_sender, subscriber.email, data)
+            except DeliveryError as e:
+                error = e
+                self.pool.release(connection, broken=e.code is None)
+                if e.permanent:
+                    return 'rejected', str(e)
+                if e.after_data:
+                    # Sending again in this run could deliver the message twice
+                    return 'deferred', str(e)
+                continue
+            except (smtplib.SMTPException, OSError) as e:
+                error = DeliveryError(None, str(e))
+                self.pool.release(connection, broken=True)
+                continue
+            except Exception as e:
+                # The connection is in an unknown state, and sending the same
+                # message again would fail the same way; leave it for the next run
+                self.pool.release(connection, broken=True)
+                return 'deferred', f"{type(e).__name__}: {e}"
+            self.pool.release(connection)
+            return 'sent', ''
+        return 'deferred', str(error)
+
+    def deliver(self, subscribers, template, checkpoint):
+        """Send template to every subscriber not yet in the checkpoint.
+
+        Returns a dict with the sent, rejected, deferred and skipped counts.
+        """
+        result = {'sent': 0, 'rejected': 0, 'deferred': 0, 'skipped': 0}
+        pending = [s for s in subscribers if s.email.lower() not in checkpoint.done]
+        result['skipped'] = len(subscribers) - len(pending)
+        batch_size = self.settings.batch_size
+
+        def send_and_record(subscriber, data):
+            """Send one message and log its outcome as soon as it is known."""
+            status, detail = self.send_one(subscriber, data)
+            if status == 'deferred':
+                print(f"⚠️  Deferred {subscriber.email}: {detail}")
+            else:
+                checkpoint.record(subscriber.email, status, detail)
+            return status
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.settings.connections) as executor:
+                for start in range(0, len(pending), batch_size):
+                    batch = pending[start:start + batch_size]
+                    futures = [executor.submit(send_and_record, subscriber, template.render(subscriber))
+                               for subscriber in batch]
+                    try:
+                        for future in futures:
+                            result[future.result()] += 1
+                    except BaseException:
+                        # Stop on Ctrl-C without sending the rest of the batch;
+                        # messages already in flight still reach the checkpoint
+                        for future in futures:
+                            future.cancel()
+                        raise
+                    checkpoint.sync()
+        finally:
+            self.pool.close()
+        return result
+
+def load_edition_template(month, settings):
+    """Build the message for an edition from its published files, or return None."""
+    month_name = datetime.strptime(month, "%Y%m").strftime('%B %Y')
+    text_filename = f"newsletters/monthly-newsletter-published-{month}.md"
+    html_filename = f"newsletters/monthly-newsletter-{month}.html"
+    if not os.path.exists(text_filename):
+        print(f"❌ {text_filename} not found; publish the newsletter first")
+        return None
+    with open(text_filename, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    html_body = None
+    if os.path.exists(email_filename(html_filename)):
+        with open(email_filename(html_filename), 'r', encoding='utf-8') as f:
+            html_body = f.read()
+    elif os.path.exists(html_filename):
+        with open(html_filename, 'r', encoding='utf-8') as f:
+            html_body = build_email_html(f.read())
+    else:
+        print(f"⚠️  {html_filename} not found; sending plain text only")
+
+    return MessageTemplate(f"📰 Cloud News - {month_name}", settings.sender, text, html_body,
+                           os.getenv('EMAIL_UNSUBSCRIBE_URL', ''))
+
+def send_edition_email(month, subscribers_path=None, restart=False):
+    """Email one edition to every subscriber; return the result counts, or None if not sent."""
+    settings = get_smtp_settings()
+    if not settings.host or not settings.sender:
+        print("⚠️  Email not sent: set SMTP_HOST and EMAIL_FROM")
+        return None
+    subscribers_path = subscribers_path or os.getenv('EMAIL_SUBSCRIBERS', DEFAULT_SUBSCRIBERS_PATH)
+    if not os.path.exists(subscribers_path):
+        print(f"⚠️  Email not sent: subscriber list {subscribers_path} not found")
+        return None
+    subscribers = load_subscribers(subscribers_path)
+    template = load_edition_template(month, settings)
+    if template is None:
+        return None
+
+    checkpoint_path = get_checkpoint_path(month)
+    if restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    checkpoint = DeliveryCheckpoint(checkpoint_path)
+    engine = DeliveryEngine(settings)
+    start = time.perf_counter()
+    try:
+        result = engine.deliver(subscribers, template, checkpoint)
+    except DeliveryError as e:
+        print(f"❌ Email delivery stopped: {e}")
+        print(f"   Run again to resume (checkpoint: {checkpoint_path})")
+        return None
+    finally:
+        checkpoint.close()
+    elapsed = time.perf_counter() - start
+
+    rate = result['sent'] / elapsed if elapsed else 0
+    print(f"📧 Email: {result['sent']} sent, {result['rejected']} rejected, "
+          f"{result['deferred']} deferred, {result['skipped']} already done "
+          f"({elapsed:.1f}s, {rate:.1f} messages/s over {engine.pool.opened} connections)")
+    if result['deferred']:
+        print(f"   Run again to retry the deferred addresses (checkpoint: {checkpoint_path})")
+    return result
+
+def main():
+    """Command-line entry point."""
+    arg_parser = argparse.ArgumentParser(description="Email a newsletter edition to the subscribers.")
+    arg_parser.add_argument('month', nargs='?', default=datetime.now().strftime("%Y%m"),
+                            help="Edition to send as YYYYMM (default: current month)")
+    arg_parser.add_argument('--subscribers', help="Subscriber CSV file")
+    arg_parser.add_argument('--restart', action='store_true',
+                            help="Ignore the checkpoint and send to everyone again")
+    args = arg_parser.parse_args()
+
+    print("📧 Sending Newsletter Email")
+    print("=" * 40)
+    send_edition_email(args.month, args.subscribers, args.restart)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Build email-ready newsletter HTML.
+Mail clients strip <style> blocks, so every CSS rule that can be inlined is
+written into the style attribute of the elements it matches; only @media
+and :hover rules stay in <style>. Rules are indexed by their rightmost class,
+id or tag, and the computed style of each distinct element path (tag,
+classes and ancestors) is cached, so the many identical article blocks are
+matched once. The result is minified and checked against a byte budget
+(Gmail clips messages over 102 KB).
+
+Usage: python email_inline.py newsletters/monthly-newsletter-YYYYMM.html [...] [--budget-kb 102]
+"""
+
+import os
+import re
+import sys
+import time
+
+from html_minify import CSS_COMMENT_RE, minify_css, minify_html
+
+DEFAULT_BUDGET_KB = 102
+
+EMAIL_SUFFIX = ".email.html"
+
+STYLE_BLOCK_RE = re.compile(r'<style\b[^>]*>(.*?)</style\s*>', re.S | re.I)
+
+TOKEN_RE = re.compile(
+    r'<!--.*?-->'
+    r'|<(script|style|pre|textarea)\b([^>]*)>(.*?)</\1\s*>'
+    r'|<(/?)([a-zA-Z][a-zA-Z0-9-]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>',
+    re.S | re.I
+)
+
+ATTRIBUTE_RE = re.compile(r'\s([a-zA-Z-]+)\s*=\s*("[^"]*"|\'[^\']*\'|[^\s>]+)')
+
+STYLE_ATTRIBUTE_RE = re.compile(r'\sstyle\s*=\s*("[^"]*"|\'[^\']*\'|[^\s>]+)', re.I)
+
+CLASS_ATTRIBUTE_RE = re.compile(r'\sclass\s*=\s*("[^"]*"|\'[^\']*\')', re.I)
+
+CSS_CLASS_RE = re.compile(r'\.([a-zA-Z_-][a-zA-Z0-9_-]*)')
+
+COMPOUND_RE = re.compile(r'^([a-zA-Z][a-zA-Z0-9]*|\*)?((?:[.#][a-zA-Z_-][a-zA-Z0-9_-]*)*)$')
+
+VOID_TAGS = frozenset(
+    "area base br col embed hr img input link meta source track wbr".split()
+)
+
+def get_budget_kb():
+    """Read the email size budget from the environment."""
+    try:
+        return float(os.getenv('NEWSLETTER_EMAIL_BUDGET_KB', DEFAULT_BUDGET_KB))
+    except ValueError:
+        return DEFAULT_BUDGET_KB
+
+def parse_declarations(text):
+    """Return [(property, value)] from a declaration block."""
+    declarations = []
+    for item in text.split(';'):
+        name, colon, value = item.partition(':')
+        if colon and name.strip() and value.strip():
+            declarations.append((name.strip().lower(), ' '.join(value.split())))
+    return declarations
+
+def parse_compound(text):
+    """Return (tag, classes, id) for a compound selector, or None if unsupported."""
+    match = COMPOUND_RE.match(text)
+    if not match or not text:
+        return None
+    tag = match.group(1)
+    classes = []
+    element_id = None
+    for part in re.findall(r'[.#][^.#]+', match.group(2)):
+        if part[0] == '.':
+            classes.append(part[1:])
+        else:
+            element_id = part[1:]
+    return (None if tag in (None, '*') else tag.lower()), frozenset(classes), element_id
+
+def parse_selector(text):
+    """Compile a selector to [(combinator, compound)], rightmost last, or None."""
+    tokens = text.replace('>', ' > ').split()
+    steps = []
+    combinator = ' '
+    for token in tokens:
+        if token == '>':
+            combinator = '>'
+            continue
+        compound = parse_compound(token)
+        if compound is None:
+            return None
+        steps.append((combinator, compound))
+        combinator = ' '
+    return steps or None
+
+def specificity(steps):
+    """Return the (ids, classes, tags) specificity of a compiled selector."""
+    return (
+        sum(1 for _, (_, _, element_id) in steps if element_id),
+        sum(len(classes) for _, (_, classes, _) in steps),
+        sum(1 for _, (tag, _, _) in steps if tag)
+    )
+
+def compound_matches(compound, node):
+    """Return True if an element node (tag, classes, id) matches a compound selector."""
+    tag, classes, element_id = compound
+    return ((tag is None or tag == node[0]) and classes <= node[1]
+            and (element_id is None or element_id == node[2]))
+
+def ancestors_match(steps, step, path, position):
+    """Match steps[:step + 1] against path[:position + 1], honoring combinators."""
+    if step < 0:
+        return True
+    combinator = steps[step + 1][0]
+    compound = steps[step][1]
+    if combinator == '>':
+        return (position >= 0 and compound_matches(compound, path[position])
+                and ancestors_match(steps, step - 1, path, position - 1))
+    for ancestor in range(position, -1, -1):
+        if compound_matches(compound, path[ancestor]) and ancestors_match(steps, step - 1, path, ancestor - 1):
+            return True
+    return False
+
+class Stylesheet:
+    """The inlinable rules of a stylesheet, indexed for fast matching."""
+
+    def __init__(self, css):
+        self.rules = []
+        self.leftover = []
+        self.index = {}
+        self._styles = {}
+        self._parse(CSS_COMMENT_RE.sub('', css))
+
+    def _parse(self, css):
+        """Split the stylesheet into inlinable rules and rules kept in <style>."""
+        position = 0
+        while True:
+            brace = css.find('{', position)
+            if brace < 0:
+                break
+            prelude = css[position:brace].strip()
+            if prelude.startswith('@'):
+                # At-rules such as @media cannot be inlined; keep them whole
+                depth, end = 1, brace + 1
+                while depth and end < len(css):
+                    depth += {'{': 1, '}': -1}.get(css[end], 0)
+                    end += 1
+                self.leftover.append(css[position:end].strip())
+                position = end
+                continue
+            end = css.find('}', brace)
+            if end < 0:
+                break
+            body = css[brace + 1:end]
+            declarations = parse_declarations(body)
+            for selector in prelude.split(','):
+                steps = parse_selector(selector.strip())
+                if steps is None:
+                    self.leftover.append(f"{selector.strip()}{{{body}}}")
+                    continue
+                self._add_rule(steps, declarations)
+            position = end + 1
+
+    def _add_rule(self, steps, declarations):
+        """Index a rule under the most selective part of its rightmost compound."""
+        rule = (specificity(steps), len(self.rules), steps, declarations)
+        self.rules.append(rule)
+        tag, classes, element_id = steps[-1][1]
+        if element_id:
+            key = ('#', element_id)
+        elif classes:
+            key = ('.', min(classes))
+        elif tag:
+            key = ('t', tag)
+        else:
+            key = ('*',)
+        self.index.setdefault(key, []).append(rule)
+
+    def leftover_css(self):
+        """Return the minified rules that must stay in a <style> block."""
+        return minify_css(''.join(self.leftover))
+
+    def style_for(self, path):
+        """Return the inline style for the last element of path, cached per distinct path."""
+        style = self._styles.get(path)
+        if style is None:
+            tag, classes, element_id = path[-1]
+            candidates = list(self.index.get(('t', tag), ()))
+            candidates.extend(self.index.get(('*',), ()))
+            if element_id:
+                candidates.extend(self.index.get(('#', element_id), ()))
+            for name in classes:
+                candidates.extend(self.index.get(('.', name), ()))
+
+            merged = {}
+            for _, _, steps, declarations in sorted(candidates, key=lambda rule: rule[:2]):
+                if compound_matches(steps[-1][1], path[-1]) and ancestors_match(steps, len(steps) - 2, path, len(path) - 2):
+                    for name, value in declarations:
+                        merged.pop(name, None)
+                        merged[name] = value
+            style = ';'.join(f"{name}:{value}" for name, value in merged.items()).replace('"', "'")
+            self._styles[path] = style
+        return style
+
+def element_node(tag, attributes):
+    """Return the (tag, classes, id) node used for selector matching."""
+    values = {name.lower(): value.strip('"\'') for name, value in ATTRIBUTE_RE.findall(attributes)}
+    return tag, frozenset(values.get('class', '').split()), values.get('id')
+
+def inline_css(html):
+    """Return html with its stylesheet rules written into style attributes."""
+    stylesheet = Stylesheet(''.join(STYLE_BLOCK_RE.findall(html)))
+    leftover = stylesheet.leftover_css()
+    # Classes are only needed by the rules left in <style>
+    used_classes = frozenset(CSS_CLASS_RE.findall(leftover))
+    parts = []
+    path = ()
+    position = 0
+    style_written = False
+
+    for match in TOKEN_RE.finditer(html):
+        parts.append(html[position:match.start()])
+        position = match.end()
+        raw_tag = match.group(1)
+        if raw_tag:
+            if raw_tag.lower() == 'style':
+                # One <style> block keeps the rules that could not be inlined
+                if leftover and not style_written:
+                    parts.append(f"<style>{leftover}</style>")
+                    style_written = True
+                continue
+            # <pre>, <textarea> and <script> contents are copied unchanged
+            attributes = match.group(2)
+            style = stylesheet.style_for(path + (element_node(raw_tag.lower(), attributes),))
+            parts.append(start_tag(raw_tag, attributes, style))
+            parts.append(match.group(0)[len(raw_tag) + len(attributes) + 2:])
+            continue
+        tag = match.group(5)
+        if not tag:
+            parts.append(match.group(0))
+            continue
+        tag = tag.lower()
+        if match.group(4):
+            # Close the innermost open element with this tag
+            for depth in range(len(path) - 1, -1, -1):
+                if path[depth][0] == tag:
+                    path = path[:depth]
+                    break
+            parts.append(match.group(0))
+            continue
+
+        attributes = match.group(6)
+        node = element_node(tag, attributes)
+        style = stylesheet.style_for(path + (node,))
+        parts.append(start_tag(match.group(5), prune_classes(attributes, used_classes), style))
+        if tag not in VOID_TAGS and not attributes.rstrip().endswith('/'):
+            path = path + (node,)
+
+    parts.append(html[position:])
+    return ''.join(parts)
+
+def prune_classes(attributes, used_classes):
+    """Drop class names that no remaining CSS rule refers to."""
+    match = CLASS_ATTRIBUTE_RE.search(attributes)
+    if not match:
+        return attributes
+    kept = [name for name in match.group(1)[1:-1].split() if name in used_classes]
+    replacement = f' class="{" ".join(kept)}"' if kept else ''
+    return attributes[:match.start()] + replacement + attributes[match.end():]
+
+def start_tag(tag, attributes, style):
+    """Return a start tag with style merged ahead of any existing inline style."""
+    if not style:
+        return f"<{tag}{attributes}>"
+    existing = STYLE_ATTRIBUTE_RE.search(attributes)
+    if existing:
+        style = f"{style};{existing.group(1).strip(chr(34) + chr(39))}"
+        attributes = attributes[:existing.start()] + attributes[existing.end():]
+    attributes = attributes.rstrip()
+    closing = ''
+    if attributes.endswith('/'):
+        attributes, closing = attributes[:-1].rstrip(), '/'
+    return f'<{tag}{attributes} style="{style}"{closing}>'
+
+def build_email_html(html):
+    """Return minified, CSS-inlined HTML for email clients."""
+    return minify_html(inline_css(html))
+
+def budget_report(size, budget_kb):
+    """Return a one-line summary of size against the budget."""
+    budget = budget_kb * 1024
+    if size > budget:
+        return f"⚠️  {size / 1024:.1f} KB, {(size - budget) / 1024:.1f} KB over the {budget_kb:g} KB budget"
+    return f"✅ {size / 1024:.1f} KB of {budget_kb:g} KB budget ({size / budget:.0%})"
+
+def email_filename(filename):
+    """Return the email version's file name for an edition file."""
+    base, _ = os.path.splitext(filename)
+    return base + EMAIL_SUFFIX
+
+def write_email_file(filename):
+    """Write the email version of an edition; return (email file name, byte size)."""
+    with open(filename, 'r', encoding='utf-8') as f:
+        email_html = build_email_html(f.read())
+    output = email_filename(filename)
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(email_html)
+    return output, len(email_html.encode('utf-8'))
+
+def main():
+    """Build the email version of the given editions."""
+    args = sys.argv[1:]
+    budget_kb = get_budget_kb()
+    if '--budget-kb' in args:
+        position = args.index('--budget-kb')
+        budget_kb = float(args[position + 1])
+        args = args[:position] + args[position + 2:]
+    if not args:
+        print("Usage: python email_inline.py newsletters/monthly-newsletter-YYYYMM.html [...] [--budget-kb 102]")
+        sys.exit(1)
+
+    print("📧 Building Email Editions")
+    print("=" * 40)
+    start = time.perf_counter()
+    over = 0
+    for filename in args:
+        output, size = write_email_file(filename)
+        over += size > budget_kb * 1024
+        print(f"  - {output}: {budget_report(size, budget_kb)}")
+    elapsed = time.perf_counter() - start
+    print(f"Built {len(args)} email editions in {elapsed:.2f}s")
+    if over:
+        print(f"⚠️  {over} editions exceed the {budget_kb:g} KB budget and will be clipped by Gmail")
+
+if __name__ == "__main__":
+    main()
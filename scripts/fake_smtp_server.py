@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Fake SMTP server for trying email_delivery.py without a mail provider.
+Accepts plain (no TLS, no AUTH) connections, supports PIPELINING, and
+records every accepted message instead of delivering it. Recipient
+addresses pick the server's behaviour, so each delivery outcome can be
+exercised from an ordinary subscriber list:
+
+  bounce  anywhere in the address: RCPT TO is refused with 550
+  busy    anywhere in the address: the first RCPT TO gets 451, later ones 250
+  drop    anywhere in the address: the first message is stored, then the
+          connection is closed before the final reply
+
+Usage: python fake_smtp_server.py [--port 1025] [--latency 0.005] [--no-pipelining] [--save DIR]
+
+Then run email_delivery.py with SMTP_HOST=127.0.0.1 SMTP_PORT=1025
+SMTP_SECURITY=none. --save writes each accepted message to DIR/<address>.eml;
+an address that receives a second copy is reported as a duplicate.
+"""
+
+import os
+import socketserver
+import sys
+import threading
+import time
+
+DEFAULT_PORT = 1025
+
+DEFAULT_LATENCY = 0.005
+
+class FakeSMTPState:
+    """Settings and per-address history shared by all connections."""
+
+    def __init__(self, latency=DEFAULT_LATENCY, pipelining=True, save_dir=None):
+        self.latency = latency
+        self.pipelining = pipelining
+        self.save_dir = save_dir
+        self.received = {}
+        self.connections = 0
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def first_time(self, behaviour, address):
+        """True the first time a behaviour triggers for an address."""
+        with self._lock:
+            if (behaviour, address) in self._seen:
+                return False
+            self._seen.add((behaviour, address))
+            return True
+
+    def store(self, address, body):
+        """Record one accepted message."""
+        with self._lock:
+            count = self.received.get(address, 0) + 1
+            self.received[address] = count
+        note = " (duplicate)" if count > 1 else ""
+        print(f"📨 {address}: {len(body)} bytes{note}")
+        if self.save_dir:
+            with open(os.path.join(self.save_dir, f"{address}.eml"), 'wb') as f:
+                f.write(body)
+
+class FakeSMTPHandler(socketserver.BaseRequestHandler):
+    """One SMTP session; replies to pipelined commands are sent together."""
+
+    def handle(self):
+        state = self.server.state
+        with state._lock:
+            state.connections += 1
+        self.request.sendall(b'220 fake ESMTP ready\r\n')
+        self.recipient = None
+        buffer = b''
+        lines = None
+        while True:
+            chunk = self.request.recv(65536)
+            if not chunk:
+                return
+            buffer += chunk
+            replies = []
+            while b'\r\n' in buffer:
+                line, buffer = buffer.split(b'\r\n', 1)
+                if lines is not None:
+                    if line != b'.':
+                        # Undo the dot-stuffing of RFC 5321 section 4.5.2
+                        lines.append(line[1:] if line.startswith(b'..') else line)
+                        continue
+                    state.store(self.recipient, b'\r\n'.join(lines) + b'\r\n')
+                    lines = None
+                    if 'drop' in self.recipient and state.first_time('drop', self.recipient):
+                        return
+                    replies.append(b'250 queued')
+                    continue
+                reply = self.command(line.decode('utf-8', 'replace'))
+                if reply.startswith(b'354'):
+                    lines = []
+                replies.append(reply)
+            if replies:
+                time.sleep(state.latency)
+                self.request.sendall(b''.join(reply + b'\r\n' for reply in replies))
+                if replies[-1].startswith(b'221'):
+                    return
+
+    def command(self, line):
+        """Return the reply to one command outside DATA."""
+        state = self.server.state
+        verb = line.split(' ', 1)[0].upper()
+        if verb == 'EHLO':
+            extensions = ['fake', '8BITMIME', 'SMTPUTF8', 'SIZE 10000000']
+            if state.pipelining:
+                extensions.insert(1, 'PIPELINING')
+            lines = [f"250-{ext}" for ext in extensions[:-1]] + [f"250 {extensions[-1]}"]
+            return '\r\n'.join(lines).encode()
+        if verb in ('HELO', 'NOOP'):
+            return b'250 ok'
+        if verb in ('MAIL', 'RSET'):
+            self.recipient = None
+            return b'250 ok'
+        if verb == 'RCPT':
+            address = line[line.find('<') + 1:line.rfind('>')]
+            if 'bounce' in address:
+                return b'550 no such user'
+            if 'busy' in address and state.first_time('busy', address):
+                return b'451 try again later'
+            self.recipient = address
+            return b'250 ok'
+        if verb == 'DATA':
+            return b'354 end data with <CR><LF>.<CR><LF>' if self.recipient else b'554 no valid recipients'
+        if verb == 'QUIT':
+            return b'221 bye'
+        return b'502 command not implemented'
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    """Threaded fake SMTP server; state holds the shared settings and history."""
+    allow_reuse_address = True
+    daemon_threads = True
+
+def create_server(port=DEFAULT_PORT, latency=DEFAULT_LATENCY, pipelining=True, save_dir=None):
+    """Return a fake SMTP server bound to 127.0.0.1:port, not yet serving."""
+    if save_dir:
+        os.makedirs(save_dir, exist_ok=True)
+    server = FakeSMTPServer(('127.0.0.1', port), FakeSMTPHandler)
+    server.state = FakeSMTPState(latency, pipelining, save_dir)
+    return server
+
+def option(args, name, default=None):
+    """Return the value following name in args, or default."""
+    if name in args and args.index(name) + 1 < len(args):
+        return args[args.index(name) + 1]
+    return default
+
+def main():
+    """Run the fake SMTP server until interrupted."""
+    args = sys.argv[1:]
+    port = int(option(args, '--port', DEFAULT_PORT))
+    server = create_server(port, float(option(args, '--latency', DEFAULT_LATENCY)),
+                           '--no-pipelining' not in args, option(args, '--save'))
+
+    print("📮 Fake SMTP Server")
+    print("=" * 40)
+    print(f"Listening on 127.0.0.1:{port}"
+          f"{'' if server.state.pipelining else ' (no PIPELINING)'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        state = server.state
+        print(f"\n👋 Fake SMTP server stopped: {sum(state.received.values())} messages "
+              f"for {len(state.received)} addresses over {state.connections} connections")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,45 @@
 """
 Generate monthly newsletter from collected content.
 This script creates the final monthly newsletter from approved content.
+
+Usage: python generate_monthly_newsletter.py [--stream | --watch] [--images] [--email]
+
+With --stream, the HTML and Markdown are written to disk chunk by chunk
+instead of being built as whole strings first, for very large editions.
+
+With --watch, the script keeps running and rebuilds the draft whenever this
+month's content file or the newsletter templates change.
+
+With --images, article images are downloaded, resized and served from
+newsletters/images/ instead of being hot-linked (see image_pipeline.py).
+
+With --email, a CSS-inlined, minified copy for mail clients is also written
+and its size checked against the email budget (see email_inline.py).
 """
 
 import os
+import sys
 import json
 import glob
+import threading
+import time
 from datetime import datetime
-from jinja2 import Template
 
-def load_monthly_content():
-    """Load content for the current month."""
-    now = datetime.now()
+import generate_newsletter_agenda as agenda
+from edition_model import edition_stats, prepare_content, sort_content
+from email_inline import budget_report, get_budget_kb, write_email_file
+from render_cache import enable_memory_fragment_cache, render_article_fragments, report_fragment_cache
+from template_cache import get_template
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+def load_monthly_content(month=None):
+    """Load content for the given month (default: the current month)."""
+    now = month or datetime.now()
     timestamp = now.strftime("%Y%m")
     
     # Look for monthly content file
@@ -26,300 +54,67 @@ def load_monthly_content():
     with open(content_file, 'r', encoding='utf-8') as f:
         content = json.load(f)
     
-    return content
+    # Compute sort keys and section IDs once for every renderer
+    return prepare_content(content)
 
 def load_newsletter_template():
     """Load the newsletter template."""
-    template_path = "templates/monthly_newsletter_template.html"
-    
-    if os.path.exists(template_path):
-        with open(template_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    else:
-        # Return a default monthly template
-        return """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Cloud News - {{ newsletter_date }}</title>
-    <style>
-        body { 
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; 
-            line-height: 1.6; 
-            color: #333; 
-            max-width: 800px; 
-            margin: 0 auto; 
-            padding: 20px; 
-            background-color: #f8f9fa;
-        }
-        .container {
-            background: white;
-            border-radius: 12px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }
-        .header { 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-            color: white; 
-            padding: 40px; 
-            text-align: center; 
-        }
-        .header h1 {
-            font-size: 2.5rem;
-            margin-bottom: 10px;
-            font-weight: 700;
-        }
-        .monthly-info {
-            background: rgba(255,255,255,0.1);
-            padding: 15px;
-            border-radius: 8px;
-            margin-top: 20px;
-        }
-        .content-area {
-            padding: 40px;
-        }
-        .article { 
-            margin-bottom: 40px; 
-            padding: 25px; 
-            border-left: 4px solid #667eea; 
-            background: #f8f9fa; 
-            border-radius: 8px; 
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-        }
-        .article h2 { 
-            color: #667eea; 
-            margin-bottom: 15px; 
-            font-size: 1.5rem;
-        }
-        .article .meta { 
-            color: #666; 
-            font-size: 0.9em; 
-            margin-bottom: 15px; 
-            display: flex;
-            align-items: center;
-            gap: 15px;
-            flex-wrap: wrap;
-        }
-        .article .summary { 
-            font-style: italic; 
-            color: #555; 
-            margin-bottom: 20px; 
-            padding: 15px;
-            background: white;
-            border-radius: 6px;
-            border-left: 3px solid #667eea;
-        }
-        .category-badge { 
-            display: inline-block; 
-            background: #667eea; 
-            color: white; 
-            padding: 6px 12px; 
-            border-radius: 20px; 
-            font-size: 0.8em; 
-            font-weight: 600;
-        }
-        .priority-badge {
-            display: inline-block;
-            padding: 4px 8px;
-            border-radius: 12px;
-            font-size: 0.7em;
-            font-weight: 600;
-        }
-        .priority-urgent { background: #e74c3c; color: white; }
-        .priority-high { background: #f39c12; color: white; }
-        .priority-normal { background: #95a5a6; color: white; }
-        .footer { 
-            text-align: center; 
-            margin-top: 40px; 
-            padding: 30px; 
-            background: #f8f9fa; 
-            border-top: 1px solid #e9ecef;
-        }
-        .footer a {
-            color: #667eea;
-            text-decoration: none;
-            font-weight: 600;
-        }
-        .footer a:hover {
-            text-decoration: underline;
-        }
-        .image {
-            margin-top: 20px;
-            text-align: center;
-        }
-        .image img {
-            max-width: 100%;
-            height: auto;
-            border-radius: 8px;
-            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        }
-        .monthly-stats {
-            background: #e8f4fd;
-            padding: 20px;
-            border-radius: 8px;
-            margin-bottom: 30px;
-            text-align: center;
-        }
-        .stats-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-            gap: 20px;
-            margin-top: 15px;
-        }
-        .stat-item {
-            background: white;
-            padding: 15px;
-            border-radius: 6px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-        }
-        .stat-number {
-            font-size: 2rem;
-            font-weight: bold;
-            color: #667eea;
-        }
-        .stat-label {
-            font-size: 0.9rem;
-            color: #666;
-            margin-top: 5px;
-        }
-        @media (max-width: 768px) {
-            body { padding: 10px; }
-            .header { padding: 30px 20px; }
-            .header h1 { font-size: 2rem; }
-            .content-area { padding: 30px 20px; }
-            .article { padding: 20px; }
-            .stats-grid { grid-template-columns: 1fr; }
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>📰 Cloud News</h1>
-            <p>{{ newsletter_date }}</p>
-            <div class="monthly-info">
-                <strong>Monthly Newsletter</strong><br>
-                {{ total_articles }} articles • {{ categories_count }} categories
-            </div>
-        </div>
-
-        <div class="content-area">
-            {% if monthly_stats %}
-            <div class="monthly-stats">
-                <h3>📊 This Month's Highlights</h3>
-                <div class="stats-grid">
-                    <div class="stat-item">
-                        <div class="stat-number">{{ total_articles }}</div>
-                        <div class="stat-label">Articles</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-number">{{ categories_count }}</div>
-                        <div class="stat-label">Categories</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-number">{{ authors_count }}</div>
-                        <div class="stat-label">Contributors</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-number">{{ urgent_count }}</div>
-                        <div class="stat-label">Urgent Items</div>
-                    </div>
-                </div>
-            </div>
-            {% endif %}
-
-            {% for article in articles %}
-            <div class="article">
-                <h2>{{ article.title }}</h2>
-                <div class="meta">
-                    <span class="category-badge">{{ article.category }}</span>
-                    <span class="priority-badge priority-{{ article.priority.lower() }}">{{ article.priority }}</span>
-                    <span>By {{ article.author }}</span>
-                </div>
-                <div class="summary">{{ article.summary }}</div>
-                <div class="content">{{ article.content | safe }}</div>
-                {% if article.image %}
-                <div class="image">
-                    <img src="{{ article.image }}" alt="Article image">
-                </div>
-                {% endif %}
-            </div>
-            {% endfor %}
-        </div>
-
-        <div class="footer">
-            <p>Want to contribute? <a href="https://github.com/hornmichi/Cloud-News/issues">Submit content here</a></p>
-            <p>📧 <a href="mailto:newsletter@hornmichi.com">newsletter@hornmichi.com</a></p>
-            <p style="margin-top: 20px; font-size: 0.9em; color: #666;">© 2024 Cloud News. All rights reserved.</p>
-        </div>
-    </div>
-</body>
-</html>"""
-
-def generate_monthly_newsletter_html(content, template_content):
-    """Generate the monthly newsletter HTML using the template."""
-    template = Template(template_content)
-    
+    return get_template("monthly_newsletter_template.html")
+
+def newsletter_context(content, month=None, fragments=True):
+    """Build the template context for the monthly newsletter.
+
+    With fragments=False every article is rendered inline, without the
+    fragment cache (used when streaming).
+    """
     # Prepare data for template
-    newsletter_date = datetime.now().strftime("%B %Y")
+    newsletter_date = (month or datetime.now()).strftime("%B %Y")
     
     # Sort content by priority and category
-    sorted_content = sorted(content, key=lambda x: (
-        {'Urgent': 0, 'High': 1, 'Normal': 2}.get(x.get('priority', 'Normal'), 2),
-        x.get('category', '')
-    ))
+    sorted_content = sort_content(content)
     
     # Calculate statistics
-    categories = set(article.get('category', '') for article in content)
-    authors = set(article.get('author', '') for article in content)
-    urgent_count = sum(1 for article in content if article.get('priority') == 'Urgent')
+    monthly_stats = edition_stats(content)
     
-    monthly_stats = {
-        'total_articles': len(content),
-        'categories_count': len(categories),
-        'authors_count': len(authors),
-        'urgent_count': urgent_count
-    }
-    
-    html_content = template.render(
+    return dict(
         articles=sorted_content,
+        # Article blocks are looked up lazily so unchanged ones come from cache
+        article_fragments=(render_article_fragments(sorted_content, "monthly_article.html")
+                           if fragments else None),
         newsletter_date=newsletter_date,
-        total_articles=len(content),
         monthly_stats=monthly_stats,
         **monthly_stats
     )
-    
-    return html_content
 
-def generate_monthly_newsletter_markdown(content):
-    """Generate a markdown version of the monthly newsletter."""
-    newsletter_date = datetime.now().strftime("%B %Y")
+def generate_monthly_newsletter_html(content, template, month=None):
+    """Generate the monthly newsletter HTML using the template."""
+    return template.render(**newsletter_context(content, month))
+
+def iter_monthly_newsletter_markdown(content, month=None):
+    """Yield the markdown version of the monthly newsletter chunk by chunk."""
+    newsletter_date = (month or datetime.now()).strftime("%B %Y")
+    stats = edition_stats(content)
     
-    markdown_content = f"""# 📰 Cloud News - {newsletter_date}
+    yield f"""# 📰 Cloud News - {newsletter_date}
 
 Welcome to this month's Cloud News! Here's what's happening in our community.
 
 ## 📊 Monthly Highlights
 
-- **Total Articles**: {len(content)}
-- **Categories**: {len(set(article.get('category', '') for article in content))}
-- **Contributors**: {len(set(article.get('author', '') for article in content))}
-- **Urgent Items**: {sum(1 for article in content if article.get('priority') == 'Urgent')}
+- **Total Articles**: {stats['total_articles']}
+- **Categories**: {stats['categories_count']}
+- **Contributors**: {stats['authors_count']}
+- **Urgent Items**: {stats['urgent_count']}
 
 ---
 
 """
     
     # Sort content by priority and category
-    sorted_content = sorted(content, key=lambda x: (
-        {'Urgent': 0, 'High': 1, 'Normal': 2}.get(x.get('priority', 'Normal'), 2),
-        x.get('category', '')
-    ))
+    sorted_content = sort_content(content)
     
     for article in sorted_content:
-        markdown_content += f"""## {article['title']}
+        yield f"""## {article['title']}
 
 **Category:** {article['category']} | **Author:** {article['author']} | **Priority:** {article['priority']}
 
@@ -330,48 +125,233 @@ Welcome to this month's Cloud News! Here's what's happening in our community.
 """
         
         if article.get('image'):
-            markdown_content += f"![{article['title']}]({article['image']})\n\n"
+            yield f"![{article['title']}]({article['image']})\n\n"
         
-        markdown_content += "---\n\n"
+        yield "---\n\n"
     
-    markdown_content += """---
+    yield """---
 
 **Want to contribute?** [Submit content here](https://github.com/hornmichi/Cloud-News/issues)
 
 © 2024 Cloud News. All rights reserved.
 """
-    
-    return markdown_content
 
-def save_newsletter_files(html_content, markdown_content):
-    """Save the newsletter files."""
-    timestamp = datetime.now().strftime("%Y%m")
-    
-    # Save HTML version
+def generate_monthly_newsletter_markdown(content, month=None):
+    """Generate a markdown version of the monthly newsletter."""
+    return ''.join(iter_monthly_newsletter_markdown(content, month))
+
+def save_html_file(html_content, month=None):
+    """Save the HTML newsletter and return its file name."""
+    timestamp = (month or datetime.now()).strftime("%Y%m")
     html_filename = f"newsletters/monthly-newsletter-{timestamp}.html"
     os.makedirs(os.path.dirname(html_filename), exist_ok=True)
     with open(html_filename, 'w', encoding='utf-8') as f:
         f.write(html_content)
-    
-    # Save Markdown version
+    return html_filename
+
+def save_markdown_files(markdown_content, month=None, draft=True):
+    """Save the Markdown newsletter and review draft, and return the Markdown file name."""
+    timestamp = (month or datetime.now()).strftime("%Y%m")
     markdown_filename = f"newsletters/monthly-newsletter-{timestamp}.md"
+    os.makedirs(os.path.dirname(markdown_filename), exist_ok=True)
     with open(markdown_filename, 'w', encoding='utf-8') as f:
         f.write(markdown_content)
     
     # Save draft for review
-    with open("monthly-newsletter-draft.md", 'w', encoding='utf-8') as f:
-        f.write(markdown_content)
+    if draft:
+        with open("monthly-newsletter-draft.md", 'w', encoding='utf-8') as f:
+            f.write(markdown_content)
+    return markdown_filename
+
+def save_newsletter_files(html_content, markdown_content):
+    """Save the newsletter files."""
+    html_filename = save_html_file(html_content)
+    markdown_filename = save_markdown_files(markdown_content)
     
     print(f"Newsletter files saved:")
     print(f"  - HTML: {html_filename}")
     print(f"  - Markdown: {markdown_filename}")
     print(f"  - Draft: monthly-newsletter-draft.md")
+    return html_filename
+
+def stream_newsletter_files(content, template):
+    """Render and save the newsletter files chunk by chunk.
+
+    Produces the same files as save_newsletter_files without holding the
+    rendered HTML or Markdown in memory.
+    """
+    timestamp = datetime.now().strftime("%Y%m")
+    
+    # Stream HTML version straight from the template
+    html_filename = f"newsletters/monthly-newsletter-{timestamp}.html"
+    os.makedirs(os.path.dirname(html_filename), exist_ok=True)
+    with open(html_filename, 'w', encoding='utf-8') as f:
+        template.stream(**newsletter_context(content, fragments=False)).dump(f)
+    
+    # Stream Markdown version and draft together
+    markdown_filename = f"newsletters/monthly-newsletter-{timestamp}.md"
+    with open(markdown_filename, 'w', encoding='utf-8') as markdown_file, \
+            open("monthly-newsletter-draft.md", 'w', encoding='utf-8') as draft_file:
+        for chunk in iter_monthly_newsletter_markdown(content):
+            markdown_file.write(chunk)
+            draft_file.write(chunk)
+    
+    print(f"Newsletter files saved (streamed):")
+    print(f"  - HTML: {html_filename}")
+    print(f"  - Markdown: {markdown_filename}")
+    print(f"  - Draft: monthly-newsletter-draft.md")
+    return html_filename
+
+# Seconds between checks for changed files, and how long changes must settle;
+# together they keep save-to-output latency under 100 ms
+WATCH_INTERVAL = 0.02
+
+WATCH_DEBOUNCE = 0.04
+
+# With watchdog's inotify/FSEvents backend, polling only backs up missed events
+WATCH_EVENT_TIMEOUT = 1.0
+
+WATCHED_TEMPLATES = ("monthly_newsletter_template.html", "monthly_article.html")
+
+AGENDA_URL = "https://github.com/hornmichi/Cloud-News/releases/latest"
+
+def watched_files():
+    """Return {path: kind} for the files that feed this month's draft."""
+    timestamp = datetime.now().strftime("%Y%m")
+    files = {f"content/monthly_content_{timestamp}.json": 'content'}
+    environment_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'templates')
+    for name in WATCHED_TEMPLATES:
+        files[os.path.normpath(os.path.join(environment_dir, name))] = 'template'
+    return files
+
+def snapshot(files):
+    """Return {path: (mtime_ns, size)} for the watched files that exist."""
+    state = {}
+    for path in files:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        state[path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+def rebuild(changed_kinds, content, saved_at=None):
+    """Rebuild the outputs affected by the changed kinds of input.
+
+    saved_at is the modification time (time.time()) of the newest changed
+    file, for logging the latency from save to written output. Returns the
+    content used, so a template-only change can reuse it.
+    """
+    started = time.perf_counter()
+    outputs = []
+    
+    if 'content' in changed_kinds or content is None:
+        timestamp = datetime.now().strftime("%Y%m")
+        with open(f"content/monthly_content_{timestamp}.json", 'r', encoding='utf-8') as f:
+            content = prepare_content(json.load(f))
+    
+    # The HTML depends on the content and the templates
+    save_html_file(generate_monthly_newsletter_html(content, load_newsletter_template()))
+    outputs.append("HTML")
+    
+    # Markdown and agendas depend on the content only
+    if 'content' in changed_kinds:
+        save_markdown_files(generate_monthly_newsletter_markdown(content))
+        agenda.save_agenda_files(
+            agenda.generate_teams_agenda(content, AGENDA_URL),
+            agenda.generate_html_agenda(content, AGENDA_URL),
+            verbose=False
+        )
+        outputs.extend(["Markdown", "agendas"])
+    
+    elapsed = (time.perf_counter() - started) * 1000
+    latency = f", {(time.time() - saved_at) * 1000:.0f} ms after save" if saved_at else ""
+    print(f"🔄 {datetime.now().strftime('%H:%M:%S')} rebuilt {', '.join(outputs)} "
+          f"({len(content)} articles, {' + '.join(sorted(changed_kinds))} changed) "
+          f"in {elapsed:.1f} ms{latency}")
+    return content
+
+def start_change_events(files):
+    """Return an Event set on file system changes next to the watched files, or None without watchdog."""
+    if Observer is None:
+        return None
+    changed = threading.Event()
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            changed.set()
+
+    observer = Observer()
+    observer.daemon = True
+    for directory in {os.path.dirname(os.path.abspath(path)) for path in files}:
+        if os.path.isdir(directory):
+            observer.schedule(Handler(), directory, recursive=False)
+    observer.start()
+    return changed
+
+def watch():
+    """Rebuild the draft whenever its content file or templates change."""
+    files = watched_files()
+    # Rebuilds reuse the article blocks an edit did not touch
+    enable_memory_fragment_cache()
+    print("👀 Watching for changes (Ctrl+C to stop):")
+    for path in files:
+        print(f"  - {path}")
+    
+    content = None
+    last = {}
+    events = start_change_events(files)
+    try:
+        while True:
+            files = watched_files()
+            current = snapshot(files)
+            if current == last:
+                if events is None:
+                    time.sleep(WATCH_INTERVAL)
+                else:
+                    events.wait(WATCH_EVENT_TIMEOUT)
+                    events.clear()
+                continue
+            
+            # Wait for a burst of saves to settle before rebuilding once
+            while True:
+                time.sleep(WATCH_DEBOUNCE)
+                settled = snapshot(files)
+                if settled == current:
+                    break
+                current = settled
+            
+            changed_kinds = {
+                kind for path, kind in files.items() if last.get(path) != current.get(path)
+            }
+            # The newest changed file's mtime, for the save-to-output latency
+            saved_at = max(
+                (state[0] for path, state in current.items() if last.get(path) != state),
+                default=None
+            ) if last else None
+            last = current
+            if not any(kind == 'content' and path in current for path, kind in files.items()):
+                print("⚠️  No content file for this month yet, waiting...")
+                continue
+            if content is None:
+                changed_kinds = {'content', 'template'}
+            try:
+                content = rebuild(changed_kinds, content, saved_at / 1e9 if saved_at else None)
+            except (OSError, ValueError) as e:
+                # A half-written file; the next save triggers another rebuild
+                print(f"⚠️  Rebuild failed: {e}")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
 
 def main():
     """Main function to generate the monthly newsletter."""
     print("📰 Generating Monthly Newsletter")
     print("=" * 40)
     
+    if '--watch' in sys.argv[1:]:
+        watch()
+        return
+    
     # Load monthly content
     content = load_monthly_content()
     
@@ -382,15 +362,32 @@ def main():
     print(f"Found {len(content)} articles for {datetime.now().strftime('%B %Y')}")
     
     # Load template
-    template_content = load_newsletter_template()
+    template = load_newsletter_template()
+    
+    if '--stream' in sys.argv[1:]:
+        # Write output chunk by chunk for very large editions
+        html_filename = stream_newsletter_files(content, template)
+    else:
+        # Generate newsletter
+        html_content = generate_monthly_newsletter_html(content, template)
+        markdown_content = generate_monthly_newsletter_markdown(content)
+        
+        # Save files
+        html_filename = save_newsletter_files(html_content, markdown_content)
     
-    # Generate newsletter
-    html_content = generate_monthly_newsletter_html(content, template_content)
-    markdown_content = generate_monthly_newsletter_markdown(content)
+    if '--email' in sys.argv[1:]:
+        # Built before --images: email needs absolute image URLs
+        email_filename, size = write_email_file(html_filename)
+        print(f"  - Email: {email_filename} {budget_report(size, get_budget_kb())}")
     
-    # Save files
-    save_newsletter_files(html_content, markdown_content)
+    if '--images' in sys.argv[1:]:
+        # Replace hot-linked images with resized local copies; imported here
+        # so plain runs don't need Pillow, requests or the GitHub client
+        from image_pipeline import get_image_cache, process_html_file
+        process_html_file(html_filename)
+        get_image_cache().report()
     
+    report_fragment_cache()
     print("✅ Monthly newsletter generation complete!")
 
 if __name__ == "__main__":
@@ -6,13 +6,17 @@ This script creates a table of contents with links to each section.
 
 import os
 import json
-import re
 from datetime import datetime
 from urllib.parse import quote
 
-def load_monthly_content():
-    """Load content for the current month."""
-    now = datetime.now()
+from edition_model import (
+    PRIORITY_EMOJI, edition_stats, group_by_category, prepare_content,
+    sort_content
+)
+
+def load_monthly_content(month=None):
+    """Load content for the given month (default: the current month)."""
+    now = month or datetime.now()
     timestamp = now.strftime("%Y%m")
     
     # Look for monthly content file
@@ -25,76 +29,57 @@ def load_monthly_content():
     with open(content_file, 'r', encoding='utf-8') as f:
         content = json.load(f)
     
-    return content
+    # Compute sort keys and section IDs once for every renderer
+    return prepare_content(content)
 
-def create_section_id(title):
-    """Create a URL-friendly section ID from title."""
-    # Remove special characters and convert to lowercase
-    id_text = re.sub(r'[^a-zA-Z0-9\s-]', '', title)
-    id_text = re.sub(r'\s+', '-', id_text.lower())
-    return id_text
+def generate_teams_agenda(content, newsletter_url, month=None, presorted=False):
+    """Generate a Teams-friendly agenda with clickable links.
 
-def generate_teams_agenda(content, newsletter_url):
-    """Generate a Teams-friendly agenda with clickable links."""
-    now = datetime.now()
+    presorted=True skips sorting content that sort_content already ordered.
+    """
+    now = month or datetime.now()
     month_year = now.strftime('%B %Y')
+    stats = edition_stats(content)
     
     # Start with header
-    agenda = f"""📰 **Cloud News - {month_year}**
+    agenda_parts = [f"""📰 **Cloud News - {month_year}**
 
 Welcome to this month's newsletter! Here's what's inside:
 
 📊 **Monthly Highlights**
-• {len(content)} articles from our community
-• {len(set(article.get('category', '') for article in content))} different categories
-• {len(set(article.get('author', '') for article in content))} contributors
+• {stats['total_articles']} articles from our community
+• {stats['categories_count']} different categories
+• {stats['authors_count']} contributors
 
 ---
 
 **📋 Table of Contents**
 
-"""
-    
-    # Sort content by priority and category
-    sorted_content = sorted(content, key=lambda x: (
-        {'Urgent': 0, 'High': 1, 'Normal': 2}.get(x.get('priority', 'Normal'), 2),
-        x.get('category', '')
-    ))
+"""]
     
-    # Group by category
-    categories = {}
-    for article in sorted_content:
-        category = article.get('category', 'Other')
-        if category not in categories:
-            categories[category] = []
-        categories[category].append(article)
+    # Sort content by priority, then group by category
+    categories = group_by_category(content if presorted else sort_content(content))
     
     # Generate agenda items
     for category, articles in categories.items():
-        agenda += f"\n**{category}**\n"
+        agenda_parts.append(f"\n**{category}**\n")
         
         for i, article in enumerate(articles):
             title = article.get('title', 'Untitled')
             author = article.get('author', 'Unknown')
             priority = article.get('priority', 'Normal')
-            
-            # Create section ID
-            section_id = create_section_id(title)
+            section_id = article['section_id']
             
             # Priority emoji
-            priority_emoji = {
-                'Urgent': '🔴',
-                'High': '🟡', 
-                'Normal': '⚪'
-            }.get(priority, '⚪')
+            priority_emoji = PRIORITY_EMOJI.get(priority, '⚪')
             
             # Create link
             link = f"{newsletter_url}#{section_id}"
             
-            agenda += f"{priority_emoji} [{title}]({link}) - by {author}\n"
+            agenda_parts.append(f"{priority_emoji} [{title}]({link}) - by {author}\n")
     
     # Add footer
-    agenda += f"""
+    agenda_parts.append(f"""
 
 ---
 
@@ -106,16 +91,17 @@ Contact us: newsletter@hornmichi.com
 
 ---
 *This newsletter is automatically generated from community contributions.*
-"""
+""")
     
-    return agenda
+    return ''.join(agenda_parts)
 
-def generate_html_agenda(content, newsletter_url):
+def generate_html_agenda(content, newsletter_url, month=None):
     """Generate an HTML agenda with anchor links."""
-    now = datetime.now()
+    now = month or datetime.now()
     month_year = now.strftime('%B %Y')
+    stats = edition_stats(content)
     
-    html = f"""<!DOCTYPE html>
+    html_parts = [f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -202,63 +188,52 @@ def generate_html_agenda(content, newsletter_url):
         
         <div class="stats">
             <h3>📊 This Month's Highlights</h3>
-            <p><strong>{len(content)} articles</strong> from our community</p>
-            <p><strong>{len(set(article.get('category', '') for article in content))} categories</strong> covered</p>
-            <p><strong>{len(set(article.get('author', '') for article in content))} contributors</strong> participated</p>
+            <p><strong>{stats['total_articles']} articles</strong> from our community</p>
+            <p><strong>{stats['categories_count']} categories</strong> covered</p>
+            <p><strong>{stats['authors_count']} contributors</strong> participated</p>
         </div>
-"""
-    
-    # Group by category
-    categories = {}
-    for article in content:
-        category = article.get('category', 'Other')
-        if category not in categories:
-            categories[category] = []
-        categories[category].append(article)
+"""]
     
-    # Sort content by priority
-    sorted_content = sorted(content, key=lambda x: (
-        {'Urgent': 0, 'High': 1, 'Normal': 2}.get(x.get('priority', 'Normal'), 2),
-        x.get('category', '')
-    ))
+    # Group by category in collection order
+    categories = group_by_category(content)
     
     for category, articles in categories.items():
-        html += f"""
+        html_parts.append(f"""
         <div class="category">
             <h3>{category}</h3>
-"""
+""")
         
         for article in articles:
             title = article.get('title', 'Untitled')
             author = article.get('author', 'Unknown')
             priority = article.get('priority', 'Normal')
-            section_id = create_section_id(title)
+            section_id = article['section_id']
             
             priority_class = f"priority-{priority.lower()}"
             
-            html += f"""
+            html_parts.append(f"""
             <div class="agenda-item {priority_class}">
                 <a href="{newsletter_url}#{section_id}">{title}</a>
                 <div class="author">by {author}</div>
             </div>
-"""
+""")
         
-        html += "        </div>"
+        html_parts.append("        </div>")
     
-    html += """
+    html_parts.append("""
         <div class="footer">
             <p>Want to contribute? <a href="https://github.com/hornmichi/Cloud-News/issues">Submit content here</a></p>
             <p>📧 newsletter@hornmichi.com</p>
         </div>
     </div>
 </body>
-</html>"""
+</html>""")
     
-    return html
+    return ''.join(html_parts)
 
-def save_agenda_files(teams_agenda, html_agenda):
+def save_agenda_files(teams_agenda, html_agenda, verbose=True, month=None):
     """Save the agenda files."""
-    timestamp = datetime.now().strftime("%Y%m")
+    timestamp = (month or datetime.now()).strftime("%Y%m")
     
     # Save Teams agenda (Markdown format)
     teams_filename = f"newsletters/teams-agenda-{timestamp}.md"
@@ -278,10 +253,11 @@ def save_agenda_files(teams_agenda, html_agenda):
         f.write(teams_agenda)
         f.write("\n\n=== END OF COPY-PASTE CONTENT ===")
     
-    print(f"Agenda files saved:")
-    print(f"  - Teams Markdown: {teams_filename}")
-    print(f"  - HTML Agenda: {html_filename}")
-    print(f"  - Copy-Paste: {copy_paste_filename}")
+    if verbose:
+        print(f"Agenda files saved:")
+        print(f"  - Teams Markdown: {teams_filename}")
+        print(f"  - HTML Agenda: {html_filename}")
+        print(f"  - Copy-Paste: {copy_paste_filename}")
     
     return copy_paste_filename
 
@@ -6,395 +6,159 @@ Usage: python generate_newsletter_from_selected.py "1,2,3" "January 2024"
 
 import sys
 import json
-import re
 import os
+import time
 from datetime import datetime
-from jinja2 import Template
-import requests
 
-def create_section_id(title):
-    """Create a URL-friendly section ID from title."""
-    id_text = re.sub(r'[^a-zA-Z0-9\s-]', '', title)
-    id_text = re.sub(r'\s+', '-', id_text.lower())
-    return id_text
-
-def fetch_issue_content(issue_number, repo_owner, repo_name, token=None):
-    """Fetch issue content from GitHub API."""
-    url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/issues/{issue_number}"
-    headers = {}
-    if token:
-        headers['Authorization'] = f'token {token}'
-    
-    response = requests.get(url, headers=headers)
+from github_client import (
+    GITHUB_API_URL, create_session, fetch_concurrently, fetch_issues_graphql, get_concurrency,
+    get_scheduler, report_http_cache, report_rate_limits
+)
+from edition_model import PRIORITY_EMOJI, edition_stats, group_by_category, prepare_content, sort_content
+from issue_parser import parse_issue
+from issue_snapshot import get_snapshot
+from template_cache import get_template
+
+def fetch_issue_content(issue_number, repo_owner, repo_name, token=None, session=None):
+    """Fetch issue content from GitHub API, or from GITHUB_SNAPSHOT if set."""
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        issue = snapshot.get(issue_number)
+        if issue is None:
+            print(f"Error: issue {issue_number} is not in snapshot {snapshot.path}")
+            return None
+        return parse_issue_content(issue, issue_number)
+    
+    url = f"{GITHUB_API_URL}/repos/{repo_owner}/{repo_name}/issues/{issue_number}"
+    response = (session or create_session(token)).get(url)
     if response.status_code != 200:
         print(f"Error fetching issue {issue_number}: {response.status_code}")
         return None
     
-    issue = response.json()
-    
-    # Parse the issue body to extract structured content
-    body = issue.get('body', '')
-    lines = body.split('\n')
+    return parse_issue_content(response.json(), issue_number)
+
+def parse_issue_content(issue, issue_number):
+    """Build article content from a REST-shaped GitHub issue."""
+    body = issue.get('body') or ''
+    fields = parse_issue(body)
     
-    # Extract content from issue body
-    content = {
-        'title': issue.get('title', 'Untitled'),
-        'author': issue.get('user', {}).get('login', 'Unknown'),
+    # Fall back to the issue itself for anything the body does not provide
+    return {
+        'title': fields.title or issue.get('title', 'Untitled'),
+        'author': fields.author or issue.get('user', {}).get('login', 'Unknown'),
         'url': issue.get('html_url', ''),
         'number': issue_number,
-        'body': body
+        'body': body,
+        'summary': fields.summary or (body[:200] + '...' if len(body) > 200 else body),
+        'category': fields.category or 'Article',
+        'priority': fields.priority or 'Normal',
+        'image': fields.image,
+        'content': fields.content or body
     }
-    
-    # Try to extract structured fields from the issue body
-    for line in lines:
-        if line.startswith('**Title:**'):
-            content['title'] = line.replace('**Title:**', '').strip()
-        elif line.startswith('**Summary:**'):
-            content['summary'] = line.replace('**Summary:**', '').strip()
-        elif line.startswith('**Category:**'):
-            content['category'] = line.replace('**Category:**', '').strip()
-        elif line.startswith('**Priority:**'):
-            content['priority'] = line.replace('**Priority:**', '').strip()
-        elif line.startswith('**Author:**'):
-            content['author'] = line.replace('**Author:**', '').strip()
-        elif line.startswith('**Image:**'):
-            content['image'] = line.replace('**Image:**', '').strip()
-    
-    # Set defaults if not found
-    if 'summary' not in content:
-        content['summary'] = body[:200] + '...' if len(body) > 200 else body
-    if 'category' not in content:
-        content['category'] = 'Article'
-    if 'priority' not in content:
-        content['priority'] = 'Normal'
-    if 'image' not in content:
-        content['image'] = ''
-    
-    # Extract the main content (everything after the metadata)
-    content_lines = []
-    in_content = False
-    for line in lines:
-        if line.startswith('**Content:**'):
-            in_content = True
-            continue
-        if in_content:
-            content_lines.append(line)
-    
-    content['content'] = '\n'.join(content_lines).strip()
-    if not content['content']:
-        content['content'] = body
-    
-    return content
+
+def fetch_selected_issues(issue_numbers, repo_owner, repo_name, token=None, backend='graphql'):
+    """Fetch selected issues, batching through GraphQL where possible.
+
+    Returns a list with one entry per issue number (None if it could not be
+    fetched), in the same order as issue_numbers.
+    """
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        print(f"Snapshot: reading {len(issue_numbers)} issues from {snapshot.path}")
+        return [fetch_issue_content(number, repo_owner, repo_name) for number in issue_numbers]
+    
+    concurrency = get_concurrency()
+    session = create_session(token, pool_size=concurrency)
+    articles = {}
+    
+    if backend == 'graphql' and not token:
+        print("GraphQL requires GITHUB_TOKEN; using REST")
+        backend = 'rest'
+    
+    if backend == 'graphql':
+        started = time.perf_counter()
+        issues = fetch_issues_graphql(session, repo_owner, repo_name, issue_numbers)
+        for number, issue in issues.items():
+            articles[number] = parse_issue_content(issue, number)
+        print(f"GraphQL: fetched {len(issues)} of {len(issue_numbers)} issues "
+              f"in {time.perf_counter() - started:.2f}s")
+    
+    # Fall back to REST, one request per issue, for anything not fetched yet
+    remaining = [number for number in issue_numbers if number not in articles]
+    if remaining:
+        print(f"REST: fetching {len(remaining)} issues ({concurrency} concurrent)...")
+        get_scheduler().expect(len(remaining))
+        results, latencies, total_time = fetch_concurrently(
+            remaining,
+            lambda n: fetch_issue_content(n, repo_owner, repo_name, session=session),
+            max_workers=concurrency
+        )
+        for number, article, latency in zip(remaining, results, latencies):
+            if article:
+                articles[number] = article
+                print(f"Fetched issue #{number} in {latency * 1000:.0f} ms")
+        print(f"REST: fetch time {total_time:.2f}s total")
+    
+    return [articles.get(number) for number in issue_numbers]
 
 def generate_newsletter_html(articles, newsletter_date):
     """Generate the newsletter HTML."""
-    template_content = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Cloud News - {{ newsletter_date }}</title>
-    <style>
-        body { 
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; 
-            line-height: 1.6; 
-            color: #333; 
-            max-width: 800px; 
-            margin: 0 auto; 
-            padding: 20px; 
-            background-color: #f8f9fa;
-        }
-        .container {
-            background: white;
-            border-radius: 12px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            overflow: hidden;
-        }
-        .header { 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-            color: white; 
-            padding: 40px; 
-            text-align: center; 
-        }
-        .header h1 {
-            font-size: 2.5rem;
-            margin-bottom: 10px;
-            font-weight: 700;
-        }
-        .monthly-info {
-            background: rgba(255,255,255,0.1);
-            padding: 15px;
-            border-radius: 8px;
-            margin-top: 20px;
-        }
-        .content-area {
-            padding: 40px;
-        }
-        .article { 
-            margin-bottom: 40px; 
-            padding: 25px; 
-            border-left: 4px solid #667eea; 
-            background: #f8f9fa; 
-            border-radius: 8px; 
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-            scroll-margin-top: 20px;
-        }
-        .article h2 { 
-            color: #667eea; 
-            margin-bottom: 15px; 
-            font-size: 1.5rem;
-        }
-        .article .meta { 
-            color: #666; 
-            font-size: 0.9em; 
-            margin-bottom: 15px; 
-            display: flex;
-            align-items: center;
-            gap: 15px;
-            flex-wrap: wrap;
-        }
-        .article .summary { 
-            font-style: italic; 
-            color: #555; 
-            margin-bottom: 20px; 
-            padding: 15px;
-            background: white;
-            border-radius: 6px;
-            border-left: 3px solid #667eea;
-        }
-        .category-badge { 
-            display: inline-block; 
-            background: #667eea; 
-            color: white; 
-            padding: 6px 12px; 
-            border-radius: 20px; 
-            font-size: 0.8em; 
-            font-weight: 600;
-        }
-        .priority-badge {
-            display: inline-block;
-            padding: 4px 8px;
-            border-radius: 12px;
-            font-size: 0.7em;
-            font-weight: 600;
-        }
-        .priority-urgent { background: #e74c3c; color: white; }
-        .priority-high { background: #f39c12; color: white; }
-        .priority-normal { background: #95a5a6; color: white; }
-        .footer { 
-            text-align: center; 
-            margin-top: 40px; 
-            padding: 30px; 
-            background: #f8f9fa; 
-            border-top: 1px solid #e9ecef;
-        }
-        .footer a {
-            color: #667eea;
-            text-decoration: none;
-            font-weight: 600;
-        }
-        .footer a:hover {
-            text-decoration: underline;
-        }
-        .image {
-            margin-top: 20px;
-            text-align: center;
-        }
-        .image img {
-            max-width: 100%;
-            height: auto;
-            border-radius: 8px;
-            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        }
-        .monthly-stats {
-            background: #e8f4fd;
-            padding: 20px;
-            border-radius: 8px;
-            margin-bottom: 30px;
-            text-align: center;
-        }
-        .stats-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-            gap: 20px;
-            margin-top: 15px;
-        }
-        .stat-item {
-            background: white;
-            padding: 15px;
-            border-radius: 6px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-        }
-        .stat-number {
-            font-size: 2rem;
-            font-weight: bold;
-            color: #667eea;
-        }
-        .stat-label {
-            font-size: 0.9rem;
-            color: #666;
-            margin-top: 5px;
-        }
-        @media (max-width: 768px) {
-            body { padding: 10px; }
-            .header { padding: 30px 20px; }
-            .header h1 { font-size: 2rem; }
-            .content-area { padding: 30px 20px; }
-            .article { padding: 20px; }
-            .stats-grid { grid-template-columns: 1fr; }
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>📰 Cloud News</h1>
-            <p>{{ newsletter_date }}</p>
-            <div class="monthly-info">
-                <strong>Monthly Newsletter</strong><br>
-                {{ total_articles }} articles • {{ categories_count }} categories
-            </div>
-        </div>
-
-        <div class="content-area">
-            <div class="monthly-stats">
-                <h3>📊 This Month's Highlights</h3>
-                <div class="stats-grid">
-                    <div class="stat-item">
-                        <div class="stat-number">{{ total_articles }}</div>
-                        <div class="stat-label">Articles</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-number">{{ categories_count }}</div>
-                        <div class="stat-label">Categories</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-number">{{ authors_count }}</div>
-                        <div class="stat-label">Contributors</div>
-                    </div>
-                    <div class="stat-item">
-                        <div class="stat-number">{{ urgent_count }}</div>
-                        <div class="stat-label">Urgent Items</div>
-                    </div>
-                </div>
-            </div>
-
-            {% for article in articles %}
-            <div class="article" id="{{ article.section_id }}">
-                <h2>{{ article.title }}</h2>
-                <div class="meta">
-                    <span class="category-badge">{{ article.category }}</span>
-                    <span class="priority-badge priority-{{ article.priority.lower() }}">{{ article.priority }}</span>
-                    <span>By {{ article.author }}</span>
-                </div>
-                <div class="summary">{{ article.summary }}</div>
-                <div class="content">{{ article.content | safe }}</div>
-                {% if article.image %}
-                <div class="image">
-                    <img src="{{ article.image }}" alt="Article image">
-                </div>
-                {% endif %}
-            </div>
-            {% endfor %}
-        </div>
-
-        <div class="footer">
-            <p>Want to contribute? <a href="https://github.com/hornmichi/Cloud-News/issues">Submit content here</a></p>
-            <p>📧 <a href="mailto:newsletter@hornmichi.com">newsletter@hornmichi.com</a></p>
-            <p style="margin-top: 20px; font-size: 0.9em; color: #666;">© 2024 Cloud News. All rights reserved.</p>
-        </div>
-    </div>
-</body>
-</html>"""
-    
-    template = Template(template_content)
-    
-    # Sort content by priority and category
-    sorted_articles = sorted(articles, key=lambda x: (
-        {'Urgent': 0, 'High': 1, 'Normal': 2}.get(x.get('priority', 'Normal'), 2),
-        x.get('category', '')
-    ))
+    template = get_template("newsletter_template.html")
     
-    # Add section IDs to each article
-    for article in sorted_articles:
-        article['section_id'] = create_section_id(article.get('title', 'Untitled'))
-    
-    # Calculate statistics
-    categories = set(article.get('category', '') for article in articles)
-    authors = set(article.get('author', '') for article in articles)
-    urgent_count = sum(1 for article in articles if article.get('priority') == 'Urgent')
+    # Sort content by priority and category; section IDs are precomputed
+    sorted_articles = sort_content(articles)
     
     html_content = template.render(
         articles=sorted_articles,
         newsletter_date=newsletter_date,
-        total_articles=len(articles),
-        categories_count=len(categories),
-        authors_count=len(authors),
-        urgent_count=urgent_count
+        **edition_stats(articles)
     )
     
     return html_content
 
 def generate_teams_agenda(articles, newsletter_date, newsletter_url):
     """Generate a Teams-friendly agenda with clickable links."""
+    stats = edition_stats(articles)
     
     # Start with header
-    agenda = f"""📰 **Cloud News - {newsletter_date}**
+    agenda_parts = [f"""📰 **Cloud News - {newsletter_date}**
 
 Welcome to this month's newsletter! Here's what's inside:
 
 📊 **Monthly Highlights**
-• {len(articles)} articles from our community
-• {len(set(article.get('category', '') for article in articles))} different categories
-• {len(set(article.get('author', '') for article in articles))} contributors
+• {stats['total_articles']} articles from our community
+• {stats['categories_count']} different categories
+• {stats['authors_count']} contributors
 
 ---
 
 **📋 Table of Contents**
 
-"""
-    
-    # Sort content by priority and category
-    sorted_articles = sorted(articles, key=lambda x: (
-        {'Urgent': 0, 'High': 1, 'Normal': 2}.get(x.get('priority', 'Normal'), 2),
-        x.get('category', '')
-    ))
+"""]
     
-    # Group by category
-    categories = {}
-    for article in sorted_articles:
-        category = article.get('category', 'Other')
-        if category not in categories:
-            categories[category] = []
-        categories[category].append(article)
+    # Sort content by priority, then group by category
+    categories = group_by_category(sort_content(articles))
     
     # Generate agenda items
     for category, category_articles in categories.items():
-        agenda += f"\n**{category}**\n"
+        agenda_parts.append(f"\n**{category}**\n")
         
         for article in category_articles:
             title = article.get('title', 'Untitled')
             author = article.get('author', 'Unknown')
             priority = article.get('priority', 'Normal')
-            
-            # Create section ID
-            section_id = create_section_id(title)
+            section_id = article['section_id']
             
             # Priority emoji
-            priority_emoji = {
-                'Urgent': '🔴',
-                'High': '🟡', 
-                'Normal': '⚪'
-            }.get(priority, '⚪')
+            priority_emoji = PRIORITY_EMOJI.get(priority, '⚪')
             
             # Create link
             link = f"{newsletter_url}#{section_id}"
             
-            agenda += f"{priority_emoji} [{title}]({link}) - by {author}\n"
+            agenda_parts.append(f"{priority_emoji} [{title}]({link}) - by {author}\n")
     
     # Add footer
-    agenda += f"""
+    agenda_parts.append(f"""
 
 ---
 
@@ -406,9 +170,9 @@ Contact us: newsletter@hornmichi.com
 
 ---
 *This newsletter is automatically generated from community contributions.*
-"""
+""")
     
-    return agenda
+    return ''.join(agenda_parts)
 
 def main():
     """Main function."""
@@ -431,13 +195,14 @@ def main():
     repo_name = "Cloud-News"
     github_token = os.getenv('GITHUB_TOKEN')
     
+    backend = os.getenv('GITHUB_FETCH_BACKEND', 'graphql')
+    
     print(f"Fetching {len(article_numbers)} articles...")
     
     # Fetch articles from GitHub Issues
     articles = []
-    for issue_number in article_numbers:
-        print(f"Fetching issue #{issue_number}...")
-        article = fetch_issue_content(issue_number, repo_owner, repo_name, github_token)
+    results = fetch_selected_issues(article_numbers, repo_owner, repo_name, github_token, backend)
+    for issue_number, article in zip(article_numbers, results):
         if article:
             articles.append(article)
         else:
@@ -449,6 +214,9 @@ def main():
     
     print(f"Successfully fetched {len(articles)} articles")
     
+    # Compute sort keys and section IDs once for both outputs
+    prepare_content(articles)
+    
     # Generate newsletter HTML
     print("Generating newsletter HTML...")
     html_content = generate_newsletter_html(articles, newsletter_date)
@@ -471,6 +239,9 @@ def main():
     print("✅ Newsletter files generated:")
     print("  - newsletter.html")
     print("  - teams-agenda.txt")
+    
+    report_http_cache()
+    report_rate_limits()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Shared GitHub API helpers for the newsletter scripts.
+Provides a pooled, disk-cached and rate-limited HTTP session, a bounded
+concurrent fetcher and batched GraphQL issue lookups.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from http_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, CachedSession, HTTPCache
+from rate_limit import DEFAULT_MAX_RETRIES, DEFAULT_REQUESTS_PER_SECOND, RateLimitedAdapter, RateLimitScheduler
+
+# Override to point the scripts at a local mock server
+GITHUB_API_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
+
+GITHUB_GRAPHQL_URL = os.getenv('GITHUB_GRAPHQL_URL', f'{GITHUB_API_URL}/graphql')
+
+DEFAULT_CONCURRENCY = 8
+
+GRAPHQL_CHUNK_SIZE = 50
+
+ISSUE_GRAPHQL_FIELDS = "number title body url state createdAt updatedAt author { login }"
+
+def get_concurrency():
+    """Read the fetch concurrency limit from the environment."""
+    try:
+        return max(1, int(os.getenv('GITHUB_FETCH_CONCURRENCY', DEFAULT_CONCURRENCY)))
+    except ValueError:
+        return DEFAULT_CONCURRENCY
+
+_http_cache = None
+
+_scheduler = None
+
+def get_http_cache():
+    """Return the shared on-disk HTTP cache, or None if disabled."""
+    global _http_cache
+    if os.getenv('GITHUB_HTTP_CACHE', '1') == '0':
+        return None
+    if _http_cache is None:
+        try:
+            max_bytes = int(float(os.getenv('GITHUB_HTTP_CACHE_MAX_MB', '')) * 1024 * 1024)
+        except ValueError:
+            max_bytes = DEFAULT_MAX_BYTES
+        _http_cache = HTTPCache(os.getenv('GITHUB_HTTP_CACHE_DIR', DEFAULT_CACHE_DIR), max_bytes)
+    return _http_cache
+
+def report_http_cache():
+    """Print the shared cache's hit/miss counters, if it was used."""
+    if _http_cache is not None:
+        _http_cache.report()
+
+def get_scheduler():
+    """Return the rate-limit scheduler shared by every session."""
+    global _scheduler
+    if _scheduler is None:
+        try:
+            rate = float(os.getenv('GITHUB_REQUESTS_PER_SECOND', DEFAULT_REQUESTS_PER_SECOND))
+        except ValueError:
+            rate = DEFAULT_REQUESTS_PER_SECOND
+        try:
+            max_retries = max(0, int(os.getenv('GITHUB_MAX_RETRIES', DEFAULT_MAX_RETRIES)))
+        except ValueError:
+            max_retries = DEFAULT_MAX_RETRIES
+        _scheduler = RateLimitScheduler(rate, max_retries)
+    return _scheduler
+
+def report_rate_limits():
+    """Print the shared scheduler's request and retry counters, if it was used."""
+    if _scheduler is not None:
+        _scheduler.report()
+
+def create_session(token=None, pool_size=DEFAULT_CONCURRENCY):
+    """Create a requests session with a connection pool sized for the fetcher."""
+    cache = get_http_cache()
+    session = CachedSession(cache) if cache else requests.Session()
+    adapter = RateLimitedAdapter(get_scheduler(), pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Accept'] = 'application/vnd.github+json'
+    if token:
+        session.headers['Authorization'] = f'token {token}'
+    return session
+
+def fetch_concurrently(items, fetch_one, max_workers=DEFAULT_CONCURRENCY):
+    """Run fetch_one over items on a bounded thread pool.
+
+    Returns (results, latencies, total_seconds). Results and latencies are in
+    the same order as items; a failed fetch yields None.
+    """
+    def timed(item):
+        start = time.perf_counter()
+        try:
+            result = fetch_one(item)
+        except Exception as e:
+            print(f"Error fetching {item}: {e}")
+            result = None
+        return result, time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        timed_results = list(executor.map(timed, items))
+    total = time.perf_counter() - started
+
+    results = [result for result, _ in timed_results]
+    latencies = [latency for _, latency in timed_results]
+    return results, latencies, total
+
+def graphql_query(session, query, variables=None):
+    """Run a GraphQL query and return (data, errors)."""
+    response = session.post(GITHUB_GRAPHQL_URL, json={'query': query, 'variables': variables or {}})
+    if response.status_code != 200:
+        raise RuntimeError(f"GraphQL request failed: {response.status_code}")
+    payload = response.json()
+    return payload.get('data') or {}, payload.get('errors') or []
+
+def graphql_issue_to_rest(node):
+    """Convert a GraphQL issue node to the REST issue shape."""
+    return {
+        'number': node.get('number'),
+        'title': node.get('title'),
+        'body': node.get('body'),
+        'html_url': node.get('url'),
+        'state': (node.get('state') or '').lower(),
+        'created_at': node.get('createdAt'),
+        'updated_at': node.get('updatedAt'),
+        'user': {'login': (node.get('author') or {}).get('login', 'Unknown')}
+    }
+
+def fetch_issues_graphql(session, repo_owner, repo_name, issue_numbers, chunk_size=GRAPHQL_CHUNK_SIZE):
+    """Fetch issues through aliased GraphQL queries, chunk_size issues per request.
+
+    Returns a dict of issue number to REST-shaped issue. Issues missing from the
+    result (not found, or their chunk failed) should be fetched another way.
+    """
+    issues = {}
+    get_scheduler().expect(-(-len(issue_numbers) // chunk_size))
+    for start in range(0, len(issue_numbers), chunk_size):
+        chunk = issue_numbers[start:start + chunk_size]
+        aliases = "\n".join(
+            f"i{number}: issue(number: {int(number)}) {{ {ISSUE_GRAPHQL_FIELDS} }}"
+            for number in chunk
+        )
+        query = f"query($owner: String!, $name: String!) {{ repository(owner: $owner, name: $name) {{ {aliases} }} }}"
+        try:
+            data, errors = graphql_query(session, query, {'owner': repo_owner, 'name': repo_name})
+        except Exception as e:
+            print(f"GraphQL batch of {len(chunk)} issues failed: {e}")
+            continue
+
+        if errors:
+            print(f"GraphQL batch returned {len(errors)} error(s)")
+        repository = data.get('repository') or {}
+        for number in chunk:
+            node = repository.get(f"i{number}")
+            if node:
+                issues[number] = graphql_issue_to_rest(node)
+    return issues
+
+def list_repo_issues(session, repo_full_name, params, etag=None, api_url=GITHUB_API_URL):
+    """List repository issues across all pages.
+
+    The first page is requested with If-None-Match when an etag is given.
+    Returns (issues, etag); issues is None when GitHub answers 304 Not Modified.
+    The etag only covers the first page, so it is None for a listing with
+    more pages: a change on page 2 would otherwise still get a 304.
+    """
+    url = f"{api_url}/repos/{repo_full_name}/issues"
+    headers = {'If-None-Match': etag} if etag else {}
+    response = session.get(url, params=dict(params, per_page=100), headers=headers)
+    if response.status_code == 304:
+        return None, etag
+    response.raise_for_status()
+
+    first_etag = response.headers.get('ETag')
+    issues = response.json()
+    if 'next' in response.links:
+        first_etag = None
+    while 'next' in response.links:
+        response = session.get(response.links['next']['url'])
+        response.raise_for_status()
+        issues.extend(response.json())
+
+    # The issues endpoint also returns pull requests
+    issues = [issue for issue in issues if 'pull_request' not in issue]
+    return issues, first_etag
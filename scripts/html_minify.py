@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Whitespace minification for rendered newsletter HTML.
+Whitespace runs collapse to one space and disappear next to block-level
+tags; <pre>, <textarea> and <script> are left untouched and <style> blocks
+get their CSS minified.
+"""
+
+import re
+
+# Elements whose contents must be kept byte for byte, plus <style> for CSS
+RAW_BLOCK_RE = re.compile(r'<(pre|textarea|script|style)\b[^>]*>.*?</\1\s*>', re.S | re.I)
+
+# Conditional comments (<!--[if mso]>) are kept for Outlook
+COMMENT_RE = re.compile(r'<!--(?!\[if).*?-->', re.S)
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Whitespace next to these tags is never rendered
+BLOCK_TAG_SPACE_RE = re.compile(
+    r' ?(</?(?:html|head|body|meta|title|link|style|div|p|h[1-6]|ul|ol|li|table|thead|tbody|'
+    r'tr|td|th|header|footer|section|article|nav|picture|source|br|hr)\b[^>]*>) ?',
+    re.I
+)
+
+CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+
+CSS_SPACE_RE = re.compile(r'\s*([{};,>])\s*')
+
+def minify_css(css):
+    """Strip comments and optional whitespace from a stylesheet."""
+    css = CSS_COMMENT_RE.sub('', css)
+    css = WHITESPACE_RE.sub(' ', css)
+    css = CSS_SPACE_RE.sub(r'\1', css)
+    return css.replace(': ', ':').replace(';}', '}').strip()
+
+def minify_text(html):
+    """Minify HTML that contains no raw-text blocks."""
+    html = COMMENT_RE.sub('', html)
+    html = WHITESPACE_RE.sub(' ', html)
+    return BLOCK_TAG_SPACE_RE.sub(r'\1', html)
+
+def minify_html(html):
+    """Return html with insignificant whitespace and comments removed."""
+    parts = []
+    position = 0
+    for match in RAW_BLOCK_RE.finditer(html):
+        parts.append(minify_text(html[position:match.start()]))
+        block = match.group(0)
+        if match.group(1).lower() == 'style':
+            open_end = block.index('>') + 1
+            close_start = block.rindex('<')
+            block = block[:open_end] + minify_css(block[open_end:close_start]) + block[close_start:]
+        parts.append(block)
+        position = match.end()
+    parts.append(minify_text(html[position:]))
+    return ''.join(parts).strip()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+On-disk conditional-request cache for GitHub API reads.
+Stores ETag/Last-Modified per URL and replays the body on 304 Not Modified.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_CACHE_DIR = ".cache/github-http"
+
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+# Response headers kept alongside the cached body
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Link', 'Content-Type')
+
+class HTTPCache:
+    """Size-bounded, least-recently-used store of GET responses on disk."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._sizes = {
+            entry.path: entry.stat().st_size
+            for entry in os.scandir(cache_dir) if entry.is_file()
+        }
+
+    def _path(self, url, authorization):
+        """Return the entry path for a URL as seen with the given credentials."""
+        key = hashlib.sha256(f"{authorization or ''}\n{url}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, url, authorization=None):
+        """Return (headers, body) for a cached URL, or None."""
+        path = self._path(url, authorization)
+        try:
+            with open(path, 'rb') as f:
+                meta, body = f.read().split(b'\n', 1)
+        except (OSError, ValueError):
+            return None
+        return json.loads(meta), body
+
+    def store(self, url, authorization, response):
+        """Store a 200 response that carries a validator."""
+        headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+        if 'ETag' not in headers and 'Last-Modified' not in headers:
+            return
+        path = self._path(url, authorization)
+        data = json.dumps(headers).encode('utf-8') + b'\n' + response.content
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._sizes[path] = len(data)
+            self._evict()
+
+    def touch(self, url, authorization=None):
+        """Mark an entry as recently used."""
+        try:
+            os.utime(self._path(url, authorization))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Drop least recently used entries once the cache exceeds max_bytes."""
+        total = sum(self._sizes.values())
+        if total <= self.max_bytes:
+            return
+        # Trim to 90% so a full cache does not rescan on every store
+        target = self.max_bytes * 0.9
+        by_age = sorted(self._sizes, key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0)
+        for path in by_age:
+            if total <= target:
+                break
+            total -= self._sizes.pop(path)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self.evictions += 1
+
+    def record(self, hit):
+        """Count a cache hit or miss."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def report(self):
+        """Print hit/miss counters for the run."""
+        total = self.hits + self.misses
+        if not total:
+            return
+        print(f"\n🗄️  HTTP cache: {self.hits} hits (304), {self.misses} misses, "
+              f"{self.evictions} evictions, {sum(self._sizes.values()) / 1024:.0f} KB on disk")
+
+class CachedSession(requests.Session):
+    """requests session that revalidates GET requests against an HTTPCache."""
+
+    def __init__(self, cache):
+        super().__init__()
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        # Callers that send their own validators get the raw response
+        if (request.method != 'GET' or 'If-None-Match' in request.headers
+                or 'If-Modified-Since' in request.headers):
+            return super().send(request, **kwargs)
+
+        authorization = request.headers.get('Authorization')
+        cached = self.cache.load(request.url, authorization)
+        if cached:
+            headers, body = cached
+            if 'ETag' in headers:
+                request.headers['If-None-Match'] = headers['ETag']
+            if 'Last-Modified' in headers:
+                request.headers['If-Modified-Since'] = headers['Last-Modified']
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and cached:
+            self.cache.record(hit=True)
+            self.cache.touch(request.url, authorization)
+            return build_cached_response(request, response, headers, body)
+
+        self.cache.record(hit=False)
+        if response.status_code == 200:
+            self.cache.store(request.url, authorization, response)
+        return response
+
+def build_cached_response(request, not_modified, headers, body):
+    """Turn a 304 into a 200 response carrying the cached body."""
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = 'OK'
+    response.url = request.url
+    response.request = request
+    response.headers = CaseInsensitiveDict(headers)
+    # Keep fresh rate-limit headers from the 304
+    for name, value in not_modified.headers.items():
+        if name.lower().startswith('x-ratelimit'):
+            response.headers[name] = value
+    response._content = body
+    response.encoding = 'utf-8'
+    response.elapsed = not_modified.elapsed
+    return response
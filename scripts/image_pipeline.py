@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Build-time image stage for rendered newsletters.
+Remote article images (<img src="https://...">) are downloaded concurrently
+into a content-addressed cache, resized to a few widths as WebP and JPEG,
+copied to images/ next to the edition, and the HTML is rewritten to a
+<picture> with srcset. Images whose hash was processed before are not
+resized again.
+
+Resizing needs Pillow. Without it, images are still cached and copied next
+to the edition, but unchanged and without srcset.
+
+Usage: python image_pipeline.py newsletters/monthly-newsletter-YYYYMM.html [...]
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+DEFAULT_CACHE_DIR = ".cache/images"
+
+IMAGES_DIRNAME = "images"
+
+# The article column is at most 800px wide; 1600 covers 2x screens
+VARIANT_WIDTHS = (400, 800, 1600)
+
+JPEG_QUALITY = 82
+
+WEBP_QUALITY = 80
+
+SIZES = "(max-width: 800px) 100vw, 800px"
+
+DEFAULT_CONCURRENCY = 8
+
+DOWNLOAD_TIMEOUT = 30
+
+# Originals larger than this are not downloaded
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+
+_image_cache = None
+
+IMG_TAG_RE = re.compile(r'<img src="(https?://[^"]+)"([^>]*)>')
+
+EXTENSIONS = {
+    'image/jpeg': 'jpg', 'image/png': 'png', 'image/gif': 'gif',
+    'image/webp': 'webp', 'image/svg+xml': 'svg', 'image/avif': 'avif'
+}
+
+class ImageCache:
+    """Content-addressed store of downloaded originals and their resized variants.
+
+    index.json maps each URL to the hash of its bytes, and each hash to the
+    variants made from it, so known URLs are not downloaded again and known
+    hashes are not resized again.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.downloaded = 0
+        self.resized = 0
+        self.reused = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(cache_dir, 'files'), exist_ok=True)
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {'urls': {}, 'images': {}}
+
+    def _index_path(self):
+        """Return the location of the URL and variant index."""
+        return os.path.join(self.cache_dir, 'index.json')
+
+    def path(self, name):
+        """Return the cache location of an original or variant file."""
+        return os.path.join(self.cache_dir, 'files', name)
+
+    def save_index(self):
+        """Write the index atomically."""
+        tmp_path = f"{self._index_path()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self._index_path())
+
+    def lookup(self, url):
+        """Return the processed image record for a URL, or None."""
+        digest = self.index['urls'].get(url)
+        image = self.index['images'].get(digest) if digest else None
+        if not image or not all(os.path.exists(self.path(name)) for name in image_files(image)):
+            return None
+        if not image['variants'] and Image is not None and not image.get('unreadable'):
+            # Cached before Pillow was available: resize from the cached original
+            with open(self.path(image['original']), 'rb') as f:
+                image.update(make_variants(f.read(), digest[:16], self.path))
+            if image['variants']:
+                self.resized += 1
+        return image
+
+    def add(self, url, data, content_type):
+        """Store downloaded bytes and their variants; return the image record."""
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self.downloaded += 1
+            self.index['urls'][url] = digest
+            image = self.index['images'].get(digest)
+        if image and all(os.path.exists(self.path(name)) for name in image_files(image)):
+            with self._lock:
+                self.reused += 1
+            return image
+
+        ext = EXTENSIONS.get(content_type) or os.path.splitext(url.split('?')[0])[1].lstrip('.').lower() or 'img'
+        image = {'original': f"{digest[:16]}.{ext}", 'variants': []}
+        with open(self.path(image['original']), 'wb') as f:
+            f.write(data)
+        image.update(make_variants(data, digest[:16], self.path))
+        with self._lock:
+            self.index['images'][digest] = image
+            if image['variants']:
+                self.resized += 1
+        return image
+
+    def report(self):
+        """Print download and resize counters for the run."""
+        resizing = "" if Image else " (Pillow not installed, originals used)"
+        print(f"🖼️  Images: {self.downloaded} downloaded, {self.resized} resized, "
+              f"{self.reused} reused, {self.failed} failed{resizing}")
+
+def get_image_cache():
+    """Return the shared image cache."""
+    global _image_cache
+    if _image_cache is None:
+        _image_cache = ImageCache(os.getenv('NEWSLETTER_IMAGE_CACHE_DIR', DEFAULT_CACHE_DIR))
+    return _image_cache
+
+def image_files(image):
+    """Return every cached file name belonging to an image record."""
+    return [image['original']] + [variant[2] for variant in image['variants']]
+
+def published_files(image):
+    """Return the files an edition links to: the variants, or the original without them."""
+    return [variant[2] for variant in image['variants']] or [image['original']]
+
+def make_variants(data, name, path_for):
+    """Write WebP and JPEG variants of an image; return their records.
+
+    Returns {'variants': [[width, format, file name], ...], 'width', 'height'}
+    with an empty variant list when Pillow is missing or cannot read the data.
+    """
+    if Image is None:
+        return {'variants': []}
+    try:
+        source = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+        source.load()
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return {'variants': [], 'unreadable': True}
+
+    # JPEG has no transparency, so flatten onto the page background
+    if source.mode in ('RGBA', 'LA', 'P'):
+        source = source.convert('RGBA')
+        flat = Image.new('RGB', source.size, (255, 255, 255))
+        flat.paste(source, mask=source.getchannel('A'))
+    else:
+        flat = source.convert('RGB')
+
+    widths = [width for width in VARIANT_WIDTHS if width < flat.width] or [flat.width]
+    if flat.width < VARIANT_WIDTHS[-1] and flat.width not in widths:
+        widths.append(flat.width)
+
+    variants = []
+    for width in widths:
+        height = max(1, round(flat.height * width / flat.width))
+        resized = flat if width == flat.width else flat.resize((width, height), Image.LANCZOS)
+        for fmt, ext, options in (('WEBP', 'webp', {'quality': WEBP_QUALITY, 'method': 6}),
+                                  ('JPEG', 'jpg', {'quality': JPEG_QUALITY, 'optimize': True,
+                                                   'progressive': True})):
+            file_name = f"{name}-{width}.{ext}"
+            resized.save(path_for(file_name), fmt, **options)
+            variants.append([width, ext, file_name])
+    largest = widths[-1]
+    return {'variants': variants, 'width': largest,
+            'height': max(1, round(flat.height * largest / flat.width))}
+
+def create_download_session(pool_size=DEFAULT_CONCURRENCY):
+    """Create a pooled session for image downloads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def download(session, url):
+    """Return (bytes, content type) for an image URL, or None."""
+    response = session.get(url, timeout=DOWNLOAD_TIMEOUT, stream=True)
+    with response:
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if response.status_code != 200 or not content_type.startswith('image/'):
+            print(f"⚠️  Skipping image {url}: {response.status_code} {content_type}")
+            return None
+        data = response.raw.read(MAX_IMAGE_BYTES + 1, decode_content=True)
+        if len(data) > MAX_IMAGE_BYTES:
+            print(f"⚠️  Skipping image {url}: larger than {MAX_IMAGE_BYTES // (1024 * 1024)} MB")
+            return None
+    return data, content_type
+
+def picture_markup(image, attributes):
+    """Return the HTML that replaces one <img> tag; paths are relative to the edition."""
+    def url(name):
+        return f"{IMAGES_DIRNAME}/{name}"
+
+    if not image['variants']:
+        return f'<img src="{url(image["original"])}"{attributes}>'
+
+    def srcset(ext):
+        return ', '.join(f"{url(name)} {width}w" for width, variant_ext, name in image['variants']
+                         if variant_ext == ext)
+
+    # Plain src for clients without srcset: the widest JPEG that fits the column
+    jpegs = [(width, name) for width, ext, name in image['variants'] if ext == 'jpg']
+    width, fallback = ([jpeg for jpeg in jpegs if jpeg[0] <= VARIANT_WIDTHS[1]] or jpegs)[-1]
+    height = max(1, round(image['height'] * width / image['width']))
+    return (f'<picture><source type="image/webp" srcset="{srcset("webp")}" sizes="{SIZES}">'
+            f'<img src="{url(fallback)}" srcset="{srcset("jpg")}" sizes="{SIZES}" '
+            f'width="{width}" height="{height}" loading="lazy"{attributes}></picture>')
+
+def process_images(html, output_dir, cache=None, concurrency=DEFAULT_CONCURRENCY):
+    """Localize and resize the remote images in html; return the rewritten html.
+
+    Image files are copied to output_dir/images/. Images that cannot be
+    downloaded keep their original URL.
+    """
+    cache = cache or get_image_cache()
+    urls = list(dict.fromkeys(match.group(1) for match in IMG_TAG_RE.finditer(html)))
+    if not urls:
+        return html
+
+    images = {}
+    missing = []
+    for url in urls:
+        image = cache.lookup(url)
+        if image:
+            images[url] = image
+            cache.reused += 1
+        else:
+            missing.append(url)
+
+    if missing:
+        session = create_download_session(concurrency)
+
+        def fetch_one(url):
+            try:
+                result = download(session, url)
+            except requests.RequestException as e:
+                print(f"⚠️  Skipping image {url}: {e}")
+                return None
+            return cache.add(url, *result) if result else None
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(fetch_one, missing))
+        for url, image in zip(missing, results):
+            if image:
+                images[url] = image
+            else:
+                cache.failed += 1
+    cache.save_index()
+
+    images_dir = os.path.join(output_dir, IMAGES_DIRNAME)
+    os.makedirs(images_dir, exist_ok=True)
+    for image in images.values():
+        for name in published_files(image):
+            target = os.path.join(images_dir, name)
+            if not os.path.exists(target):
+                shutil.copyfile(cache.path(name), target)
+
+    def replace(match):
+        image = images.get(match.group(1))
+        return picture_markup(image, match.group(2)) if image else match.group(0)
+
+    return IMG_TAG_RE.sub(replace, html)
+
+def process_html_file(filename, cache=None):
+    """Rewrite the images of a saved edition in place."""
+    with open(filename, 'r', encoding='utf-8') as f:
+        html = f.read()
+    rewritten = process_images(html, os.path.dirname(filename) or '.', cache)
+    if rewritten != html:
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(rewritten)
+
+def main():
+    """Process the images of the given HTML files."""
+    filenames = sys.argv[1:]
+    if not filenames:
+        print("Usage: python image_pipeline.py newsletters/monthly-newsletter-YYYYMM.html [...]")
+        sys.exit(1)
+
+    print("🖼️  Processing Newsletter Images")
+    print("=" * 40)
+    cache = get_image_cache()
+    start = time.perf_counter()
+    for filename in filenames:
+        process_html_file(filename, cache)
+        print(f"  - {filename}")
+    print(f"Done in {time.perf_counter() - start:.2f}s")
+    cache.report()
+
+if __name__ == "__main__":
+    main()
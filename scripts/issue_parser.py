@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Parse newsletter submission issue bodies.
+Splits a body into its fields in a single pass with one precompiled regex,
+so the collection and selected-publish scripts read issues the same way.
+
+Three layouts are understood:
+  - GitHub issue forms:  "### Article Title" on its own line, value below
+  - Plain fields:        "Article Title: value"
+  - Bold fields:         "**Title:** value" (web form and hand-written issues)
+"""
+
+import bisect
+import re
+from typing import NamedTuple
+
+class IssueFields(NamedTuple):
+    """Structured fields of a submission; missing fields are empty strings."""
+    title: str = ''
+    summary: str = ''
+    category: str = ''
+    content: str = ''
+    author: str = ''
+    image: str = ''
+    priority: str = ''
+    additional_notes: str = ''
+
+# Labels used by .github/ISSUE_TEMPLATE/newsletter-content.yml
+FORM_FIELDS = {
+    'Article Title': 'title',
+    'Summary': 'summary',
+    'Content Category': 'category',
+    'Full Content': 'content',
+    'Author Name': 'author',
+    'Image': 'image',
+    'Priority': 'priority',
+    'Additional Notes': 'additional_notes',
+}
+
+# Short labels, only recognised in bold ("**Title:**") so prose lines
+# such as "Content: ..." inside an article do not split it
+BOLD_FIELDS = dict(FORM_FIELDS, **{
+    'Title': 'title',
+    'Category': 'category',
+    'Content': 'content',
+    'Author': 'author',
+})
+
+# Bold fields that hold one line, as "**Title:** value" always has; only
+# the longer bold fields (Content, Summary, ...) run on to the next field
+SINGLE_LINE_BOLD_KEYS = frozenset({'title', 'category', 'author', 'priority', 'image'})
+
+# What GitHub issue forms write for optional fields left empty
+NO_RESPONSE = '_No response_'
+
+FENCED_BLOCK_RE = re.compile(r'\A```[\w-]*[ \t]*\n(.*?)\n?```\Z', re.DOTALL)
+
+def _alternation(labels):
+    """Build a regex alternation, longest label first."""
+    return '|'.join(re.escape(label) for label in sorted(labels, key=len, reverse=True))
+
+FIELD_START_RE = re.compile(
+    rf'^(?:'
+    rf'(?:###[ \t]*)?(?P<label>{_alternation(FORM_FIELDS)})(?:[ \t]*\(optional\))?[ \t]*(?::|$)'
+    rf'|\*\*(?P<bold>{_alternation(BOLD_FIELDS)})[ \t]*(?::\*\*|\*\*[ \t]*:)'
+    rf')[ \t]*',
+    re.IGNORECASE | re.MULTILINE
+)
+
+FIELD_KEYS = {label.lower(): key for label, key in BOLD_FIELDS.items()}
+
+# Opening and closing lines of ``` code fences
+FENCE_LINE_RE = re.compile(r'^[ \t]*```', re.MULTILINE)
+
+def clean_value(value):
+    """Strip whitespace, form placeholders and a wrapping code fence."""
+    value = value.strip()
+    if value == NO_RESPONSE:
+        return ''
+    fenced = FENCED_BLOCK_RE.match(value)
+    if fenced:
+        return fenced.group(1).strip()
+    return value
+
+def parse_issue_body(body):
+    """Split an issue body into a {field: value} map in one pass.
+
+    A field runs until the next known field starts, except the short bold
+    fields ("**Title:** ..."), which end with their line. Labels inside ```
+    fences never start a field, and once the body has a "### " heading only
+    headings do, so a line such as "Image" in an article's text stays part of
+    it. If a field appears more than once the first occurrence wins.
+    """
+    body = body or ''
+    fields = {}
+    fences = [match.start() for match in FENCE_LINE_RE.finditer(body)]
+    # An odd number of fence lines before a match puts it inside a fence
+    matches = [match for match in FIELD_START_RE.finditer(body)
+               if bisect.bisect_right(fences, match.start()) % 2 == 0]
+    if any(match.group(0).startswith('#') for match in matches):
+        matches = [match for match in matches if match.group(0).startswith('#')]
+    for i, match in enumerate(matches):
+        key = FIELD_KEYS[(match.group('label') or match.group('bold')).lower()]
+        if key in fields:
+            continue
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(body)
+        if match.group('bold') and key in SINGLE_LINE_BOLD_KEYS:
+            line_end = body.find('\n', match.end(), end)
+            if line_end != -1:
+                end = line_end
+        fields[key] = clean_value(body[match.end():end])
+    return fields
+
+def parse_issue(body):
+    """Parse an issue body into an IssueFields record."""
+    return IssueFields(**parse_issue_body(body))
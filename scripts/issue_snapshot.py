@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Export newsletter issues to a local snapshot and read them back offline.
+The snapshot is gzip-compressed JSONL, one REST-shaped issue per line, sorted
+by issue number. It is written as independent gzip blocks of BLOCK_SIZE
+issues, and a small JSON index next to it records where each block starts,
+so looking up one issue decompresses a single block.
+
+Set GITHUB_SNAPSHOT to a snapshot file and generate_newsletter_from_selected.py
+and collect_monthly_content.py read issues from it instead of the GitHub API.
+
+Usage:
+  python issue_snapshot.py export [PATH] [--repo owner/name]
+  python issue_snapshot.py show NUMBER [PATH]
+"""
+
+import argparse
+import bisect
+import gzip
+import json
+import os
+import sys
+import time
+import zlib
+from datetime import datetime, timezone
+
+from github_client import create_session, list_repo_issues, report_http_cache, report_rate_limits
+
+DEFAULT_SNAPSHOT_PATH = "newsletter-issues.jsonl.gz"
+
+SNAPSHOT_VERSION = 1
+
+# Issues per gzip block; a lookup decompresses one block
+BLOCK_SIZE = 64
+
+EXPORT_LABELS = "newsletter"
+
+_snapshot = None
+
+def index_path(path):
+    """Return the location of a snapshot's block index."""
+    return f"{path}.index.json"
+
+def write_snapshot(issues, path, repo=None):
+    """Write issues to a snapshot file and its index; return the issue count."""
+    issues = sorted(issues, key=lambda issue: issue['number'])
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    blocks = []
+    offset = 0
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        for start in range(0, len(issues), BLOCK_SIZE):
+            chunk = issues[start:start + BLOCK_SIZE]
+            lines = ''.join(
+                json.dumps(issue, ensure_ascii=False, separators=(',', ':')) + '\n'
+                for issue in chunk
+            )
+            # mtime=0 keeps the bytes identical for identical issues
+            block = gzip.compress(lines.encode('utf-8'), compresslevel=9, mtime=0)
+            f.write(block)
+            blocks.append([chunk[0]['number'], offset, len(block)])
+            offset += len(block)
+    os.replace(tmp_path, path)
+
+    index = {
+        'version': SNAPSHOT_VERSION,
+        'repo': repo,
+        'exported_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'issues': len(issues),
+        'blocks': blocks
+    }
+    with open(index_path(path), 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    return len(issues)
+
+def export_snapshot(session, repo, path=DEFAULT_SNAPSHOT_PATH, labels=EXPORT_LABELS):
+    """Fetch every issue with the given labels, open or closed, into a snapshot."""
+    issues, _ = list_repo_issues(session, repo, {'state': 'all', 'labels': labels})
+    return write_snapshot(issues, path, repo)
+
+class IssueSnapshot:
+    """Read-only view of a snapshot with lookups by issue number."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(index_path(path), 'r', encoding='utf-8') as f:
+            self.index = json.load(f)
+        if self.index.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"{path}: unsupported snapshot version {self.index.get('version')}")
+        self.first_numbers = [block[0] for block in self.index['blocks']]
+        # (block number, {issue number: issue}) swapped in one assignment, so
+        # threads sharing the snapshot never pair a number with another block
+        self._last_block = (None, {})
+
+    def __len__(self):
+        return self.index['issues']
+
+    def _load_block(self, block_number):
+        """Return {issue number: issue} for one block, keeping the last one decoded."""
+        last_number, issues = self._last_block
+        if block_number == last_number:
+            return issues
+        _, offset, length = self.index['blocks'][block_number]
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            data = zlib.decompress(f.read(length), wbits=31)
+        issues = {
+            issue['number']: issue
+            for issue in map(json.loads, data.decode('utf-8').splitlines())
+        }
+        self._last_block = (block_number, issues)
+        return issues
+
+    def get(self, number):
+        """Return the issue with this number, or None."""
+        block_number = bisect.bisect_right(self.first_numbers, number) - 1
+        if block_number < 0:
+            return None
+        return self._load_block(block_number).get(number)
+
+    def __iter__(self):
+        """Yield every issue in number order."""
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def list_issues(self, labels=(), state='open', since=None):
+        """Return issues filtered the way the GitHub issue listing filters them."""
+        since = since.strftime('%Y-%m-%dT%H:%M:%S') if since else ''
+        issues = []
+        for issue in self:
+            if state != 'all' and issue.get('state') != state:
+                continue
+            names = {label['name'] for label in issue.get('labels', [])}
+            if not names.issuperset(labels) or issue.get('updated_at', '')[:19] < since:
+                continue
+            issues.append(issue)
+        # GitHub lists the most recently created issues first
+        issues.sort(key=lambda issue: (issue.get('created_at', ''), issue['number']), reverse=True)
+        return issues
+
+def get_snapshot():
+    """Return the snapshot named by GITHUB_SNAPSHOT, or None to use the live API."""
+    global _snapshot
+    path = os.getenv('GITHUB_SNAPSHOT')
+    if not path:
+        return None
+    if _snapshot is None or _snapshot.path != path:
+        _snapshot = IssueSnapshot(path)
+    return _snapshot
+
+def main():
+    """Command-line entry point."""
+    arg_parser = argparse.ArgumentParser(description="Export or inspect a newsletter issue snapshot.")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    export_parser = commands.add_parser('export', help="Write all newsletter issues to a snapshot")
+    export_parser.add_argument('path', nargs='?', default=DEFAULT_SNAPSHOT_PATH)
+    export_parser.add_argument('--repo', default=os.getenv('GITHUB_REPOSITORY', 'hornmichi/Cloud-News'))
+
+    show_parser = commands.add_parser('show', help="Print one issue from a snapshot")
+    show_parser.add_argument('number', type=int)
+    show_parser.add_argument('path', nargs='?', default=DEFAULT_SNAPSHOT_PATH)
+
+    args = arg_parser.parse_args()
+
+    if args.command == 'export':
+        print("📦 Exporting Newsletter Issues")
+        print("=" * 40)
+        start = time.perf_counter()
+        count = export_snapshot(create_session(os.getenv('GITHUB_TOKEN')), args.repo, args.path)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(args.path)
+        print(f"✅ Exported {count} issues from {args.repo} in {elapsed:.2f}s")
+        print(f"  - Snapshot: {args.path} ({size / 1024:.0f} KB)")
+        print(f"  - Index: {index_path(args.path)}")
+        report_http_cache()
+        report_rate_limits()
+    else:
+        issue = IssueSnapshot(args.path).get(args.number)
+        if issue is None:
+            print(f"Issue #{args.number} is not in {args.path}")
+            sys.exit(1)
+        print(json.dumps(issue, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Minify and precompress published newsletter files for static hosting.
+HTML is minified in place (see html_minify.py), then every text asset gets
+.gz and .br siblings at maximum compression, so a static server can send
+them as-is instead of compressing on every request. A manifest records each
+file's size and hash and the size of each compressed sibling; files whose
+hash is unchanged since the last run are not compressed again.
+
+Brotli output needs the brotli package; without it only .gz files are written.
+
+Usage: python precompress.py [PATH ...] [--manifest FILE] [--no-minify]
+
+PATH is a file or a directory (default: newsletters).
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import sys
+import time
+
+from html_minify import minify_html
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_FILENAME = "precompressed.json"
+
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.js', '.json', '.txt', '.md', '.svg', '.xml')
+
+MANIFEST_VERSION = 1
+
+def find_files(paths, manifest_path):
+    """Return the compressible files under paths, excluding the manifest."""
+    files = []
+    for path in paths:
+        if os.path.isfile(path):
+            files.append(path)
+            continue
+        for root, dirs, names in os.walk(path):
+            dirs.sort()
+            files.extend(os.path.join(root, name) for name in sorted(names))
+    manifest_path = os.path.abspath(manifest_path)
+    return [
+        path for path in dict.fromkeys(files)
+        if path.endswith(COMPRESSIBLE_EXTENSIONS) and os.path.abspath(path) != manifest_path
+    ]
+
+def default_manifest_path(paths):
+    """Place the manifest in the first directory given, or next to the first file."""
+    first = paths[0]
+    directory = first if os.path.isdir(first) else os.path.dirname(first) or '.'
+    return os.path.join(directory, MANIFEST_FILENAME)
+
+def write_bytes(path, data):
+    """Write a file atomically."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def compressed_variants(data):
+    """Return {suffix: compressed bytes} for every available encoding."""
+    variants = {'gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+    return variants
+
+def precompress(paths, manifest_path=None, minify=True):
+    """Minify and precompress files; return (manifest entries, count compressed)."""
+    manifest_path = manifest_path or default_manifest_path(paths)
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f).get('files', {})
+    except (OSError, ValueError):
+        previous = {}
+
+    entries = {}
+    compressed = 0
+    for path in find_files(paths, manifest_path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if minify and path.endswith('.html'):
+            minified = minify_html(data.decode('utf-8')).encode('utf-8')
+            if minified != data:
+                write_bytes(path, minified)
+                data = minified
+
+        key = os.path.relpath(os.path.abspath(path), base_dir).replace(os.sep, '/')
+        digest = hashlib.sha256(data).hexdigest()
+        entry = previous.get(key)
+        encodings = ['gz'] + (['br'] if brotli is not None else [])
+        up_to_date = entry and entry['sha256'] == digest and all(
+            suffix in entry['encodings']
+            and (entry['encodings'][suffix] is None or os.path.exists(f"{path}.{suffix}"))
+            for suffix in encodings
+        )
+
+        if not up_to_date:
+            entry = {
+                'size': len(data),
+                'sha256': digest,
+                'type': mimetypes.guess_type(path)[0] or 'application/octet-stream',
+                'encodings': {}
+            }
+            for suffix, body in compressed_variants(data).items():
+                # Tiny files can grow when compressed; those are served as-is (None)
+                if len(body) < len(data):
+                    write_bytes(f"{path}.{suffix}", body)
+                    entry['encodings'][suffix] = len(body)
+                else:
+                    entry['encodings'][suffix] = None
+                    if os.path.exists(f"{path}.{suffix}"):
+                        os.remove(f"{path}.{suffix}")
+            compressed += 1
+        entries[key] = entry
+
+    manifest = {'version': MANIFEST_VERSION, 'files': dict(sorted(entries.items()))}
+    write_bytes(manifest_path, json.dumps(manifest, indent=1).encode('utf-8'))
+    return entries, compressed
+
+def main():
+    """Minify and precompress the given paths."""
+    args = sys.argv[1:]
+    minify = '--no-minify' not in args
+    args = [arg for arg in args if arg != '--no-minify']
+    manifest_path = None
+    if '--manifest' in args:
+        position = args.index('--manifest')
+        manifest_path = args[position + 1]
+        args = args[:position] + args[position + 2:]
+    paths = args or ["newsletters"]
+
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        print(f"Error: {', '.join(missing)} does not exist")
+        sys.exit(1)
+
+    print("📦 Precompressing Newsletter Files")
+    print("=" * 40)
+    start = time.perf_counter()
+    entries, compressed = precompress(paths, manifest_path, minify)
+    elapsed = time.perf_counter() - start
+
+    total = sum(entry['size'] for entry in entries.values()) or 1
+    print(f"{len(entries)} files, {compressed} compressed, "
+          f"{len(entries) - compressed} unchanged ({elapsed:.2f}s)")
+    print(f"  - Original: {total / 1024:.1f} KB")
+    for suffix, name in (('gz', 'gzip'), ('br', 'brotli')):
+        if any(entry['encodings'].get(suffix) for entry in entries.values()):
+            size = sum(entry['encodings'].get(suffix) or entry['size'] for entry in entries.values())
+            print(f"  - {name}: {size / 1024:.1f} KB ({size / total:.0%})")
+    if brotli is None:
+        print("  - brotli: skipped (pip install brotli to write .br files)")
+    print(f"  - Manifest: {manifest_path or default_manifest_path(paths)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Local preview server for the web-form editor.
+Serves web-form/, proxies and caches the GitHub issue listing, and renders
+newsletter previews in memory with generate_newsletter_html.
+
+/api/articles pages through the approved backlog with a cursor and returns
+only number, title, summary and author; /api/articles/<number> returns one
+parsed article with its full body.
+
+Usage: python preview_server.py [--port 8000] [--upstream http://127.0.0.1:8765]
+
+Then open http://127.0.0.1:8000/editor.html. --upstream (or GITHUB_API_URL)
+points the proxy at a local fixture server instead of api.github.com.
+"""
+
+import bisect
+import json
+import mimetypes
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+from edition_model import prepare_content
+from generate_newsletter_from_selected import generate_newsletter_html, parse_issue_content
+from github_client import GITHUB_API_URL, create_session, get_scheduler, list_repo_issues
+
+WEB_FORM_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'web-form')
+
+DEFAULT_PORT = 8000
+
+# Seconds a proxied listing is served from memory before it is revalidated
+DEFAULT_LISTING_TTL = 30
+
+# Issues shown in the editor backlog; most recently updated first, so an
+# edit anywhere in the backlog changes the first page and its ETag
+BACKLOG_QUERY = {'labels': 'newsletter,approved', 'state': 'open', 'sort': 'updated', 'direction': 'desc'}
+
+DEFAULT_PAGE_SIZE = 50
+
+MAX_PAGE_SIZE = 100
+
+# Fields sent for each article in a backlog page
+SUMMARY_FIELDS = ('number', 'title', 'summary', 'author')
+
+ARTICLE_PATH_RE = re.compile(r'^/api/articles/(\d+)$')
+
+# Tells the editor page it is served by this server
+PREVIEW_MARKER = "<script>window.CLOUD_NEWS_PREVIEW = true;</script>\n</head>"
+
+def parse_preview_items(items):
+    """Return [(number, body or None)] for a preview request's articles list.
+
+    Each item is an issue number or {"number": n, "body": edited_body};
+    raises ValueError describing the first malformed item.
+    """
+    if not isinstance(items, list):
+        raise ValueError('articles must be a list')
+    parsed = []
+    for item in items:
+        body = None
+        if isinstance(item, dict):
+            number, body = item.get('number'), item.get('body')
+            if body is not None and not isinstance(body, str):
+                raise ValueError(f'body of article {number!r} must be a string')
+        else:
+            number = item
+        if isinstance(number, str) and number.isdigit():
+            number = int(number)
+        if not isinstance(number, int) or isinstance(number, bool) or number <= 0:
+            raise ValueError(f'invalid article {item!r}: expected an issue number')
+        parsed.append((number, body))
+    return parsed
+
+def upstream_status(error):
+    """Return (status, Retry-After or None) to answer an upstream failure with.
+
+    GitHub rate limits (429, or 403 with a rate-limit signal) become 429 so
+    the editor can retry later; anything else is a 502 Bad Gateway.
+    """
+    response = getattr(error, 'response', None)
+    if response is not None and (response.status_code == 429
+                                 or get_scheduler().is_rate_limited(response)):
+        return 429, response.headers.get('Retry-After')
+    return 502, None
+
+class PreviewState:
+    """Upstream connection plus the warm caches shared by all requests."""
+
+    def __init__(self, api_url, repo, token=None, listing_ttl=DEFAULT_LISTING_TTL):
+        self.api_url = api_url.rstrip('/')
+        self.repo = repo
+        self.listing_ttl = listing_ttl
+        self.session = create_session(token)
+        self.listings = {}
+        self.issues = {}
+        self.articles = {}
+        self.backlog = None
+        self.lock = threading.Lock()
+
+    def list_issues(self, query):
+        """Return (status, issues) for an issue listing, cached for listing_ttl seconds."""
+        key = urlencode(sorted(query.items()))
+        with self.lock:
+            cached = self.listings.get(key)
+        if cached and time.monotonic() - cached[0] < self.listing_ttl:
+            return 200, cached[1]
+
+        response = self.session.get(f"{self.api_url}/repos/{self.repo}/issues", params=query)
+        if response.status_code != 200:
+            return response.status_code, []
+        issues = response.json()
+        with self.lock:
+            self.listings[key] = (time.monotonic(), issues)
+        for issue in issues:
+            self.remember_issue(issue)
+        return 200, issues
+
+    def remember_issue(self, issue):
+        """Cache one issue's JSON for listing_ttl seconds."""
+        with self.lock:
+            self.issues[issue['number']] = (time.monotonic(), issue)
+
+    def get_issue(self, number):
+        """Return one issue's JSON, fetching it when not cached or older than listing_ttl.
+
+        Returns None for an issue that does not exist; other upstream failures
+        raise requests.HTTPError.
+        """
+        with self.lock:
+            cached = self.issues.get(number)
+        if cached and time.monotonic() - cached[0] < self.listing_ttl:
+            return cached[1]
+        response = self.session.get(f"{self.api_url}/repos/{self.repo}/issues/{number}")
+        if response.status_code in (404, 410):
+            return None
+        response.raise_for_status()
+        issue = response.json()
+        self.remember_issue(issue)
+        return issue
+
+    def get_article(self, number, issue=None):
+        """Return the parsed article for an issue, parsing each issue version once."""
+        issue = issue or self.get_issue(number)
+        if issue is None:
+            return None
+        version = issue.get('updated_at')
+        with self.lock:
+            cached = self.articles.get(number)
+        if cached and cached[0] == version:
+            return cached[1]
+        article = parse_issue_content(issue, number)
+        with self.lock:
+            self.articles[number] = (version, article)
+        return article
+
+    def load_backlog(self):
+        """Return the approved backlog, re-listing it at most every listing_ttl seconds.
+
+        The backlog is a dict with the article summaries (newest issue first),
+        their negated numbers for cursor lookups, and a cache of encoded pages.
+        """
+        with self.lock:
+            backlog = self.backlog
+        if backlog and time.monotonic() - backlog['loaded'] < self.listing_ttl:
+            return backlog
+
+        issues, etag = list_repo_issues(
+            self.session, self.repo, BACKLOG_QUERY,
+            etag=backlog['etag'] if backlog else None, api_url=self.api_url
+        )
+        if issues is None:
+            # 304 Not Modified: keep the parsed backlog and its encoded pages
+            backlog['loaded'] = time.monotonic()
+            return backlog
+
+        summaries = []
+        for issue in sorted(issues, key=lambda issue: -issue['number']):
+            self.remember_issue(issue)
+            article = self.get_article(issue['number'], issue)
+            summaries.append({field: article[field] for field in SUMMARY_FIELDS})
+        backlog = {
+            'loaded': time.monotonic(),
+            'etag': etag,
+            'summaries': summaries,
+            'keys': [-summary['number'] for summary in summaries],
+            'pages': {}
+        }
+        with self.lock:
+            self.backlog = backlog
+        return backlog
+
+    def backlog_page(self, cursor, limit):
+        """Return one encoded page of backlog summaries after the cursor issue number."""
+        backlog = self.load_backlog()
+        page_key = (cursor, limit)
+        page = backlog['pages'].get(page_key)
+        if page is None:
+            start = bisect.bisect_right(backlog['keys'], -cursor) if cursor else 0
+            items = backlog['summaries'][start:start + limit]
+            more = start + limit < len(backlog['summaries'])
+            page = json.dumps({
+                'articles': items,
+                'next_cursor': str(items[-1]['number']) if items and more else None,
+                'total': len(backlog['summaries'])
+            }, separators=(',', ':')).encode('utf-8')
+            backlog['pages'][page_key] = page
+        return page
+
+    def render_preview(self, items, newsletter_date):
+        """Render the newsletter HTML for the requested issues.
+
+        items are (number, edited body or None) pairs from parse_preview_items.
+        """
+        articles = []
+        for number, body in items:
+            issue = self.get_issue(number)
+            if issue is None:
+                continue
+            if body is not None:
+                articles.append(parse_issue_content(dict(issue, body=body), number))
+            else:
+                articles.append(dict(self.get_article(number, issue)))
+        return generate_newsletter_html(prepare_content(articles), newsletter_date)
+
+class PreviewHandler(BaseHTTPRequestHandler):
+    """Routes: static files from web-form/, /api/issues, /api/articles[/<number>] and /api/preview."""
+
+    server_version = "CloudNewsPreview/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        article_match = ARTICLE_PATH_RE.match(url.path)
+        if url.path == '/api/issues':
+            status, issues = self.server.state.list_issues(dict(parse_qsl(url.query)))
+            self.send_json(status, issues)
+        elif url.path == '/api/articles':
+            query = dict(parse_qsl(url.query))
+            try:
+                cursor = int(query.get('cursor') or 0)
+                limit = min(max(int(query.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+            except ValueError:
+                self.send_json(400, {'error': 'cursor and limit must be integers'})
+                return
+            try:
+                page = self.server.state.backlog_page(cursor, limit)
+            except requests.RequestException as e:
+                self.send_upstream_error(e, 'upstream listing failed')
+                return
+            self.send_body(200, 'application/json', page)
+        elif article_match:
+            try:
+                article = self.server.state.get_article(int(article_match.group(1)))
+            except requests.RequestException as e:
+                self.send_upstream_error(e, 'upstream issue fetch failed')
+                return
+            if article is None:
+                self.send_json(404, {'error': 'not found'})
+            else:
+                self.send_json(200, article)
+        else:
+            self.send_static(url.path)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != '/api/preview':
+            self.send_json(404, {'error': 'not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            items = parse_preview_items(payload.get('articles', []))
+            newsletter_date = str(payload.get('newsletter_date') or time.strftime('%B %Y'))
+        except AttributeError:
+            self.send_json(400, {'error': 'expected JSON with an articles list'})
+            return
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+            return
+        try:
+            html = self.server.state.render_preview(items, newsletter_date)
+        except requests.RequestException as e:
+            self.send_upstream_error(e, 'upstream issue fetch failed')
+            return
+        self.send_body(200, 'text/html; charset=utf-8', html.encode('utf-8'))
+
+    def send_static(self, path):
+        """Serve a file from web-form/."""
+        name = path.lstrip('/') or 'editor.html'
+        root = os.path.realpath(WEB_FORM_DIR)
+        filename = os.path.realpath(os.path.join(root, name))
+        if not filename.startswith(root + os.sep) or not os.path.isfile(filename):
+            self.send_json(404, {'error': 'not found'})
+            return
+        with open(filename, 'rb') as f:
+            body = f.read()
+        content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        if content_type == 'text/html':
+            body = body.decode('utf-8').replace('</head>', PREVIEW_MARKER, 1).encode('utf-8')
+            content_type = 'text/html; charset=utf-8'
+        self.send_body(200, content_type, body)
+
+    def send_upstream_error(self, error, message):
+        """Answer an upstream failure with 429 (rate limited) or 502."""
+        status, retry_after = upstream_status(error)
+        if status == 429:
+            message = 'GitHub rate limit reached; try again later'
+        headers = {'Retry-After': retry_after} if retry_after else None
+        self.send_body(status, 'application/json',
+                       json.dumps({'error': f'{message}: {error}' if status == 502 else message}).encode('utf-8'),
+                       headers)
+
+    def send_json(self, status, data):
+        """Send a JSON response."""
+        self.send_body(status, 'application/json', json.dumps(data).encode('utf-8'))
+
+    def send_body(self, status, content_type, body, headers=None):
+        """Send a complete response."""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        print(f"  {self.command} {self.path} -> {args[1] if len(args) > 1 else ''}")
+
+def create_server(port=DEFAULT_PORT, api_url=GITHUB_API_URL, repo=None, token=None, host='127.0.0.1'):
+    """Create the preview server; call serve_forever() to run it."""
+    server = ThreadingHTTPServer((host, port), PreviewHandler)
+    server.state = PreviewState(
+        api_url, repo or os.getenv('GITHUB_REPOSITORY', 'hornmichi/Cloud-News'),
+        token or os.getenv('GITHUB_TOKEN')
+    )
+    return server
+
+def option(args, name, default):
+    """Return the value following --name in args, or default."""
+    if name in args and args.index(name) + 1 < len(args):
+        return args[args.index(name) + 1]
+    return default
+
+def main():
+    """Run the preview server until interrupted."""
+    args = sys.argv[1:]
+    port = int(option(args, '--port', DEFAULT_PORT))
+    server = create_server(port, option(args, '--upstream', GITHUB_API_URL))
+
+    print("🖥️  Cloud News Preview Server")
+    print("=" * 40)
+    print(f"Editor:   http://127.0.0.1:{port}/editor.html")
+    print(f"Upstream: {server.state.api_url} ({server.state.repo})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Preview server stopped")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
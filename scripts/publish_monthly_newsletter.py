@@ -10,6 +10,8 @@ import requests
 from datetime import datetime, timedelta
 from github import Github
 
+from email_delivery import send_edition_email
+
 def publish_newsletter():
     """Publish the monthly newsletter."""
     print("🚀 Publishing Monthly Newsletter")
@@ -140,10 +142,11 @@ def send_notifications(timestamp):
     
     # Email notification (if configured)
     email_api_key = os.getenv('EMAIL_API_KEY')
-    if email_api_key:
+    if email_api_key or os.getenv('SMTP_HOST'):
         try:
-            # This would integrate with your email service
-            print("✅ Email notification sent (placeholder)")
+            result = send_edition_email(timestamp)
+            if result and not result['deferred']:
+                print("✅ Email notification sent")
         except Exception as e:
             print(f"⚠️  Could not send email notification: {e}")
 
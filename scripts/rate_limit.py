@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Rate-limit-aware scheduling for GitHub API requests.
+Requests are paced with a token bucket, slowed down when the
+X-RateLimit-Remaining budget runs low, and retried with jittered backoff on
+429, rate-limited 403 and 5xx responses, honoring Retry-After.
+"""
+
+import random
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+
+DEFAULT_REQUESTS_PER_SECOND = 10
+
+DEFAULT_MAX_RETRIES = 5
+
+DEFAULT_BACKOFF_BASE = 1.0
+
+DEFAULT_BACKOFF_CAP = 60.0
+
+# GitHub asks clients to wait at least a minute after a secondary rate limit
+# response that carries no Retry-After header
+DEFAULT_SECONDARY_WAIT = 60.0
+
+# Below this many remaining requests, spread the rest evenly until the reset,
+# but only when the run has announced more requests than are left
+LOW_BUDGET = 100
+
+# Longest gap put between two requests when spreading a low budget
+MAX_SPREAD_INTERVAL = 5.0
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1, rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self):
+        """Block until a token is available; return the seconds waited."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+class RateLimitScheduler:
+    """Tracks the API budget, paces requests and decides on retries."""
+
+    def __init__(self, requests_per_second=DEFAULT_REQUESTS_PER_SECOND,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff_base=DEFAULT_BACKOFF_BASE,
+                 backoff_cap=DEFAULT_BACKOFF_CAP, secondary_wait=DEFAULT_SECONDARY_WAIT):
+        self.bucket = TokenBucket(requests_per_second) if requests_per_second else None
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.secondary_wait = secondary_wait
+        self.remaining = None
+        self.reset_at = None
+        self.next_slot = 0.0
+        self.pause_until = 0.0
+        self.expected = 0
+        self.requests = 0
+        self.retries = 0
+        self.retry_statuses = {}
+        self.throttle_waits = 0
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def expect(self, count):
+        """Announce count upcoming requests of this run."""
+        with self._lock:
+            self.expected += count
+
+    def before_request(self):
+        """Wait for the token bucket, the remaining budget and any pause."""
+        waited = self.bucket.acquire() if self.bucket else 0.0
+        with self._lock:
+            now = time.time()
+            delay = max(0.0, self.pause_until - now)
+            needed = self.expected
+            self.expected = max(0, self.expected - 1)
+            if self.remaining is not None and self.reset_at and self.reset_at > now:
+                if self.remaining <= 0:
+                    delay = max(delay, self.reset_at - now + 1)
+                elif self.remaining < LOW_BUDGET and needed > self.remaining:
+                    # The run would exhaust the budget anyway: spread what is
+                    # left over the rest of the window instead of stalling at 0
+                    interval = min(MAX_SPREAD_INTERVAL, (self.reset_at - now) / self.remaining)
+                    slot = max(now, self.next_slot)
+                    self.next_slot = slot + interval
+                    delay = max(delay, slot - now)
+            self.requests += 1
+            if delay > 0:
+                self.throttle_waits += 1
+            self.waited += waited + delay
+        if delay > 0:
+            time.sleep(delay)
+
+    def record_response(self, response):
+        """Update the remaining budget from a response's rate-limit headers."""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        with self._lock:
+            if remaining is not None and remaining.isdigit():
+                self.remaining = int(remaining)
+            if reset is not None and reset.isdigit():
+                self.reset_at = int(reset)
+
+    def is_rate_limited(self, response):
+        """Return True for a 403 that is a primary or secondary rate limit."""
+        if response.status_code != 403:
+            return False
+        if response.headers.get('X-RateLimit-Remaining') == '0' or 'Retry-After' in response.headers:
+            return True
+        return b'rate limit' in response.content.lower()
+
+    def retry_delay(self, response, attempt):
+        """Return seconds to wait before retrying, or None to give up."""
+        status = response.status_code
+        if attempt >= self.max_retries:
+            return None
+        if status not in RETRY_STATUSES and not self.is_rate_limited(response):
+            return None
+
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            delay = float(retry_after)
+        elif response.headers.get('X-RateLimit-Remaining') == '0' and self.reset_at:
+            delay = max(0.0, self.reset_at - time.time()) + 1
+        else:
+            # Exponential backoff with jitter so parallel workers do not retry in step
+            backoff = min(self.backoff_cap, self.backoff_base * 2 ** attempt)
+            delay = backoff / 2 + random.uniform(0, backoff / 2)
+            if status == 403:
+                delay = max(delay, self.secondary_wait)
+
+        with self._lock:
+            self.retries += 1
+            self.retry_statuses[status] = self.retry_statuses.get(status, 0) + 1
+            self.waited += delay
+            # Hold back every worker, not just this one
+            self.pause_until = max(self.pause_until, time.time() + delay)
+        return delay
+
+    def report(self):
+        """Print request, retry and throttling counters for the run."""
+        if not self.requests:
+            return
+        retried = ', '.join(f"{status}×{count}" for status, count in sorted(self.retry_statuses.items()))
+        line = f"\n🚦 GitHub API: {self.requests} requests, {self.retries} retries"
+        if retried:
+            line += f" ({retried})"
+        line += f", {self.throttle_waits} throttled, {self.waited:.1f} s waited across workers"
+        if self.remaining is not None:
+            line += f", {self.remaining} requests left"
+        print(line)
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that sends every request through a RateLimitScheduler."""
+
+    def __init__(self, scheduler, **kwargs):
+        self.scheduler = scheduler
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        attempt = 0
+        while True:
+            self.scheduler.before_request()
+            response = super().send(request, **kwargs)
+            self.scheduler.record_response(response)
+            if response.status_code < 400 or not self.is_retryable(request):
+                return response
+            delay = self.scheduler.retry_delay(response, attempt)
+            if delay is None:
+                return response
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def is_retryable(request):
+        """Reads and GraphQL queries can be repeated safely."""
+        return request.method in ('GET', 'HEAD') or request.path_url.endswith('/graphql')
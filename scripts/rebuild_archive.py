@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Rebuild past editions from their collected content in parallel.
+Every content/monthly_content_YYYYMM.json in the month range is rendered to
+the HTML, Markdown and agenda files that generate_monthly_newsletter.py and
+generate_newsletter_agenda.py write for the current month, one month per
+worker process. Months whose content file, templates and renderers are
+unchanged since the last build are skipped.
+
+Usage: python rebuild_archive.py [FROM [TO]] [--workers N] [--force]
+
+FROM and TO are YYYYMM or YYYY-MM and default to the oldest and newest
+content files found.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import generate_monthly_newsletter as newsletter
+import generate_newsletter_agenda as agenda
+from edition_model import prepare_content
+from template_cache import TEMPLATES_DIR
+
+CONTENT_FILE_RE = re.compile(r'^monthly_content_(\d{6})\.json$')
+
+MONTH_RE = re.compile(r'^(\d{4})-?(\d{2})$')
+
+DEFAULT_STATE_PATH = ".cache/archive-build.json"
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Everything besides the content file that changes the rendered output:
+# every template plus the modules that render them
+RENDER_INPUTS = sorted(glob.glob(os.path.join(TEMPLATES_DIR, "*"))) + [
+    os.path.join(SCRIPTS_DIR, "generate_monthly_newsletter.py"),
+    os.path.join(SCRIPTS_DIR, "generate_newsletter_agenda.py"),
+    os.path.join(SCRIPTS_DIR, "edition_model.py"),
+    os.path.join(SCRIPTS_DIR, "render_cache.py"),
+    os.path.join(SCRIPTS_DIR, "template_cache.py"),
+]
+
+def parse_month(value):
+    """Return a YYYYMM string for YYYYMM or YYYY-MM input."""
+    match = MONTH_RE.match(value)
+    if not match or not 1 <= int(match.group(2)) <= 12:
+        raise argparse.ArgumentTypeError(f"expected YYYYMM or YYYY-MM, got {value!r}")
+    return match.group(1) + match.group(2)
+
+def find_content_files(content_dir, first=None, last=None):
+    """Return {YYYYMM: path} for the content files in the month range, oldest first."""
+    files = {}
+    for name in sorted(os.listdir(content_dir)):
+        match = CONTENT_FILE_RE.match(name)
+        if not match:
+            continue
+        month = match.group(1)
+        if (first and month < first) or (last and month > last):
+            continue
+        files[month] = os.path.join(content_dir, name)
+    return files
+
+def render_version():
+    """Return a hash of the templates and renderer sources."""
+    digest = hashlib.sha256()
+    for path in RENDER_INPUTS:
+        if not os.path.isfile(path):
+            continue
+        digest.update(os.path.basename(path).encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def input_key(path, version):
+    """Return the build key of one month: its content file plus the render version."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read() + version.encode('ascii')).hexdigest()
+
+def output_files(month):
+    """Return the files a build of one month writes."""
+    return [
+        f"newsletters/monthly-newsletter-{month}.html",
+        f"newsletters/monthly-newsletter-{month}.md",
+        f"newsletters/teams-agenda-{month}.md",
+        f"newsletters/html-agenda-{month}.html",
+        f"newsletters/teams-copy-paste-{month}.txt",
+    ]
+
+def build_month(month, path):
+    """Render and save one month's edition; return (month, article count)."""
+    month_date = datetime.strptime(month, "%Y%m")
+    with open(path, 'r', encoding='utf-8') as f:
+        content = prepare_content(json.load(f))
+    if not content:
+        return month, 0
+
+    html_content = newsletter.generate_monthly_newsletter_html(
+        content, newsletter.load_newsletter_template(), month_date
+    )
+    newsletter.save_html_file(html_content, month_date)
+    newsletter.save_markdown_files(
+        newsletter.generate_monthly_newsletter_markdown(content, month_date), month_date, draft=False
+    )
+    agenda.save_agenda_files(
+        agenda.generate_teams_agenda(content, newsletter.AGENDA_URL, month_date),
+        agenda.generate_html_agenda(content, newsletter.AGENDA_URL, month_date),
+        verbose=False, month=month_date
+    )
+    return month, len(content)
+
+def load_state(state_path):
+    """Return {YYYYMM: build key} from the last run."""
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_state(state_path, state):
+    """Write the build keys atomically."""
+    directory = os.path.dirname(state_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, state_path)
+
+def rebuild_archive(files, workers=None, force=False, state_path=DEFAULT_STATE_PATH):
+    """Rebuild the changed months in files across a process pool.
+
+    Returns a dict with the built, skipped, empty and failed months.
+    """
+    version = render_version()
+    state = load_state(state_path)
+    keys = {month: input_key(path, version) for month, path in files.items()}
+    pending = [
+        month for month in files
+        if force or state.get(month) != keys[month]
+        or not all(os.path.exists(path) for path in output_files(month))
+    ]
+    result = {'built': [], 'skipped': [m for m in files if m not in pending], 'empty': [], 'failed': []}
+
+    def record(month, articles):
+        """Store the outcome of one month."""
+        if articles:
+            result['built'].append(month)
+            state[month] = keys[month]
+        else:
+            result['empty'].append(month)
+            state.pop(month, None)
+
+    if workers == 1 or len(pending) <= 1:
+        for month in pending:
+            try:
+                record(*build_month(month, files[month]))
+            except Exception as e:
+                print(f"❌ {month}: {e}")
+                result['failed'].append(month)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(build_month, month, files[month]): month for month in pending}
+            for future in as_completed(futures):
+                try:
+                    record(*future.result())
+                except Exception as e:
+                    print(f"❌ {futures[future]}: {e}")
+                    result['failed'].append(futures[future])
+
+    save_state(state_path, state)
+    return result
+
+def main():
+    """Command-line entry point."""
+    arg_parser = argparse.ArgumentParser(description="Rebuild past editions from collected content.")
+    arg_parser.add_argument('first', nargs='?', type=parse_month, help="Oldest month to build")
+    arg_parser.add_argument('last', nargs='?', type=parse_month, help="Newest month to build")
+    arg_parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes")
+    arg_parser.add_argument('--force', action='store_true', help="Rebuild unchanged months too")
+    arg_parser.add_argument('--content-dir', default='content')
+    args = arg_parser.parse_args()
+
+    print("🗂️  Rebuilding Newsletter Archive")
+    print("=" * 40)
+    files = find_content_files(args.content_dir, args.first, args.last)
+    if not files:
+        print("No content files found in that month range.")
+        return
+
+    start = time.perf_counter()
+    result = rebuild_archive(files, max(1, args.workers), args.force)
+    elapsed = time.perf_counter() - start
+
+    built = len(result['built'])
+    print(f"Months: {len(files)} ({min(files)} to {max(files)})")
+    print(f"  - Built: {built}")
+    print(f"  - Unchanged: {len(result['skipped'])}")
+    if result['empty']:
+        print(f"  - No articles: {', '.join(sorted(result['empty']))}")
+    if result['failed']:
+        print(f"  - Failed: {', '.join(sorted(result['failed']))}")
+    rate = built / elapsed if elapsed else 0
+    print(f"⏱️  {elapsed:.2f}s, {rate:.1f} editions/s with {args.workers} workers")
+
+if __name__ == "__main__":
+    main()
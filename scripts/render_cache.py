@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of rendered article fragments for watch mode.
+Each article block is keyed by a hash of the article's fields and the
+fragment template's source, so after an edit only the changed articles are
+rendered again and the rest are spliced in from memory.
+
+The cache lives only in memory and is off unless a long-running process
+turns it on: a one-shot run renders every article once anyway.
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+from template_cache import get_environment, get_template
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+_fragment_cache = None
+
+_memory_cache_enabled = False
+
+class FragmentCache:
+    """Size-bounded, least-recently-used in-memory store of rendered fragments."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._memory = OrderedDict()
+        self._size = 0
+
+    def load(self, key):
+        """Return a cached fragment, or None."""
+        fragment = self._memory.get(key)
+        if fragment is None:
+            self.misses += 1
+            return None
+        self._memory.move_to_end(key)
+        self.hits += 1
+        return fragment
+
+    def store(self, key, fragment):
+        """Store a rendered fragment, dropping the least recently used ones."""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        self._memory[key] = fragment
+        self._size += len(fragment)
+        while self._size > self.max_bytes and len(self._memory) > 1:
+            _, dropped = self._memory.popitem(last=False)
+            self._size -= len(dropped)
+            self.evictions += 1
+
+    def report(self):
+        """Print hit/miss counters for the run."""
+        total = self.hits + self.misses
+        if not total:
+            return
+        print(f"🧩 Fragment cache: {self.hits} reused, {self.misses} rendered, "
+              f"{self.evictions} evictions, {self._size / 1024:.0f} KB in memory")
+
+def enable_memory_fragment_cache():
+    """Turn on the cache for a long-running process such as watch mode."""
+    global _memory_cache_enabled
+    _memory_cache_enabled = True
+
+def get_fragment_cache():
+    """Return the shared fragment cache, or None if it was not enabled."""
+    global _fragment_cache
+    if not _memory_cache_enabled:
+        return None
+    if _fragment_cache is None:
+        try:
+            max_bytes = int(float(os.getenv('NEWSLETTER_FRAGMENT_CACHE_MAX_MB', '')) * 1024 * 1024)
+        except ValueError:
+            max_bytes = DEFAULT_MAX_BYTES
+        _fragment_cache = FragmentCache(max_bytes)
+    return _fragment_cache
+
+def report_fragment_cache():
+    """Print the shared cache's counters, if it was used."""
+    if _fragment_cache is not None:
+        _fragment_cache.report()
+
+def template_version(name):
+    """Return a hash of a template's current source."""
+    environment = get_environment()
+    source = environment.loader.get_source(environment, name)[0]
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+def fragment_key(article, version):
+    """Return the content address of one article rendered with one template version."""
+    fields = json.dumps(article, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{version}\n{fields}".encode('utf-8')).hexdigest()
+
+class ArticleFragments:
+    """Rendered article blocks, looked up one index at a time.
+
+    The template asks for article_fragments[i] as it reaches article i, so
+    only the cache's own bounded memory holds rendered blocks, never the
+    whole edition at once.
+    """
+
+    def __init__(self, articles, template_name, cache):
+        self.articles = articles
+        self.template = get_template(template_name)
+        self.version = template_version(template_name)
+        self.cache = cache
+
+    def __len__(self):
+        return len(self.articles)
+
+    def __getitem__(self, index):
+        article = self.articles[index]
+        key = fragment_key(article, self.version)
+        fragment = self.cache.load(key)
+        if fragment is None:
+            fragment = self.template.render(article=article)
+            self.cache.store(key, fragment)
+        return fragment
+
+def render_article_fragments(articles, template_name):
+    """Return lazily cached article blocks, or None when the cache is off.
+
+    With None the template renders each article inline.
+    """
+    cache = get_fragment_cache()
+    if cache is None:
+        return None
+    return ArticleFragments(articles, template_name, cache)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Shared Jinja2 environment for newsletter rendering.
+Templates are loaded from templates/ and compiled once per template version:
+compiled bytecode is kept on disk, so later runs skip parsing entirely.
+"""
+
+import os
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'templates')
+
+DEFAULT_BYTECODE_CACHE_DIR = ".cache/jinja"
+
+_environment = None
+
+def create_environment(bytecode_cache_dir=None):
+    """Create a Jinja2 environment over templates/ with an on-disk bytecode cache."""
+    bytecode_cache = None
+    if bytecode_cache_dir:
+        os.makedirs(bytecode_cache_dir, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+    return Environment(
+        loader=FileSystemLoader(os.path.normpath(TEMPLATES_DIR)),
+        bytecode_cache=bytecode_cache,
+        auto_reload=True
+    )
+
+def get_environment():
+    """Return the shared environment, creating it on first use."""
+    global _environment
+    if _environment is None:
+        _environment = create_environment(
+            os.getenv('NEWSLETTER_TEMPLATE_CACHE_DIR', DEFAULT_BYTECODE_CACHE_DIR)
+        )
+    return _environment
+
+def get_template(name):
+    """Load a template from templates/, compiling it only if it changed."""
+    return get_environment().get_template(name)
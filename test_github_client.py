@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Check the GitHub fetch paths against a local mock GitHub server.
+Runs the concurrent REST fetcher over a pooled session and the batched
+GraphQL backend with its REST fallback, without network access.
+
+Usage: python test_github_client.py
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Settings are read at import time: no disk cache and no pacing in these checks
+os.environ['GITHUB_HTTP_CACHE'] = '0'
+os.environ['GITHUB_REQUESTS_PER_SECOND'] = '0'
+os.environ.pop('GITHUB_SNAPSHOT', None)
+
+MOCK_LATENCY = 0.05
+
+class MockGitHub(BaseHTTPRequestHandler):
+    """Serves /repos/<owner>/<repo>/issues/<n> and aliased GraphQL issue queries."""
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.record(self)
+        match = re.match(r'^/repos/[^/]+/[^/]+/issues/(\d+)$', self.path)
+        if not match or int(match.group(1)) in self.server.missing:
+            return self.reply(404, {'message': 'Not Found'})
+        time.sleep(MOCK_LATENCY)
+        self.reply(200, mock_issue(int(match.group(1))))
+
+    def do_POST(self):
+        self.server.record(self)
+        query = json.loads(self.rfile.read(int(self.headers['Content-Length'])))['query']
+        if self.path != '/graphql' or self.server.graphql_down:
+            return self.reply(400, {'message': 'Bad Request'})
+        repository = {}
+        for alias, number in re.findall(r'(i\d+): issue\(number: (\d+)\)', query):
+            issue = None if int(number) in self.server.missing else mock_issue(int(number))
+            repository[alias] = issue and {
+                'number': issue['number'], 'title': issue['title'], 'body': issue['body'],
+                'url': issue['html_url'], 'state': 'OPEN', 'author': issue['user'],
+            }
+        self.reply(200, {'data': {'repository': repository}})
+
+class MockServer(ThreadingHTTPServer):
+    """Counts requests and client connections."""
+    daemon_threads = True
+
+    def __init__(self, handler):
+        super().__init__(('127.0.0.1', 0), handler)
+        self.missing = set()
+        self.graphql_down = False
+        self.requests = []
+        self.clients = set()
+        self._lock = threading.Lock()
+
+    def record(self, handler):
+        with self._lock:
+            self.requests.append((handler.command, handler.path))
+            self.clients.add(handler.client_address)
+
+def mock_issue(number):
+    """Return a REST-shaped issue whose body uses the issue form layout."""
+    return {
+        'number': number,
+        'title': f"Issue {number}",
+        'html_url': f"https://github.com/example/news/issues/{number}",
+        'state': 'open',
+        'user': {'login': 'alice'},
+        'body': f"### Article Title\n\nArticle {number}\n\n### Content Category\n\nSecurity\n\n"
+                f"### Priority\n\nHigh\n\n### Full Content\n\nBody of {number}",
+    }
+
+def start_server(handler=MockGitHub):
+    """Start a mock server and point the GitHub client at it."""
+    server = MockServer(handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ['GITHUB_API_URL'] = f"http://127.0.0.1:{server.server_port}"
+    return server
+
+SERVER = start_server()
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from generate_newsletter_from_selected import fetch_selected_issues
+
+def reset(server):
+    """Forget the requests and connections seen so far."""
+    server.requests.clear()
+    server.clients.clear()
+    server.missing.clear()
+    server.graphql_down = False
+
+def test_rest_fetch_is_concurrent_ordered_and_pooled():
+    """32 issues at 50 ms each finish in a few round trips over at most 8 connections."""
+    reset(SERVER)
+    SERVER.missing.add(7)
+    numbers = list(range(32, 0, -1))
+    started = time.perf_counter()
+    articles = fetch_selected_issues(numbers, 'example', 'news', backend='rest')
+    elapsed = time.perf_counter() - started
+
+    assert [article and article['number'] for article in articles] == \
+        [None if number == 7 else number for number in numbers]
+    assert articles[0]['title'] == 'Article 32' and articles[0]['category'] == 'Security'
+    assert elapsed < len(numbers) * MOCK_LATENCY / 2, f"took {elapsed:.2f}s"
+    assert len(SERVER.clients) <= 8, f"{len(SERVER.clients)} connections"
+
+def test_graphql_batches_in_chunks():
+    """120 issues take three GraphQL requests and match the REST article shape."""
+    reset(SERVER)
+    numbers = list(range(1, 121))
+    articles = fetch_selected_issues(numbers, 'example', 'news', token='test', backend='graphql')
+
+    assert SERVER.requests == [('POST', '/graphql')] * 3, SERVER.requests
+    assert [article['number'] for article in articles] == numbers
+    rest = fetch_selected_issues([5], 'example', 'news', backend='rest')[0]
+    assert articles[4] == rest
+
+def test_graphql_falls_back_to_rest():
+    """Issues missing from a batch, or a failed batch, are fetched one by one."""
+    reset(SERVER)
+    SERVER.missing.add(2)
+    articles = fetch_selected_issues([1, 2, 3], 'example', 'news', token='test', backend='graphql')
+    assert [article and article['number'] for article in articles] == [1, None, 3]
+    assert SERVER.requests == [('POST', '/graphql'), ('GET', '/repos/example/news/issues/2')]
+
+    reset(SERVER)
+    SERVER.graphql_down = True
+    articles = fetch_selected_issues([1, 2, 3], 'example', 'news', token='test', backend='graphql')
+    assert [article['number'] for article in articles] == [1, 2, 3]
+    assert sorted(SERVER.requests) == \
+        [('GET', f'/repos/example/news/issues/{number}') for number in (1, 2, 3)] + [('POST', '/graphql')]
+
+def main():
+    """Run every check and exit non-zero if one fails."""
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed} of {len(tests)} checks passed")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
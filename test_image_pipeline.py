@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Check the image stage against a local HTTP server serving generated images.
+Covers concurrent downloads, the resized WebP/JPEG variants, the <picture>
+rewrite of the edition HTML and skipping known images on a rerun.
+
+Usage: python test_image_pipeline.py
+"""
+
+import io
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image
+
+WORK_DIR = tempfile.mkdtemp(prefix='image-pipeline-')
+
+CACHE_DIR = os.path.join(WORK_DIR, 'cache')
+
+os.environ['NEWSLETTER_IMAGE_CACHE_DIR'] = CACHE_DIR
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from image_pipeline import ImageCache, get_image_cache, process_html_file, process_images
+
+MOCK_LATENCY = 0.1
+
+def encode(image, fmt):
+    """Return an image's bytes in the given format."""
+    buffer = io.BytesIO()
+    image.save(buffer, fmt)
+    return buffer.getvalue()
+
+FILES = {
+    '/photo.jpg': ('image/jpeg', encode(Image.new('RGB', (2000, 1000), (200, 40, 40)), 'JPEG')),
+    '/logo.png': ('image/png', encode(Image.new('RGBA', (300, 100), (0, 0, 255, 128)), 'PNG')),
+    '/icon.png': ('image/png', encode(Image.new('RGB', (40, 40), (0, 128, 0)), 'PNG')),
+    '/page.html': ('text/html', b'<html></html>'),
+}
+
+class ImageServer(BaseHTTPRequestHandler):
+    """Serves FILES after MOCK_LATENCY, ignoring the query string; anything else is 404."""
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append(self.path)
+        time.sleep(MOCK_LATENCY)
+        content_type, body = FILES.get(self.path.split('?')[0], ('text/plain', b'not found'))
+        self.send_response(200 if self.path.split('?')[0] in FILES else 404)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class QuietServer(ThreadingHTTPServer):
+    """Ignores clients that hang up on a skipped download mid-response."""
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass
+
+def start_server():
+    """Start the image server on a free port."""
+    server = QuietServer(('127.0.0.1', 0), ImageServer)
+    server.requests = []
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+SERVER = start_server()
+
+BASE_URL = f"http://127.0.0.1:{SERVER.server_port}"
+
+EDITION_HTML = (
+    f'<p>Intro</p><img src="{BASE_URL}/photo.jpg" alt="Photo">'
+    f'<img src="{BASE_URL}/logo.png" alt="Logo">'
+    f'<img src="{BASE_URL}/missing.png" alt="Gone">'
+    f'<img src="{BASE_URL}/page.html" alt="Not an image">'
+)
+
+def output_dir(name):
+    """Return a fresh edition directory."""
+    path = os.path.join(WORK_DIR, name)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def srcset_names(html):
+    """Return every file name listed in the srcsets of html."""
+    return re.findall(r'images/([\w.-]+) \d+w', html)
+
+def test_first_run_downloads_resizes_and_rewrites():
+    """Images become <picture> variants next to the edition; failures keep their URL."""
+    SERVER.requests.clear()
+    cache = get_image_cache()
+    edition = output_dir('first')
+    html = process_images(EDITION_HTML, edition)
+
+    assert cache.cache_dir == CACHE_DIR
+    assert (cache.downloaded, cache.resized, cache.failed) == (2, 2, 2), \
+        (cache.downloaded, cache.resized, cache.failed)
+    assert html.count('<picture>') == 2
+    assert f'src="{BASE_URL}/missing.png"' in html and f'src="{BASE_URL}/page.html"' in html
+
+    photo = cache.lookup(f"{BASE_URL}/photo.jpg")
+    assert [(width, ext) for width, ext, _ in photo['variants']] == \
+        [(400, 'webp'), (400, 'jpg'), (800, 'webp'), (800, 'jpg'), (1600, 'webp'), (1600, 'jpg')]
+    assert 'width="800" height="400" loading="lazy" alt="Photo"' in html
+    logo = cache.lookup(f"{BASE_URL}/logo.png")
+    assert [(width, ext) for width, ext, _ in logo['variants']] == [(300, 'webp'), (300, 'jpg')]
+
+    published = set(os.listdir(os.path.join(edition, 'images')))
+    assert set(srcset_names(html)) <= published and len(published) == 8, published
+    with Image.open(os.path.join(edition, 'images', photo['variants'][0][2])) as variant:
+        assert variant.size == (400, 200) and variant.format == 'WEBP'
+
+def test_rerun_skips_known_images():
+    """A second run from the saved index downloads and resizes nothing."""
+    first = process_images(EDITION_HTML, output_dir('first'))
+    SERVER.requests.clear()
+    cache = ImageCache(CACHE_DIR)
+    html = process_images(EDITION_HTML, output_dir('rerun'), cache)
+
+    assert html == first
+    assert sorted(SERVER.requests) == ['/missing.png', '/page.html'], SERVER.requests
+    assert (cache.downloaded, cache.resized, cache.reused) == (0, 0, 2)
+    assert len(os.listdir(os.path.join(WORK_DIR, 'rerun', 'images'))) == 8
+
+def test_downloads_run_concurrently():
+    """Eight new URLs at 100 ms each finish in well under eight round trips."""
+    cache = ImageCache(os.path.join(WORK_DIR, 'concurrent-cache'))
+    html = ''.join(f'<img src="{BASE_URL}/icon.png?v={number}" alt="">' for number in range(8))
+    started = time.perf_counter()
+    html = process_images(html, output_dir('concurrent'), cache)
+    elapsed = time.perf_counter() - started
+
+    assert html.count('<picture>') == 8
+    assert cache.downloaded == 8 and cache.failed == 0
+    assert elapsed < 8 * MOCK_LATENCY / 2, f"took {elapsed:.2f}s"
+
+def test_html_file_is_rewritten_in_place():
+    """process_html_file localizes a saved edition next to itself."""
+    filename = os.path.join(output_dir('saved'), 'monthly-newsletter-202610.html')
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(EDITION_HTML)
+    process_html_file(filename, ImageCache(CACHE_DIR))
+
+    with open(filename, 'r', encoding='utf-8') as f:
+        html = f.read()
+    assert html.count('<picture>') == 2 and 'images/' in html
+    assert os.path.isdir(os.path.join(WORK_DIR, 'saved', 'images'))
+
+def main():
+    """Run every check and exit non-zero if one fails."""
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed} of {len(tests)} checks passed")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Check the issue body parser on the layouts submissions arrive in, including
+article text that happens to contain field labels.
+
+Usage: python test_issue_parser.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from issue_parser import parse_issue
+
+def test_form_layout():
+    """Issue form headings split the body; _No response_ reads as empty."""
+    fields = parse_issue(
+        "### Article Title\n\nZero trust\n\n### Content Category\n\nSecurity\n\n"
+        "### Priority\n\nHigh\n\n### Image\n\n_No response_\n\n### Full Content\n\nText"
+    )
+    assert (fields.title, fields.category, fields.priority, fields.image, fields.content) == \
+        ('Zero trust', 'Security', 'High', '', 'Text')
+
+def test_label_words_inside_fenced_content():
+    """Label lines inside a ``` fence stay part of the content."""
+    fields = parse_issue(
+        "### Article Title\n\nRoadmap\n\n### Full Content\n\n"
+        "```markdown\nLine one\nImage\nPriority: high is our goal\nmore\n```\n\n"
+        "### Priority\n\nUrgent"
+    )
+    assert fields.content == "Line one\nImage\nPriority: high is our goal\nmore", repr(fields.content)
+    assert fields.priority == 'Urgent', repr(fields.priority)
+
+def test_label_words_after_form_headings():
+    """With ### headings present, bare labels in the text do not start fields."""
+    fields = parse_issue(
+        "### Article Title\n\nRoadmap\n\n### Full Content\n\nSummary\nOur summary of the year.\n"
+        "Author Name: the team\n\n### Author Name\n\nJane"
+    )
+    assert fields.content == "Summary\nOur summary of the year.\nAuthor Name: the team", repr(fields.content)
+    assert (fields.summary, fields.author) == ('', 'Jane')
+
+def test_plain_and_bold_layouts():
+    """Without headings, "Label: value" and "**Label:** value" fields still split."""
+    plain = parse_issue("Article Title: Foo\nSummary: Short\nPriority: High\n")
+    assert (plain.title, plain.summary, plain.priority) == ('Foo', 'Short', 'High')
+    bold = parse_issue("**Title:** Foo\nIntro\n**Content:**\n```\nImage: none\n```\n**Author:** Jane\n")
+    assert (bold.title, bold.content, bold.author, bold.image) == ('Foo', 'Image: none', 'Jane', '')
+
+def main():
+    """Run every check and exit non-zero if one fails."""
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed} of {len(tests)} checks passed")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Check the rate-limit scheduler against a local mock server that answers
+with scripted 429, 403 and 5xx responses and X-RateLimit headers.
+Backoff and secondary-limit waits are shortened so the checks take seconds.
+
+Usage: python test_rate_limit.py
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from rate_limit import RateLimitedAdapter, RateLimitScheduler
+
+class ScriptedServer(BaseHTTPRequestHandler):
+    """Answers each path with the next scripted (status, headers) reply, then 200."""
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self):
+        with self.server.lock:
+            self.server.requests.append((self.command, self.path))
+            script = self.server.scripts.get(self.path, [])
+            status, headers = script.pop(0) if script else (200, {})
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        message = 'API rate limit exceeded' if status == 403 else 'ok'
+        body = json.dumps({'message': message}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = reply
+
+def start_server():
+    """Start the scripted server on a free port."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ScriptedServer)
+    server.daemon_threads = True
+    server.scripts = {}
+    server.requests = []
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+SERVER = start_server()
+
+BASE_URL = f"http://127.0.0.1:{SERVER.server_port}"
+
+def session_for(scheduler):
+    """Return a session that sends every request through the scheduler."""
+    session = requests.Session()
+    adapter = RateLimitedAdapter(scheduler)
+    session.mount('http://', adapter)
+    return session
+
+def script(path, *replies):
+    """Queue replies for a path and forget earlier requests."""
+    SERVER.requests.clear()
+    SERVER.scripts[path] = list(replies)
+
+def timed_get(session, path, **kwargs):
+    """Return (response, seconds taken)."""
+    started = time.perf_counter()
+    response = session.get(BASE_URL + path, **kwargs)
+    return response, time.perf_counter() - started
+
+def test_retry_after_is_honored_on_429():
+    """A 429 with Retry-After: 1 is retried once, a second later."""
+    scheduler = RateLimitScheduler(0, max_retries=3, backoff_base=0.01, secondary_wait=0.01)
+    script('/a', (429, {'Retry-After': '1'}))
+    response, elapsed = timed_get(session_for(scheduler), '/a')
+
+    assert response.status_code == 200
+    assert len(SERVER.requests) == 2, SERVER.requests
+    assert 1.0 <= elapsed < 2.0, f"took {elapsed:.2f}s"
+    assert (scheduler.requests, scheduler.retries, scheduler.retry_statuses) == (2, 1, {429: 1})
+
+def test_secondary_rate_limit_403_waits_and_retries():
+    """A rate-limited 403 without Retry-After waits at least secondary_wait."""
+    scheduler = RateLimitScheduler(0, max_retries=3, backoff_base=0.01, secondary_wait=0.3)
+    script('/b', (403, {}))
+    response, elapsed = timed_get(session_for(scheduler), '/b')
+
+    assert response.status_code == 200
+    assert elapsed >= 0.3, f"took {elapsed:.2f}s"
+    assert scheduler.retry_statuses == {403: 1}
+
+def test_server_errors_back_off_exponentially():
+    """Two 503s are retried after roughly base and 2 × base, with jitter."""
+    scheduler = RateLimitScheduler(0, max_retries=3, backoff_base=0.2, secondary_wait=0.01)
+    script('/c', (503, {}), (503, {}))
+    response, elapsed = timed_get(session_for(scheduler), '/c')
+
+    assert response.status_code == 200
+    assert len(SERVER.requests) == 3
+    # Jittered delays fall in [base/2, base] and [base, 2 × base]
+    assert 0.3 <= elapsed < 0.9, f"took {elapsed:.2f}s"
+    assert scheduler.retry_statuses == {503: 2}
+
+def test_gives_up_after_max_retries():
+    """A persistent 500 is returned after max_retries retries."""
+    scheduler = RateLimitScheduler(0, max_retries=2, backoff_base=0.01, secondary_wait=0.01)
+    script('/d', *[(500, {})] * 5)
+    response, _ = timed_get(session_for(scheduler), '/d')
+
+    assert response.status_code == 500
+    assert len(SERVER.requests) == 3
+    assert scheduler.retries == 2
+
+def test_non_retryable_responses_return_at_once():
+    """404s, plain 403s and non-GraphQL POSTs are not retried; GraphQL POSTs are."""
+    scheduler = RateLimitScheduler(0, max_retries=3, backoff_base=0.01, secondary_wait=0.01)
+    session = session_for(scheduler)
+
+    script('/e', (404, {}))
+    assert session.get(BASE_URL + '/e').status_code == 404
+    script('/comments', (503, {}))
+    assert session.post(BASE_URL + '/comments', json={}).status_code == 503
+    assert len(SERVER.requests) == 1
+    script('/graphql', (502, {}))
+    assert session.post(BASE_URL + '/graphql', json={'query': '{}'}).status_code == 200
+    assert len(SERVER.requests) == 2
+    assert scheduler.retry_statuses == {502: 1}
+
+def test_exhausted_budget_waits_for_reset():
+    """After X-RateLimit-Remaining: 0 the next request waits until the reset."""
+    scheduler = RateLimitScheduler(0, max_retries=0)
+    session = session_for(scheduler)
+    reset = int(time.time()) + 1
+    script('/f', (200, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(reset)}))
+    session.get(BASE_URL + '/f')
+    assert scheduler.remaining == 0 and scheduler.reset_at == reset
+
+    _, elapsed = timed_get(session, '/f')
+    assert elapsed >= 0.9, f"took {elapsed:.2f}s"
+    assert scheduler.throttle_waits == 1
+
+def test_token_bucket_paces_requests():
+    """At 20 requests per second, a burst of 20 goes at once and 10 more take 0.5 s."""
+    scheduler = RateLimitScheduler(20, max_retries=0)
+    session = session_for(scheduler)
+    script('/g')
+    started = time.perf_counter()
+    for _ in range(30):
+        session.get(BASE_URL + '/g')
+    elapsed = time.perf_counter() - started
+
+    assert 0.45 <= elapsed < 1.5, f"took {elapsed:.2f}s"
+    assert scheduler.requests == 30
+
+def main():
+    """Run every check and exit non-zero if one fails."""
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed} of {len(tests)} checks passed")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()